@@ -0,0 +1,136 @@
+"""
+Benchmark of the automatic support assignment.
+
+Seeds a database with support users and events without support spread over a
+year, some of them already booked, then times AssignmentController.plan and
+AssignmentController.apply.
+
+Usage:
+    python -m benchmarks.bench_assign --events 5000 --supports 20
+    python -m benchmarks.bench_assign --url mysql+mysqlconnector://user:pw@localhost/bench
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+import constantes
+import models
+from controllers import AssignmentController
+
+
+def seed(session, events, supports):
+    """
+    Creates the support users and the events, one in ten already booked.
+    """
+    prefix = uuid.uuid4().hex[:8]
+    role = models.Role(name=constantes.ROLE_SUPPORT)
+    session.add(role)
+    session.flush()
+    support_ids = [
+        session.execute(
+            insert(models.User).values(
+                username=f"{prefix}-support-{index}",
+                password="x",
+                full_name="Bench Support",
+                email=f"{prefix}-support-{index}@bench.com",
+                phone_number="+33110203040",
+                role_id=role.id,
+            )
+        ).inserted_primary_key[0]
+        for index in range(supports)
+    ]
+    customer = models.Customer(
+        first_name="Bench",
+        last_name="Customer",
+        email=f"{prefix}@bench-customer.com",
+        phone_number="+33110203041",
+        compagny_name="Bench Company",
+        sales_id=support_ids[0],
+    )
+    session.add(customer)
+    session.flush()
+    session.execute(
+        insert(models.Contract),
+        [
+            {
+                "total_amount": 1000,
+                "remaining_amount": 0,
+                "is_signed": True,
+                "customer_id": customer.id,
+                "manager_id": support_ids[0],
+            }
+            for _ in range(events)
+        ],
+    )
+    contract_ids = [
+        contract.id
+        for contract in session.query(models.Contract.id)
+        .filter_by(customer_id=customer.id)
+        .order_by(models.Contract.id)
+    ]
+    generator = random.Random(events)
+    first_day = datetime(2024, 1, 1)
+    rows = []
+    for index, contract_id in enumerate(contract_ids):
+        start_date = first_day + timedelta(days=generator.randrange(365))
+        rows.append(
+            {
+                "event_name": f"{prefix}-event-{index}",
+                "customer_name": f"{prefix}-customer-{index}",
+                "start_date": start_date,
+                "end_date": start_date
+                + timedelta(days=generator.randint(1, 3)),
+                "location": "Paris",
+                "nb_attendees": 10,
+                "notes": "",
+                "contract_id": contract_id,
+                "support_id": (
+                    generator.choice(support_ids) if index % 10 == 0 else None
+                ),
+            }
+        )
+    session.execute(insert(models.Event), rows)
+    session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--supports", type=int, default=20)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_engine(url)
+        models.Base.metadata.create_all(engine)
+        session = Session(bind=engine)
+        seed(session, args.events, args.supports)
+        controller = AssignmentController(session)
+
+        start = time.perf_counter()
+        assignments, unassigned = controller.plan()
+        planned = time.perf_counter() - start
+        print(
+            f" plan: {len(assignments)} events assigned, "
+            f"{len(unassigned)} without a free support in {planned:.3f} s"
+        )
+
+        start = time.perf_counter()
+        applied = controller.apply(assignments)
+        print(
+            f"apply: {applied} events updated in "
+            f"{time.perf_counter() - start:.3f} s"
+        )
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
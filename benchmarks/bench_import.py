@@ -0,0 +1,197 @@
+"""
+Benchmark of the bulk CSV import against one-by-one creation.
+
+Writes a CSV file of customers, then imports it with
+CustomerController.import_customers_csv (validated chunks, one IN query per
+chunk for duplicates, batched inserts). For comparison, a sample of the same
+customers is created one at a time like create_customer does: an email check
+and a commit per customer.
+
+With --entity contracts, a CSV file of contracts is loaded with
+ContractController.import_contracts_csv, loaded again unchanged, then loaded
+once more with new remaining amounts to measure the update throughput.
+
+Usage:
+    python -m benchmarks.bench_import --rows 100000
+    python -m benchmarks.bench_import --entity contracts --rows 100000
+    python -m benchmarks.bench_import --url mysql+mysqlconnector://user:pw@localhost/bench
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import uuid
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+import constantes
+import models
+from controllers import ContractController, CustomerController
+
+
+def seed_sales(session):
+    """
+    Creates the sales user the customers are given to.
+    """
+    role = models.Role(name=f"BENCH-{uuid.uuid4().hex[:8]}")
+    session.add(role)
+    session.flush()
+    sales = models.User(
+        username=f"bench-{role.name}",
+        full_name="Bench User",
+        email=f"{role.name}@bench.com",
+        phone_number="+33110203040",
+        role_id=role.id,
+    )
+    sales.password = "x"
+    session.add(sales)
+    session.commit()
+    return sales
+
+
+def write_customers(path, rows, prefix):
+    """
+    Writes a CSV file of customers with unique emails.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(constantes.CUSTOMER_IMPORT_COLUMNS)
+        for index in range(rows):
+            writer.writerow(
+                (
+                    "First",
+                    "Last",
+                    f"{prefix}{index}@bench.com",
+                    "+33110203041",
+                    f"Company {index}",
+                )
+            )
+
+
+def seed_customer(session, sales):
+    """
+    Creates the customer the contracts are signed with.
+    """
+    customer = models.Customer(
+        first_name="Bench",
+        last_name="Customer",
+        email=f"{uuid.uuid4().hex[:8]}@bench-customer.com",
+        phone_number="+33110203041",
+        compagny_name="Bench Company",
+        sales_id=sales.id,
+    )
+    session.add(customer)
+    session.commit()
+    return customer
+
+
+def write_contracts(path, rows, prefix, email, remaining):
+    """
+    Writes a CSV file of contracts with unique references.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(constantes.CONTRACT_IMPORT_COLUMNS)
+        for index in range(rows):
+            writer.writerow(
+                (f"{prefix}-{index}", email, 1000, remaining, "yes")
+            )
+
+
+def bench_contracts(session, sales, directory, args):
+    """
+    Loads a CSV file of contracts, then loads it again unchanged and updated.
+    """
+    customer = seed_customer(session, sales)
+    controller = ContractController(session, MagicMock(), sales)
+    path = os.path.join(directory, "contracts.csv")
+    prefix = uuid.uuid4().hex[:8]
+    for label, remaining in (
+        ("    create", 1000),
+        (" unchanged", 1000),
+        ("    update", 0),
+    ):
+        write_contracts(path, args.rows, prefix, customer.email, remaining)
+        report = controller.import_contracts_csv(
+            path, batch_size=args.batch_size
+        )
+        loaded = report["created"] + report["updated"] + report["unchanged"]
+        print(
+            f"{label}: {loaded} contracts in {report['seconds']:.2f} s "
+            f"({report['contracts_per_second']:.0f} contracts/s)"
+        )
+
+
+def import_one_by_one(session, sales, path, rows):
+    """
+    Creates the first rows customers of the file one at a time.
+    """
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as file:
+        for index, row in enumerate(csv.DictReader(file)):
+            if index == rows:
+                break
+            session.query(models.Customer).filter_by(
+                email=row["email"]
+            ).first()
+            session.add(models.Customer(sales_id=sales.id, **row))
+            session.commit()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--entity", choices=("customers", "contracts"), default="customers"
+    )
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=2000,
+        help="customers created one at a time for comparison",
+    )
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_engine(url)
+        models.Base.metadata.create_all(engine)
+        session = Session(bind=engine)
+        sales = seed_sales(session)
+        if args.entity == "contracts":
+            bench_contracts(session, sales, directory, args)
+            session.close()
+            engine.dispose()
+            return
+        controller = CustomerController(session, MagicMock(), sales)
+
+        path = os.path.join(directory, "customers.csv")
+        prefix = uuid.uuid4().hex[:8]
+        write_customers(path, args.rows, prefix)
+        report = controller.import_customers_csv(
+            path, batch_size=args.batch_size
+        )
+        print(
+            f"      bulk: {report['created']} customers in "
+            f"{report['seconds']:.2f} s "
+            f"({report['customers_per_second']:.0f} customers/s)"
+        )
+
+        sample = min(args.sample, args.rows)
+        write_customers(path, sample, prefix + "-single")
+        seconds = import_one_by_one(session, sales, path, sample)
+        print(
+            f"one by one: {sample} customers in {seconds:.2f} s "
+            f"({sample / seconds:.0f} customers/s)"
+        )
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
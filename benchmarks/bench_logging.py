@@ -0,0 +1,69 @@
+"""
+Benchmark of the time a log call takes in the caller's thread.
+
+Times each logger.info call through a logging.NullHandler (the cost of the
+logging module itself), a synchronous logging.FileHandler and the telemetry
+handler writing to a file from its background thread, and reports the median
+and the 99th percentile of each.
+
+Usage:
+    python -m benchmarks.bench_logging --records 100000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+from utils import FileSink, Telemetry
+
+
+def measure(handler, records):
+    """
+    Returns the duration of each log call, in microseconds.
+    """
+    logger = logging.Logger("bench", logging.INFO)
+    logger.addHandler(handler)
+    timings = []
+    for index in range(records):
+        start = time.perf_counter()
+        logger.info("Create customer : customer%d@bench.com", index)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    print(
+        f"{name:>10}: median {statistics.median(timings):.1f} us, "
+        f"p99 {timings[int(len(timings) * 0.99)]:.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    report("no output", measure(logging.NullHandler(), args.records))
+    with tempfile.TemporaryDirectory() as directory:
+        handler = logging.FileHandler(os.path.join(directory, "sync.log"))
+        report("sync file", measure(handler, args.records))
+        handler.close()
+
+        telemetry = Telemetry(
+            [FileSink(os.path.join(directory, "telemetry.jsonl"))],
+            queue_size=args.records,
+        )
+        report("telemetry", measure(telemetry.handler(), args.records))
+        start = time.perf_counter()
+        telemetry.close()
+        print(
+            f"telemetry drained in {time.perf_counter() - start:.2f} s, "
+            f"{telemetry.dropped} records dropped"
+        )
+
+
+if __name__ == "__main__":
+    main()
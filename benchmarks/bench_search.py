@@ -0,0 +1,126 @@
+"""
+Benchmark of the customer search.
+
+Seeds a database with customers built from lists of first names, last names and
+companies, indexes them with SearchController.rebuild, then times
+SearchController.search for a few searches: a full last name, a prefix, a
+typo and two words, among all the customers then among the customers of the
+sales user. Each search is run several times and the median is reported.
+
+Usage:
+    python -m benchmarks.bench_search --rows 1000000
+    python -m benchmarks.bench_search --url mysql+mysqlconnector://user:pw@localhost/bench
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+import models
+from controllers import SearchController
+
+FIRST_NAMES = (
+    "Jean Marie Pierre Sophie Luc Claire Paul Julie Louis Emma Hugo Chloé "
+    "Nathan Léa Arthur Manon"
+).split()
+LAST_NAMES = (
+    "Martin Bernard Dubois Thomas Robert Richard Petit Durand Leroy Moreau "
+    "Simon Laurent Lefebvre Michel Garcia David Bertrand Roux Vincent "
+    "Fournier Morel Girard André Mercier Dupont Lambert Bonnet François"
+).split()
+COMPANY_WORDS = (
+    "Acme Globex Initech Umbrella Hooli Vandelay Stark Wayne Cyberdyne "
+    "Soylent Tyrell Wonka Gringotts Industries Consulting Events Services "
+    "Group Partners"
+).split()
+SEARCHES = ("lefebvre", "lefeb", "lefebre", "claire acme")
+
+
+def seed(session, rows):
+    """
+    Creates the sales user and the customers, in batches.
+
+    Returns the sales user.
+    """
+    prefix = uuid.uuid4().hex[:8]
+    role = models.Role(name=f"BENCH-{prefix}")
+    session.add(role)
+    session.flush()
+    sales = models.User(
+        username=f"bench-{prefix}",
+        full_name="Bench User",
+        email=f"{prefix}@bench.com",
+        phone_number="+33110203040",
+        role_id=role.id,
+    )
+    sales.password = "x"
+    session.add(sales)
+    session.flush()
+    generator = random.Random(rows)
+    batch = 10000
+    for start in range(0, rows, batch):
+        customers = []
+        for index in range(start, min(start + batch, rows)):
+            first_name = generator.choice(FIRST_NAMES)
+            last_name = generator.choice(LAST_NAMES)
+            customers.append(
+                {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "email": f"{first_name}.{last_name}.{index}@{prefix}.com",
+                    "phone_number": "+33110203041",
+                    "compagny_name": " ".join(
+                        generator.sample(COMPANY_WORDS, 2)
+                    ),
+                    "sales_id": sales.id,
+                }
+            )
+        session.execute(insert(models.Customer), customers)
+    session.commit()
+    return sales
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_engine(url)
+        models.Base.metadata.create_all(engine)
+        session = Session(bind=engine)
+        sales = seed(session, args.rows)
+        controller = SearchController(session, user=sales)
+
+        start = time.perf_counter()
+        indexed = controller.rebuild()
+        print(
+            f"index: {indexed} customers in "
+            f"{time.perf_counter() - start:.1f} s"
+        )
+        for mine in (False, True):
+            for text in SEARCHES:
+                timings = []
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    rows, _ = controller.search(text, mine=mine)
+                    timings.append(time.perf_counter() - start)
+                print(
+                    f"{text!r:>15}{' (mine)' if mine else '':<7}: "
+                    f"{len(rows)} results on the first page, "
+                    f"median {statistics.median(timings) * 1000:.1f} ms"
+                )
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
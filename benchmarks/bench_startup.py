@@ -0,0 +1,77 @@
+"""
+Benchmark of the time from launch to the main menu.
+
+Each measured launch is a new Python process that imports main.py, runs
+init_db, builds the MainController and finishes the bootstrap, i.e. every
+step main.py performs before MainController.run displays the main menu.
+The first launch runs the full bootstrap; the following ones take the fast
+startup path.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --url mysql+mysqlconnector://user:pw@localhost/bench
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD_CODE = """
+import main
+import views.themes
+session = main.init_db()
+path = "fast" if session.info["bootstrap_current"] else "full"
+controller = main.MainController(session, console=views.themes.theme_console())
+main.finish_bootstrap(controller)
+print(path)
+"""
+
+
+def launch(url):
+    """
+    Launches the application up to the main menu.
+
+    Returns:
+        tuple: The elapsed time in seconds and the startup path taken ("full" or "fast").
+    """
+    environment = dict(os.environ, DATABASE_URL=url)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=environment,
+    ).stdout
+    elapsed = time.perf_counter() - start
+    return elapsed, output.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        elapsed, path = launch(url)
+        print(f"first launch ({path} bootstrap): {elapsed * 1000:.0f} ms")
+        timings = []
+        for _ in range(args.runs):
+            elapsed, path = launch(url)
+            timings.append(elapsed)
+        print(
+            f"next {args.runs} launches ({path} bootstrap): "
+            f"median {statistics.median(timings) * 1000:.0f} ms, "
+            f"min {min(timings) * 1000:.0f} ms, "
+            f"max {max(timings) * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
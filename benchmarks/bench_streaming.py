@@ -0,0 +1,171 @@
+"""
+Benchmark of buffered versus streamed contract reads.
+
+Seeds a database with contracts, then reads them all once with
+ContractController.contracts_query().all() (buffered) and once with
+ContractController.iter_contracts() (streamed). Each read runs in its own
+process so that the reported peak RSS only reflects that read.
+
+Usage:
+    python -m benchmarks.bench_streaming --rows 200000
+    python -m benchmarks.bench_streaming --url mysql+mysqlconnector://user:pw@localhost/bench
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, insert, func, select
+from sqlalchemy.orm import Session
+import models
+from controllers import ContractController
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """
+    Returns the peak resident set size of the current process in MB.
+    """
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def seed(url, rows):
+    """
+    Creates the tables and inserts the given number of contracts if needed.
+    """
+    engine = create_engine(url)
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        existing = connection.execute(
+            select(func.count()).select_from(models.Contract)
+        ).scalar()
+        if existing >= rows:
+            return
+        role_id = connection.execute(
+            insert(models.Role).values(name="BENCH")
+        ).inserted_primary_key[0]
+        user_id = connection.execute(
+            insert(models.User).values(
+                username="bench",
+                password="x",
+                full_name="Bench User",
+                email="bench@bench.com",
+                phone_number="+33110203040",
+                role_id=role_id,
+            )
+        ).inserted_primary_key[0]
+        now = datetime.now()
+        batch = 10000
+        for start in range(existing, rows, batch):
+            stop = min(start + batch, rows)
+            first_id = connection.execute(
+                select(func.coalesce(func.max(models.Customer.id), 0))
+            ).scalar()
+            connection.execute(
+                insert(models.Customer),
+                [
+                    {
+                        "first_name": "First",
+                        "last_name": "Last",
+                        "email": f"customer{index}@bench.com",
+                        "phone_number": "+33110203041",
+                        "compagny_name": f"Company {index}",
+                        "sales_id": user_id,
+                        "creation_date": now,
+                        "last_contact_date": now,
+                    }
+                    for index in range(start, stop)
+                ],
+            )
+            connection.execute(
+                insert(models.Contract),
+                [
+                    {
+                        "manager_id": user_id,
+                        "customer_id": first_id + offset + 1,
+                        "total_amount": 1000,
+                        "remaining_amount": index % 500,
+                        "creation_date": now,
+                        "is_signed": bool(index % 2),
+                    }
+                    for offset, index in enumerate(range(start, stop))
+                ],
+            )
+    engine.dispose()
+
+
+def read(url, mode):
+    """
+    Reads every contract in the given mode and returns the measurements.
+    """
+    engine = create_engine(url)
+    session = Session(bind=engine)
+    controller = ContractController(session, MagicMock())
+    start = time.perf_counter()
+    if mode == "buffered":
+        count = len(controller.contracts_query().all())
+    else:
+        count = sum(1 for _ in controller.iter_contracts())
+    elapsed = time.perf_counter() - start
+    session.close()
+    return {
+        "mode": mode,
+        "rows": count,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--read", choices=["buffered", "streamed"])
+    args = parser.parse_args()
+
+    if args.read:
+        print(json.dumps(read(args.url, args.read)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed(url, args.rows)
+        for mode in ("buffered", "streamed"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_streaming",
+                    "--url",
+                    url,
+                    "--read",
+                    mode,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{result['mode']:>9}: {result['rows']} rows in "
+                f"{result['seconds']} s, peak RSS {result['peak_rss_mb']} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Calibration of the bcrypt cost factor.
+
+Times a password hash at each cost factor and prints the highest one whose
+hash stays under the target login time, as the BCRYPT_ROUNDS setting.
+
+Usage:
+    python -m benchmarks.calibrate_password --target-ms 250
+"""
+
+import argparse
+import constantes
+from models.password import calibrate_rounds
+
+
+def main(argv=None):
+    """
+    Runs the bcrypt cost calibration from the command line.
+
+    Args:
+        argv (list): The command line arguments (default is sys.argv).
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.calibrate_password",
+        description="Picks the bcrypt cost factor for this machine.",
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=constantes.DEFAULT_BCRYPT_TARGET_MS,
+        help="maximum time spent hashing a password at login",
+    )
+    args = parser.parse_args(argv)
+    chosen, timings = calibrate_rounds(args.target_ms)
+    for rounds, elapsed_ms in timings:
+        print(f"rounds {rounds:>2} : {elapsed_ms:8.1f} ms")
+    print(f"BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,11 @@ LOG_OUT = "0"
 LIST_MANAGER_ASSIGN_EVENT = "4"
 LIST_MANAGER_MANAGE_USER = "5"
 LIST_MANAGER_MANAGE_CONTRACT = "6"
+LIST_MANAGER_POOL_STATS = "7"
+LIST_MANAGER_IMPORT_CONTRACTS = "8"
+LIST_MANAGER_REPORTS = "9"
+LIST_MANAGER_DOUBLE_BOOKINGS = "10"
+LIST_MANAGER_AUTO_ASSIGN = "11"
 
 # Manager Menu manage User
 
@@ -30,6 +35,7 @@ MANAGER_CREATE_NEW_USER = "1"
 MANAGER_UPDATE_USER = "2"
 MANAGER_DELETE_USER = "3"
 MANAGER_LIST_USER = "4"
+MANAGER_IMPORT_USERS = "5"
 # Manager Menu manage Contract
 
 MANAGER_CREATE_NEW_CONTRACT = "1"
@@ -47,6 +53,8 @@ LIST_SALES_UPDATE_CUSTOMER = "5"
 LIST_SALES_UPDATE_CONTRACT = "6"
 LIST_SALES_CREATE_EVENT = "7"
 LIST_SALES_DELETE_EVENT = "8"
+LIST_SALES_IMPORT_CUSTOMERS = "9"
+LIST_SALES_SEARCH_CUSTOMERS = "10"
 
 # Menu Sales Event Filter
 
@@ -96,3 +104,141 @@ CUSTOMER_CONTROLLER_EMAIL_EXISTS = "EMAIL ALREADY EXISTS"
 
 EVENT_CONTROLLER_SUPPORT_ALREADY_DEFINE = "A USER SUPPORT IS ALREADY DEFINE"
 EVENT_CONTROLLER_EVENT_NOT_FOUND = "EVENT NOT FOUND"
+
+# Pagination
+
+DEFAULT_PAGE_SIZE = 20
+PAGE_NEXT = "n"
+PAGE_PREVIOUS = "p"
+PAGE_QUIT = "0"
+
+# Money columns, DECIMAL(MONEY_PRECISION, MONEY_SCALE)
+
+MONEY_PRECISION = 12
+MONEY_SCALE = 2
+
+# Streaming
+
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+# Connection pool
+
+DEFAULT_DB_POOL_SIZE = 5
+DEFAULT_DB_MAX_OVERFLOW = 10
+DEFAULT_DB_POOL_TIMEOUT = 30
+DEFAULT_DB_POOL_RECYCLE = 3600
+DEFAULT_DB_POOL_PRE_PING = True
+
+# Slow query log, disabled with SLOW_QUERY_MS=0
+
+DEFAULT_SLOW_QUERY_MS = 500
+DEFAULT_SLOW_QUERY_LOG = "slow_queries.log"
+DEFAULT_SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_SLOW_QUERY_LOG_BACKUPS = 5
+SLOW_QUERY_QUEUE_SIZE = 100
+SLOW_QUERY_PARAMETERS_LENGTH = 1000
+SLOW_QUERY_CLOSE_TIMEOUT = 5
+
+# Bulk imports
+
+DEFAULT_IMPORT_BATCH_SIZE = 500
+USER_IMPORT_COLUMNS = (
+    "username",
+    "full_name",
+    "email",
+    "phone_number",
+    "role",
+    "password",
+)
+CUSTOMER_IMPORT_COLUMNS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "compagny_name",
+)
+CUSTOMER_IMPORT_SALES_COLUMN = "sales_username"
+CONTRACT_IMPORT_COLUMNS = (
+    "reference",
+    "customer_email",
+    "total_amount",
+    "remaining_amount",
+    "is_signed",
+)
+CONTRACT_IMPORT_SALES_COLUMN = "sales_username"
+IMPORT_TRUE_VALUES = ("1", "true", "yes", "y", "oui", "o")
+IMPORT_FALSE_VALUES = ("0", "false", "no", "n", "non")
+REJECT_FILE_SUFFIX = ".rejects.csv"
+
+# Exports
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_GZIP_SUFFIX = ".gz"
+EXPORT_GZIP_LEVEL = 6
+
+# Revenue reports
+
+REPORT_SALES = "sales"
+REPORT_CUSTOMERS = "customers"
+REPORT_MONTHS = "months"
+REPORT_NAMES = (REPORT_SALES, REPORT_CUSTOMERS, REPORT_MONTHS)
+REPORT_PERCENTILES = (50, 75, 90, 99)
+REPORT_HISTOGRAM_BINS = 5
+
+# Customer search
+
+SEARCH_GRAM_SIZE = 3
+SEARCH_MIN_WORD_LENGTH = 2
+# Share of the n-grams of a search a customer must contain to be found
+SEARCH_MIN_SIMILARITY = 0.6
+# Customers ranked by a search without FULLTEXT: they are taken, by id, among
+# the holders of the rarest n-grams of the search
+SEARCH_MAX_CANDIDATES = 1000
+# Words the InnoDB FULLTEXT index does not hold (innodb_ft_min_token_size and
+# the default stopword list): they cannot be required in a MySQL search
+MYSQL_FULLTEXT_MIN_TOKEN_SIZE = 3
+MYSQL_FULLTEXT_STOPWORDS = frozenset(
+    (
+        "a about an are as at be by com de en for from how i in is it la of on "
+        "or that the this to was what when where who will with und www"
+    ).split()
+)
+
+# Telemetry
+
+DEFAULT_TELEMETRY_SINKS = "file,sentry"
+TELEMETRY_SINKS = ("file", "stdout", "sentry")
+DEFAULT_TELEMETRY_FILE = "telemetry.jsonl"
+DEFAULT_TELEMETRY_LEVEL = "INFO"
+DEFAULT_TELEMETRY_SAMPLE_RATE = 1.0
+DEFAULT_TELEMETRY_QUEUE_SIZE = 10000
+TELEMETRY_BATCH_SIZE = 200
+TELEMETRY_CLOSE_TIMEOUT = 5
+# Records of this level (logging.WARNING) and above are never sampled out
+TELEMETRY_ALWAYS_KEPT_LEVEL = 30
+DEFAULT_SENTRY_TRACES_SAMPLE_RATE = 0.1
+DEFAULT_SENTRY_PROFILES_SAMPLE_RATE = 0.0
+
+# Query profiler
+
+# A statement run this many times by one action is reported as an N+1 query
+PROFILE_REPEATED_STATEMENT = 5
+
+# Event name completion
+
+EVENT_NAME_COMPLETIONS = 10
+
+# Password hashing
+
+DEFAULT_BCRYPT_ROUNDS = 12
+MIN_BCRYPT_ROUNDS = 4
+MAX_BCRYPT_ROUNDS = 31
+DEFAULT_BCRYPT_TARGET_MS = 250
+
+# Headless commands exit codes
+
+CLI_EXIT_OK = 0
+CLI_EXIT_ERROR = 1
+CLI_EXIT_NOT_LOGGED_IN = 3
+CLI_EXIT_FORBIDDEN = 4
+CLI_TABLE_WIDTH = 500
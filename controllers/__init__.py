@@ -1,6 +1,11 @@
 from .main_controller import MainController
 from .user_controller import UserController
 
+from .balance_controller import BalanceController
+from .search_controller import SearchController
 from .customer_controller import CustomerController
 from .contract_controller import ContractController
 from .event_controller import EventController
+from .report_controller import ReportController
+from .assignment_controller import AssignmentController
+from .cli_controller import CliController
@@ -0,0 +1,212 @@
+import heapq
+from collections import defaultdict
+from sqlalchemy import bindparam, select, update
+import models
+import utils
+import constantes
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AssignmentController:
+    """
+    The AssignmentController class assigns the events without support to the
+    support users, balancing their workload.
+
+    The events are taken by start date. Each one goes to the support with the
+    fewest booked hours who is free over its period: the supports are kept in a
+    heap ordered by booked hours, and the bookings of each support in an interval
+    tree, so planning n events for s supports takes O(n log s + n log n) when the
+    least loaded supports are free. The plan is computed from three queries, and
+    applied in a single transaction.
+
+    Attributes:
+        session: The database session used for database operations.
+        view: The view associated with the events.
+
+    Methods:
+        __init__(self, session, view=None):
+            Initializes the AssignmentController with the given parameters.
+
+        supports(self):
+            Returns the id and email of the support users.
+
+        plan(self):
+            Computes the assignment of the events without support.
+
+        apply(self, assignments):
+            Assigns the supports of a plan in a single transaction.
+
+        auto_assign(self):
+            Displays the plan and applies it once confirmed by the user.
+    """
+
+    def __init__(self, session, view=None):
+        """
+        Initializes the AssignmentController with the given parameters.
+
+        Args:
+            session: The database session used for database operations.
+            view: The view associated with the events (default is None).
+        """
+        self.session = session
+        self.view = view
+
+    def supports(self):
+        """
+        Returns the id and email of the support users.
+
+        Returns:
+            dict: The email of each support user, by id.
+        """
+        return dict(
+            self.session.execute(
+                select(models.User.id, models.User.email)
+                .join(models.Role, models.User.role_id == models.Role.id)
+                .where(models.Role.name == constantes.ROLE_SUPPORT)
+                .order_by(models.User.id)
+            ).all()
+        )
+
+    def plan(self):
+        """
+        Computes the assignment of the events without support.
+
+        The workload of a support is the number of hours of the events they are
+        booked on. Events no support is free for, and events without a start or
+        end date, are left out of the plan.
+
+        Returns:
+            tuple: The (event id, event name, start date, end date, support email,
+            support id) assignments and the (event id, event name, start date,
+            end date) events left without support.
+        """
+        events = self.session.execute(
+            select(
+                models.Event.id,
+                models.Event.event_name,
+                models.Event.start_date,
+                models.Event.end_date,
+            )
+            .where(models.Event.support_id.is_(None))
+            .order_by(models.Event.start_date, models.Event.id)
+        ).all()
+        unassigned = [
+            tuple(event)
+            for event in events
+            if event.start_date is None or event.end_date is None
+        ]
+        events = [
+            event
+            for event in events
+            if event.start_date is not None and event.end_date is not None
+        ]
+        supports = self.supports()
+        if not events or not supports:
+            return [], unassigned + [tuple(event) for event in events]
+
+        hours = dict.fromkeys(supports, 0.0)
+        trees = defaultdict(utils.IntervalTree)
+        window_start = events[0][2]
+        window_end = max(event[3] for event in events)
+        for support_id, start_date, end_date in self.session.execute(
+            select(
+                models.Event.support_id,
+                models.Event.start_date,
+                models.Event.end_date,
+            ).where(
+                models.Event.support_id.in_(supports),
+                models.Event.start_date.isnot(None),
+                models.Event.end_date.isnot(None),
+            )
+        ):
+            hours[support_id] += self._hours(start_date, end_date)
+            if start_date < window_end and end_date > window_start:
+                trees[support_id].add(start_date, end_date)
+
+        heap = [(booked, support_id) for support_id, booked in hours.items()]
+        heapq.heapify(heap)
+        assignments = []
+        for event_id, name, start_date, end_date in events:
+            busy = []
+            while heap:
+                booked, support_id = heapq.heappop(heap)
+                if trees[support_id].any_overlap(start_date, end_date):
+                    busy.append((booked, support_id))
+                    continue
+                trees[support_id].add(start_date, end_date)
+                booked += self._hours(start_date, end_date)
+                heapq.heappush(heap, (booked, support_id))
+                assignments.append(
+                    (
+                        event_id,
+                        name,
+                        start_date,
+                        end_date,
+                        supports[support_id],
+                        support_id,
+                    )
+                )
+                break
+            else:
+                unassigned.append((event_id, name, start_date, end_date))
+            for support in busy:
+                heapq.heappush(heap, support)
+        return assignments, unassigned
+
+    def apply(self, assignments):
+        """
+        Assigns the supports of a plan in a single transaction.
+
+        An event assigned since the plan was computed keeps its support.
+
+        Args:
+            assignments (list): The assignments returned by plan.
+
+        Returns:
+            int: The number of events assigned.
+        """
+        if not assignments:
+            return 0
+        events = models.Event.__table__
+        try:
+            result = self.session.execute(
+                update(events)
+                .where(
+                    events.c.id == bindparam("event_id"),
+                    events.c.support_id.is_(None),
+                )
+                .values(support_id=bindparam("new_support_id")),
+                [
+                    {
+                        "event_id": assignment[0],
+                        "new_support_id": assignment[5],
+                    }
+                    for assignment in assignments
+                ],
+            )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        logger.info(f"Auto assignment : {result.rowcount} events assigned")
+        return result.rowcount
+
+    def auto_assign(self):
+        """
+        Displays the plan and applies it once confirmed by the user.
+
+        Returns:
+            None
+        """
+        assignments, unassigned = self.plan()
+        self.view.display_assignment_plan(
+            [assignment[:5] for assignment in assignments], unassigned
+        )
+        if assignments and self.view.input_apply_assignment_plan():
+            self.view.display_assignment_applied(self.apply(assignments))
+
+    @staticmethod
+    def _hours(start_date, end_date):
+        return (end_date - start_date).total_seconds() / 3600
@@ -0,0 +1,268 @@
+import models
+from collections import defaultdict
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import logging
+
+logger = logging.getLogger(__name__)
+
+BALANCE_COLUMNS = (
+    "signed_count",
+    "unsigned_count",
+    "total_amount",
+    "remaining_amount",
+)
+
+
+class BalanceController:
+    """
+    The BalanceController class maintains the running totals of the contracts of
+    each user (models.SalesBalance).
+
+    The contract controller passes every change of a contract to the controller
+    before committing, so the totals are changed in the same transaction as the
+    contract. Each change is applied as an increment (col = col + delta), so
+    concurrent transactions do not overwrite each other's totals.
+
+    Attributes:
+        session: The database session used for database operations.
+        view: The view associated with the balances.
+
+    Methods:
+        __init__(self, session, view=None):
+            Initializes the BalanceController with the given parameters.
+
+        contract_values(contract):
+            Returns the manager and the counters of a contract.
+
+        record_contract(self, contract, previous=None):
+            Applies the change of a contract to the totals of its manager.
+
+        new_deltas():
+            Returns an empty set of deltas, where every manager starts at zero.
+
+        add_deltas(self, deltas, values, sign=1):
+            Adds the counters of a contract to a set of deltas.
+
+        apply_deltas(self, deltas):
+            Increments the totals of each manager by their deltas.
+
+        balances_query(self):
+            Builds the query listing the totals with the name of their manager.
+
+        expected_balances(self):
+            Computes the totals of each manager from the contracts.
+
+        rebuild(self):
+            Recomputes every total from the contracts and repairs the drift.
+    """
+
+    def __init__(self, session, view=None):
+        """
+        Initializes the BalanceController with the given parameters.
+
+        Args:
+            session: The database session used for database operations.
+            view: The view associated with the balances (default is None).
+        """
+        self.session = session
+        self.view = view
+
+    @staticmethod
+    def contract_values(contract):
+        """
+        Returns the manager and the counters of a contract.
+
+        Args:
+            contract: A models.Contract, or any object with its columns.
+
+        Returns:
+            tuple: The manager id and the dict of the counters of the contract.
+        """
+        manager_id = contract.manager_id
+        if manager_id is None and getattr(contract, "user", None) is not None:
+            manager_id = contract.user.id
+        return manager_id, {
+            "signed_count": 1 if contract.is_signed else 0,
+            "unsigned_count": 0 if contract.is_signed else 1,
+            "total_amount": models.to_money(contract.total_amount),
+            "remaining_amount": models.to_money(contract.remaining_amount),
+        }
+
+    def record_contract(self, contract, previous=None):
+        """
+        Applies the change of a contract to the totals of its manager.
+
+        Must be called before the transaction saving the contract is committed.
+
+        Args:
+            contract (models.Contract): The contract created or updated.
+            previous (tuple): The contract_values of the contract before the update (default is None for a new contract).
+        """
+        deltas = self.new_deltas()
+        if previous is not None:
+            self.add_deltas(deltas, previous, sign=-1)
+        self.add_deltas(deltas, self.contract_values(contract))
+        self.apply_deltas(deltas)
+
+    @staticmethod
+    def new_deltas():
+        """
+        Returns an empty set of deltas, where every manager starts at zero.
+
+        Returns:
+            defaultdict: The deltas of each manager, by manager id.
+        """
+        return defaultdict(lambda: dict.fromkeys(BALANCE_COLUMNS, 0))
+
+    def add_deltas(self, deltas, values, sign=1):
+        """
+        Adds the counters of a contract to a set of deltas.
+
+        Args:
+            deltas (dict): The deltas of each manager, by manager id.
+            values (tuple): The manager id and counters returned by contract_values.
+            sign (int): 1 to add the contract, -1 to remove it (default is 1).
+        """
+        manager_id, counters = values
+        for column, value in counters.items():
+            deltas[manager_id][column] += sign * value
+
+    def apply_deltas(self, deltas):
+        """
+        Increments the totals of each manager by their deltas.
+
+        Each manager is written with a single upsert, so the row of a manager who
+        has no totals yet is created even when another transaction creates it at
+        the same time.
+
+        Args:
+            deltas (dict): The deltas of each manager, by manager id.
+        """
+        table = models.SalesBalance.__table__
+        mysql = self.session.get_bind().dialect.name == "mysql"
+        for manager_id, delta in deltas.items():
+            if not any(delta.values()):
+                continue
+            if mysql:
+                statement = mysql_insert(table).values(
+                    manager_id=manager_id, **delta
+                )
+                statement = statement.on_duplicate_key_update(
+                    {
+                        column: table.c[column] + statement.inserted[column]
+                        for column in BALANCE_COLUMNS
+                    }
+                )
+            else:
+                statement = sqlite_insert(table).values(
+                    manager_id=manager_id, **delta
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=[table.c.manager_id],
+                    set_={
+                        column: table.c[column] + statement.excluded[column]
+                        for column in BALANCE_COLUMNS
+                    },
+                )
+            self.session.execute(statement)
+
+    def balances_query(self):
+        """
+        Builds the query listing the totals with the name of their manager.
+
+        Returns:
+            Select: The query returning (username, full name, counters) rows.
+        """
+        return (
+            select(
+                models.User.username,
+                models.User.full_name,
+                *(
+                    getattr(models.SalesBalance, column)
+                    for column in BALANCE_COLUMNS
+                ),
+            )
+            .join(
+                models.SalesBalance,
+                models.SalesBalance.manager_id == models.User.id,
+            )
+            .order_by(models.User.username)
+        )
+
+    def expected_balances(self):
+        """
+        Computes the totals of each manager from the contracts.
+
+        Returns:
+            dict: The counters of each manager, by manager id.
+        """
+        signed = models.Contract.is_signed.is_(True)
+        rows = self.session.execute(
+            select(
+                models.Contract.manager_id,
+                func.sum(case((signed, 1), else_=0)),
+                func.sum(case((signed, 0), else_=1)),
+                func.sum(models.Contract.total_amount),
+                func.sum(models.Contract.remaining_amount),
+            ).group_by(models.Contract.manager_id)
+        )
+        return {
+            manager_id: dict(zip(BALANCE_COLUMNS, counters))
+            for manager_id, *counters in rows
+        }
+
+    def rebuild(self):
+        """
+        Recomputes every total from the contracts and repairs the drift.
+
+        The totals are replaced in a single transaction.
+
+        Returns:
+            dict: The number of managers, and of managers whose totals were wrong.
+        """
+        expected = self.expected_balances()
+        counters = [
+            getattr(models.SalesBalance, column) for column in BALANCE_COLUMNS
+        ]
+        stored = {
+            manager_id: dict(zip(BALANCE_COLUMNS, values))
+            for manager_id, *values in self.session.execute(
+                select(models.SalesBalance.manager_id, *counters)
+            )
+        }
+        drifted = [
+            manager_id
+            for manager_id in expected.keys() | stored.keys()
+            if not self._same_counters(
+                expected.get(manager_id), stored.get(manager_id)
+            )
+        ]
+        try:
+            self.session.execute(delete(models.SalesBalance))
+            if expected:
+                self.session.execute(
+                    insert(models.SalesBalance),
+                    [
+                        dict(counters, manager_id=manager_id)
+                        for manager_id, counters in expected.items()
+                    ],
+                )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        logger.info(
+            f"Rebuild balances : {len(expected)} managers, "
+            f"{len(drifted)} drifted"
+        )
+        return {"managers": len(expected), "drifted": len(drifted)}
+
+    @staticmethod
+    def _same_counters(expected, stored):
+        if expected is None or stored is None:
+            return expected == stored
+        return all(
+            expected[column] == stored[column] for column in BALANCE_COLUMNS
+        )
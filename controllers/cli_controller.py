@@ -0,0 +1,839 @@
+import argparse
+import contextlib
+import logging
+import controllers
+import constantes
+import models
+import utils
+import views
+import views.themes
+
+logger = logging.getLogger(__name__)
+
+CONTRACT_COLUMNS = (
+    "id",
+    "customer",
+    "customer_email",
+    "sales_contact",
+    "manager",
+    "total_amount",
+    "remaining_amount",
+    "is_signed",
+    "creation_date",
+)
+EVENT_COLUMNS = (
+    "id",
+    "event_name",
+    "contract_id",
+    "customer_name",
+    "sales_contact",
+    "start_date",
+    "end_date",
+    "location",
+    "nb_attendees",
+    "support",
+)
+CUSTOMER_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "compagny_name",
+    "sales_contact",
+    "last_contact_date",
+)
+SEARCH_RESULT_COLUMNS = ("score",) + CUSTOMER_COLUMNS
+USER_COLUMNS = ("id", "username", "full_name", "email", "phone_number", "role")
+INDEX_ADVISOR_COLUMNS = ("query", "full_scans", "plan")
+BALANCE_COLUMNS = (
+    "username",
+    "full_name",
+    "signed_count",
+    "unsigned_count",
+    "total_amount",
+    "remaining_amount",
+)
+ASSIGNMENT_COLUMNS = (
+    "event_id",
+    "event_name",
+    "start_date",
+    "end_date",
+    "support",
+)
+DOUBLE_BOOKING_COLUMNS = (
+    "support",
+    "event_name",
+    "overlapping_event_name",
+    "overlap_start",
+    "overlap_end",
+)
+
+
+class CliController:
+    """
+    The CliController class runs the headless commands of the application.
+
+    The commands authenticate with the token saved by the interactive login, build
+    their queries with the controllers' query builders and write the results
+    without any menu, so scripts and cron jobs can use them.
+
+    Attributes:
+        session: The database session used for database operations.
+        view: The view writing the results and messages.
+        user_controller: The controller used to authenticate and import users.
+        user: The user of the saved token.
+        role_name: The role of the user of the saved token.
+        profiler: The profiler of the commands, or None.
+
+    Methods:
+        __init__(self, session, view=None, profiler=None):
+            Initializes the CliController with the given parameters.
+
+        build_parser(self):
+            Builds the parser of the command line.
+
+        run(self, argv):
+            Parses and runs a command, returning the exit code.
+
+        authenticate(self):
+            Loads the user of the saved token.
+
+        list_contracts(self, args):
+            Writes the contracts matching the command filters.
+
+        list_events(self, args):
+            Writes the events matching the command filters.
+
+        list_customers(self, args):
+            Writes the customers matching the command filters.
+
+        list_users(self, args):
+            Writes the users.
+
+        search_customers(self, args):
+            Writes a page of the customers matching a search, best first.
+
+        list_balances(self, args):
+            Writes the contract totals of each manager.
+
+        list_double_bookings(self, args):
+            Writes the overlapping events booked for the same support.
+
+        rebuild_balances(self, args):
+            Recomputes the contract totals of each manager from the contracts.
+
+        rebuild_search_index(self, args):
+            Recomputes the search index of the customers.
+
+        assign_supports(self, args):
+            Assigns the events without support, or writes the plan with --dry-run.
+
+        advised_queries(self):
+            Builds the filtered listing queries checked by the index advisor.
+
+        index_advisor(self, args):
+            Explains the listing queries and flags the full table scans.
+
+        report(self, args):
+            Writes a revenue report and displays its statistics.
+
+        import_users(self, args):
+            Creates the users listed in a CSV file.
+
+        import_customers(self, args):
+            Creates the customers listed in a CSV file.
+
+        import_contracts(self, args):
+            Creates or updates the contracts listed in a CSV file.
+    """
+
+    def __init__(self, session, view=None, profiler=None):
+        """
+        Initializes the CliController with the given parameters.
+
+        With a profiler, the statements of the command are counted and their
+        summary displayed once it has run.
+
+        Args:
+            session: The database session used for database operations.
+            view: The view writing the results and messages (default writes to stdout and stderr).
+            profiler (utils.QueryProfiler): The profiler of the commands (default is None).
+        """
+        self.session = session
+        self.view = view or views.CliView(
+            views.themes.theme_console(stderr=True)
+        )
+        self.user_controller = controllers.UserController(
+            session, view=views.UserView(self.view.console)
+        )
+        self.user = None
+        self.role_name = None
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.on_action = self.view.display_action_profile
+
+    def build_parser(self):
+        """
+        Builds the parser of the command line.
+
+        Each command stores its handler and the roles allowed to run it.
+
+        Returns:
+            ArgumentParser: The parser.
+        """
+        output = argparse.ArgumentParser(add_help=False)
+        output.add_argument(
+            "--format",
+            choices=("table", "json") + constantes.EXPORT_FORMATS,
+            default="table",
+            help="output format (default: table)",
+        )
+        output.add_argument(
+            "--output", help="file to write to (default: standard output)"
+        )
+        output.add_argument(
+            "--gzip",
+            action="store_true",
+            default=None,
+            help="compress the output with gzip "
+            f"(default for {constantes.EXPORT_GZIP_SUFFIX} files)",
+        )
+
+        parser = argparse.ArgumentParser(
+            prog="python main.py",
+            description="Epic Events headless commands. Without command, "
+            "the interactive menu is started.",
+        )
+        commands = parser.add_subparsers(dest="command", required=True)
+
+        list_parser = commands.add_parser("list", help="list records")
+        resources = list_parser.add_subparsers(dest="resource", required=True)
+
+        contracts = resources.add_parser("contracts", parents=[output])
+        contracts.add_argument(
+            "--unsigned", action="store_true", help="not signed contracts"
+        )
+        contracts.add_argument(
+            "--unpaid", action="store_true", help="not fully paid contracts"
+        )
+        contracts.add_argument(
+            "--mine", action="store_true", help="contracts you manage"
+        )
+        contracts.set_defaults(
+            handler=self.list_contracts, roles=constantes.ROLES
+        )
+
+        events = resources.add_parser("events", parents=[output])
+        events.add_argument(
+            "--no-support", action="store_true", help="events without support"
+        )
+        events.add_argument(
+            "--mine",
+            action="store_true",
+            help="events you are the sales contact or the support of",
+        )
+        events.set_defaults(handler=self.list_events, roles=constantes.ROLES)
+
+        customers = resources.add_parser("customers", parents=[output])
+        customers.add_argument(
+            "--mine", action="store_true", help="customers you follow"
+        )
+        customers.set_defaults(
+            handler=self.list_customers, roles=constantes.ROLES
+        )
+
+        users = resources.add_parser("users", parents=[output])
+        users.set_defaults(
+            handler=self.list_users, roles=(constantes.ROLE_MANAGER,)
+        )
+
+        balances = resources.add_parser("balances", parents=[output])
+        balances.set_defaults(
+            handler=self.list_balances, roles=(constantes.ROLE_MANAGER,)
+        )
+
+        double_bookings = resources.add_parser(
+            "double-bookings", parents=[output]
+        )
+        double_bookings.set_defaults(
+            handler=self.list_double_bookings,
+            roles=(constantes.ROLE_MANAGER,),
+        )
+
+        rebuild_parser = commands.add_parser(
+            "rebuild", help="recompute derived data"
+        )
+        rebuilds = rebuild_parser.add_subparsers(
+            dest="resource", required=True
+        )
+        rebuild_balances = rebuilds.add_parser("balances")
+        rebuild_balances.set_defaults(
+            handler=self.rebuild_balances, roles=(constantes.ROLE_MANAGER,)
+        )
+        rebuild_search = rebuilds.add_parser("search-index")
+        rebuild_search.set_defaults(
+            handler=self.rebuild_search_index,
+            roles=(constantes.ROLE_MANAGER,),
+        )
+
+        search_parser = commands.add_parser(
+            "search", help="search records, best match first"
+        )
+        searches = search_parser.add_subparsers(
+            dest="resource", required=True
+        )
+        search_customers = searches.add_parser(
+            "customers", parents=[output]
+        )
+        search_customers.add_argument(
+            "text", nargs="+", help="words of the names, email or company"
+        )
+        search_customers.add_argument(
+            "--mine", action="store_true", help="customers you follow"
+        )
+        search_customers.add_argument(
+            "--page", type=int, default=0, help="page number, from 0"
+        )
+        search_customers.add_argument("--page-size", type=int)
+        search_customers.set_defaults(
+            handler=self.search_customers, roles=constantes.ROLES
+        )
+
+        assign_parser = commands.add_parser(
+            "assign", help="assign records automatically"
+        )
+        assigns = assign_parser.add_subparsers(dest="resource", required=True)
+        assign_supports = assigns.add_parser("supports", parents=[output])
+        assign_supports.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="write the plan without assigning the events",
+        )
+        assign_supports.set_defaults(
+            handler=self.assign_supports, roles=(constantes.ROLE_MANAGER,)
+        )
+
+        advisor = commands.add_parser(
+            "index-advisor",
+            help="explain the listing queries and flag full table scans",
+            parents=[output],
+        )
+        advisor.add_argument(
+            "--strict",
+            action="store_true",
+            help="exit with an error when a query reads a table in full",
+        )
+        advisor.set_defaults(
+            handler=self.index_advisor,
+            roles=(constantes.ROLE_MANAGER, constantes.ROLE_ADMIN),
+        )
+
+        report_parser = commands.add_parser(
+            "report", help="revenue reports", parents=[output]
+        )
+        report_parser.add_argument(
+            "report", choices=constantes.REPORT_NAMES, help="grouping"
+        )
+        report_parser.set_defaults(
+            handler=self.report, roles=(constantes.ROLE_MANAGER,)
+        )
+
+        import_parser = commands.add_parser("import", help="import records")
+        imports = import_parser.add_subparsers(dest="resource", required=True)
+        import_users = imports.add_parser("users")
+        import_users.add_argument("path", help="CSV file of the users")
+        import_users.add_argument("--batch-size", type=int)
+        import_users.add_argument("--workers", type=int)
+        import_users.set_defaults(
+            handler=self.import_users, roles=(constantes.ROLE_MANAGER,)
+        )
+        import_customers = imports.add_parser("customers")
+        import_customers.add_argument("path", help="CSV file of the customers")
+        import_customers.add_argument(
+            "--rejects", help="file of the rejected lines"
+        )
+        import_customers.add_argument("--batch-size", type=int)
+        import_customers.set_defaults(
+            handler=self.import_customers,
+            roles=(constantes.ROLE_SALES, constantes.ROLE_MANAGER),
+        )
+        import_contracts = imports.add_parser("contracts")
+        import_contracts.add_argument("path", help="CSV file of the contracts")
+        import_contracts.add_argument(
+            "--rejects", help="file of the rejected lines"
+        )
+        import_contracts.add_argument("--batch-size", type=int)
+        import_contracts.set_defaults(
+            handler=self.import_contracts, roles=(constantes.ROLE_MANAGER,)
+        )
+        return parser
+
+    def run(self, argv):
+        """
+        Parses and runs a command, returning the exit code.
+
+        Args:
+            argv (list): The command line arguments, without the program name.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        args = self.build_parser().parse_args(argv)
+        if not self.authenticate():
+            self.view.display_not_logged_in()
+            return constantes.CLI_EXIT_NOT_LOGGED_IN
+        if self.role_name not in args.roles:
+            self.view.display_permission_denied()
+            return constantes.CLI_EXIT_FORBIDDEN
+        profile = (
+            self.profiler.action(
+                f"{type(self).__name__}.{args.handler.__name__}"
+            )
+            if self.profiler is not None
+            else contextlib.nullcontext()
+        )
+        try:
+            with profile:
+                if getattr(args, "output", None) or getattr(
+                    args, "gzip", None
+                ):
+                    with utils.open_export(args.output, args.gzip) as stream:
+                        self.view.stream = stream
+                        return args.handler(args)
+                return args.handler(args)
+        except (OSError, ValueError) as err:
+            self.session.rollback()
+            self.view.display_error(f"Error : {err}")
+            logger.info("Command " + " ".join(argv) + " failed " + str(err))
+            return constantes.CLI_EXIT_ERROR
+
+    def authenticate(self):
+        """
+        Loads the user of the saved token.
+
+        The token is decoded once and its principal gives the role, so
+        authenticating costs a single query.
+
+        Returns:
+            bool: True if the saved token is valid.
+        """
+        token = self.user_controller.load_token()
+        payload = self.user_controller.decode_token(token) if token else None
+        if payload:
+            self.user = self.user_controller.get_user_from_principal(payload)
+        if self.user is None:
+            return False
+        self.role_name = self.user_controller.principal["role"]
+        return True
+
+    def list_contracts(self, args):
+        """
+        Writes the contracts matching the command filters.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        filters = []
+        if args.unsigned:
+            filters.append(models.Contract.is_signed.is_(False))
+        if args.unpaid:
+            filters.append(models.Contract.remaining_amount > 0)
+        if args.mine:
+            filters.append(models.Contract.manager_id == self.user.id)
+        contract_controller = controllers.ContractController(
+            self.session, view=None, user=self.user
+        )
+        rows = (
+            (
+                contract.id,
+                contract.customer.compagny_name,
+                contract.customer.email,
+                contract.customer.user.username,
+                contract.user.full_name,
+                contract.total_amount,
+                contract.remaining_amount,
+                contract.is_signed,
+                contract.creation_date,
+            )
+            for contract in contract_controller.iter_contracts(filters)
+        )
+        self.view.write_rows(CONTRACT_COLUMNS, rows, args.format)
+        return constantes.CLI_EXIT_OK
+
+    def list_events(self, args):
+        """
+        Writes the events matching the command filters.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        event_controller = controllers.EventController(
+            self.session, view=None, user=self.user
+        )
+        filters = []
+        if args.no_support:
+            filters.append(models.Event.support_id.is_(None))
+        if args.mine:
+            filters.append(event_controller.own_events_filter())
+        rows = (
+            (
+                event.id,
+                event.event_name,
+                event.contract_id,
+                event.customer_name,
+                sales_contact,
+                event.start_date,
+                event.end_date,
+                event.location,
+                event.nb_attendees,
+                support,
+            )
+            for event, sales_contact, support in event_controller.iter_events(
+                filters
+            )
+        )
+        self.view.write_rows(EVENT_COLUMNS, rows, args.format)
+        return constantes.CLI_EXIT_OK
+
+    def list_customers(self, args):
+        """
+        Writes the customers matching the command filters.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        filters = []
+        if args.mine:
+            filters.append(models.Customer.sales_id == self.user.id)
+        customer_controller = controllers.CustomerController(
+            self.session, view=None, user=self.user
+        )
+        rows = (
+            (
+                customer.id,
+                customer.first_name,
+                customer.last_name,
+                customer.email,
+                customer.phone_number,
+                customer.compagny_name,
+                customer.user.username,
+                customer.last_contact_date,
+            )
+            for customer in customer_controller.iter_customers(filters)
+        )
+        self.view.write_rows(CUSTOMER_COLUMNS, rows, args.format)
+        return constantes.CLI_EXIT_OK
+
+    def search_customers(self, args):
+        """
+        Writes a page of the customers matching a search, best first.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        customers, has_next = controllers.SearchController(
+            self.session, user=self.user
+        ).search(
+            " ".join(args.text),
+            page=args.page,
+            page_size=args.page_size,
+            mine=args.mine,
+        )
+        rows = (
+            (
+                round(score, 3),
+                customer.id,
+                customer.first_name,
+                customer.last_name,
+                customer.email,
+                customer.phone_number,
+                customer.compagny_name,
+                customer.user.username,
+                customer.last_contact_date,
+            )
+            for customer, score in customers
+        )
+        self.view.write_rows(SEARCH_RESULT_COLUMNS, rows, args.format)
+        if has_next:
+            self.view.display_next_page(args.page + 1)
+        return constantes.CLI_EXIT_OK
+
+    def list_users(self, args):
+        """
+        Writes the users.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        rows = (
+            (
+                user.id,
+                user.username,
+                user.full_name,
+                user.email,
+                user.phone_number,
+                user.role.name,
+            )
+            for user in self.user_controller.iter_users()
+        )
+        self.view.write_rows(USER_COLUMNS, rows, args.format)
+        return constantes.CLI_EXIT_OK
+
+    def list_balances(self, args):
+        """
+        Writes the contract totals of each manager.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        rows = self.session.execute(
+            controllers.BalanceController(self.session).balances_query()
+        )
+        self.view.write_rows(BALANCE_COLUMNS, rows, args.format)
+        return constantes.CLI_EXIT_OK
+
+    def list_double_bookings(self, args):
+        """
+        Writes the overlapping events booked for the same support.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        event_controller = controllers.EventController(
+            self.session, view=None, user=self.user
+        )
+        self.view.write_rows(
+            DOUBLE_BOOKING_COLUMNS,
+            event_controller.find_double_bookings(),
+            args.format,
+        )
+        return constantes.CLI_EXIT_OK
+
+    def rebuild_balances(self, args):
+        """
+        Recomputes the contract totals of each manager from the contracts.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        report = controllers.BalanceController(self.session).rebuild()
+        self.view.display_rebuild_balances_report(report)
+        return constantes.CLI_EXIT_OK
+
+    def assign_supports(self, args):
+        """
+        Assigns the events without support, or writes the plan with --dry-run.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        assignment_controller = controllers.AssignmentController(self.session)
+        assignments, unassigned = assignment_controller.plan()
+        applied = None
+        if not args.dry_run:
+            applied = assignment_controller.apply(assignments)
+        self.view.write_rows(
+            ASSIGNMENT_COLUMNS,
+            [assignment[:5] for assignment in assignments]
+            + [(*event, None) for event in unassigned],
+            args.format,
+        )
+        self.view.display_assignment_report(
+            len(assignments), len(unassigned), applied
+        )
+        return constantes.CLI_EXIT_OK
+
+    def rebuild_search_index(self, args):
+        """
+        Recomputes the search index of the customers.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        search_controller = controllers.SearchController(self.session)
+        indexed = search_controller.rebuild()
+        self.view.display_rebuild_search_index_report(
+            indexed, search_controller.uses_fulltext
+        )
+        return constantes.CLI_EXIT_OK
+
+    def advised_queries(self):
+        """
+        Builds the filtered listing queries checked by the index advisor.
+
+        The queries are built with the controllers' query builders and filters, for
+        the logged-in user, so that the plans are those of the real listings.
+
+        Returns:
+            dict: The queries, by name.
+        """
+        contract_controller = controllers.ContractController(
+            self.session, view=None, user=self.user
+        )
+        event_controller = controllers.EventController(
+            self.session, view=None, user=self.user
+        )
+        customers = controllers.CustomerController(
+            self.session, view=None, user=self.user
+        ).customers_query()
+        contracts = {
+            "unsigned": [models.Contract.is_signed.is_(False)],
+            "unpaid": [models.Contract.remaining_amount > 0],
+            "unsigned unpaid": [
+                models.Contract.is_signed.is_(False),
+                models.Contract.remaining_amount > 0,
+            ],
+            "mine": [models.Contract.manager_id == self.user.id],
+        }
+        queries = {
+            f"contracts {name}": contract_controller.contracts_query(filters)
+            for name, filters in contracts.items()
+        }
+        queries["events no support"] = event_controller.events_query(
+            [models.Event.support_id.is_(None)]
+        )
+        queries["events mine"] = event_controller.events_query(
+            [event_controller.own_events_filter()]
+        )
+        queries["customers mine"] = customers.filter(
+            models.Customer.sales_id == self.user.id
+        )
+        return queries
+
+    def index_advisor(self, args):
+        """
+        Explains the listing queries and flags the full table scans.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command, an error with --strict when a query
+            reads a table in full.
+        """
+        rows = list(
+            utils.IndexAdvisor(self.session).advise(self.advised_queries())
+        )
+        self.view.write_rows(INDEX_ADVISOR_COLUMNS, rows, args.format)
+        flagged = [name for name, tables, _ in rows if tables]
+        self.view.display_index_advisor_summary(len(rows), flagged)
+        if flagged and args.strict:
+            return constantes.CLI_EXIT_ERROR
+        return constantes.CLI_EXIT_OK
+
+    def report(self, args):
+        """
+        Writes a revenue report and displays its statistics.
+
+        The rows go to the output in the chosen format, the percentiles of the signed
+        revenue and of the outstanding amount to the console.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        report_controller = controllers.ReportController(
+            self.session, view=None, user=self.user
+        )
+        columns, rows = report_controller.build_report(args.report)
+        self.view.write_rows(columns, rows, args.format)
+        self.view.display_report_summary(
+            {
+                metric: report_controller.summarize(
+                    [row[columns.index(metric)] for row in rows]
+                )
+                for metric in ("revenue_signed", "outstanding")
+            }
+        )
+        return constantes.CLI_EXIT_OK
+
+    def import_users(self, args):
+        """
+        Creates the users listed in a CSV file.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        report = self.user_controller.import_users_csv(
+            args.path, batch_size=args.batch_size, workers=args.workers
+        )
+        self.view.display_import_users_report(report)
+        if report["rejected"]:
+            return constantes.CLI_EXIT_ERROR
+        return constantes.CLI_EXIT_OK
+
+    def import_customers(self, args):
+        """
+        Creates the customers listed in a CSV file.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        report = controllers.CustomerController(
+            self.session, view=None, user=self.user
+        ).import_customers_csv(
+            args.path, reject_path=args.rejects, batch_size=args.batch_size
+        )
+        self.view.display_import_customers_report(report)
+        if report["rejected"]:
+            return constantes.CLI_EXIT_ERROR
+        return constantes.CLI_EXIT_OK
+
+    def import_contracts(self, args):
+        """
+        Creates or updates the contracts listed in a CSV file.
+
+        Args:
+            args: The parsed command line.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        report = controllers.ContractController(
+            self.session, view=None, user=self.user
+        ).import_contracts_csv(
+            args.path, reject_path=args.rejects, batch_size=args.batch_size
+        )
+        self.view.display_import_contracts_report(report)
+        if report["rejected"]:
+            return constantes.CLI_EXIT_ERROR
+        return constantes.CLI_EXIT_OK
@@ -1,7 +1,14 @@
+import controllers
 import models
+import utils
 import views
+import csv
+import time
+from types import SimpleNamespace
 from datetime import datetime
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 import constantes
 from rich.table import Table
 import logging
@@ -35,7 +42,28 @@ class ContractController:
             Retrieves the contract associated with a given customer.
 
         list_contracts(self):
-            Lists all contracts in the database.
+            Lists all contracts in the database, one page at a time.
+
+        contracts_query(self, filters=None, session=None):
+            Builds the query used to list contracts.
+
+        iter_contracts(self, filters=None, batch_size=None):
+            Iterates over the contracts through a server-side cursor.
+
+        import_contracts(self):
+            Loads the contracts listed in a CSV file chosen by the manager.
+
+        import_contracts_csv(self, path, reject_path=None, batch_size=None):
+            Creates or updates the contracts listed in a CSV file, one batch at a time.
+
+        validate_contract_row(self, row):
+            Validates the values of a CSV line.
+
+        load_contracts_batch(self, contracts, rejects):
+            Creates or updates the contracts of a batch in one transaction.
+
+        balance_controller(self):
+            Returns the controller maintaining the totals of the contract managers.
     """
 
     def __init__(self, session, view: views.ContractView, user=None):
@@ -104,6 +132,8 @@ class ContractController:
         )
         try:
             self.session.add(contract)
+            self.session.flush()
+            self.balance_controller().record_contract(contract)
             self.session.commit()
             return self.view.display_new_contract_validation()
         except Exception as err:
@@ -135,6 +165,9 @@ class ContractController:
             contract_to_manage = self.get_contract(customer)
             if contract_to_manage is not None:
                 self.view.display_contract_informations(contract_to_manage)
+                previous = controllers.BalanceController.contract_values(
+                    contract_to_manage
+                )
 
                 if (
                     contract_to_manage.is_signed
@@ -157,6 +190,9 @@ class ContractController:
                         )
                     )
                 contract_to_manage.creation_date = datetime.now()
+                self.balance_controller().record_contract(
+                    contract_to_manage, previous
+                )
                 self.session.commit()
                 if contract_to_manage.is_signed:
                     logger.info(
@@ -208,7 +244,7 @@ class ContractController:
         The available filters include listing contracts that are not signed,
         contracts that are not fully paid, or listing all contracts without any filters.
         The method retrieves the contracts from the database based on the selected filters
-        and displays the contract information.
+        and displays them one page at a time, letting the user move to the next or previous page.
 
         Returns:
             None
@@ -222,12 +258,339 @@ class ContractController:
         elif filters_input == constantes.MANAGER_LIST_CONTRACT_NO_FILTER:
             filters = []
 
-        if filters:
-            contracts = (
-                self.session.query(models.Contract).filter(*filters).all()
-            )
-        else:
-            contracts = self.session.query(models.Contract).all()
+        paginator = utils.KeysetPaginator(
+            self.contracts_query(filters), models.Contract.id
+        )
+        contracts = paginator.first_page()
         if len(contracts) == 0:
             return self.view.display_no_contract_found()
-        self.view.display_contract_informations(contracts)
+        while contracts is not None:
+            self.view.display_contract_informations(contracts, wait=False)
+            contracts = paginator.navigate(
+                self.view.input_page_navigation(
+                    paginator.has_previous, paginator.has_next
+                )
+            )
+
+    def contracts_query(self, filters=None, session=None):
+        """
+        Builds the query used to list contracts.
+
+        The customer, its sales contact and the contract manager are loaded in the same
+        query since they are displayed for every contract.
+
+        Args:
+            filters: A list of SQLAlchemy filter expressions (default is None).
+            session: The session to build the query on (default is the controller session).
+
+        Returns:
+            Query: The contracts query.
+        """
+        session = session or self.session
+        query = session.query(models.Contract).options(
+            joinedload(models.Contract.customer).joinedload(
+                models.Customer.user
+            ),
+            joinedload(models.Contract.user),
+        )
+        if filters:
+            query = query.filter(*filters)
+        return query
+
+    def iter_contracts(self, filters=None, batch_size=None):
+        """
+        Iterates over the contracts through a server-side cursor.
+
+        Unlike list_contracts, the whole result set is walked, batch_size rows at a
+        time, so full scans keep a bounded memory footprint whatever the table size.
+
+        Args:
+            filters: A list of SQLAlchemy filter expressions (default is None).
+            batch_size: The number of rows fetched at a time (default is the configured batch size).
+
+        Yields:
+            models.Contract: The contracts matching the filters.
+        """
+        with utils.streaming_session(self.session) as session:
+            yield from utils.stream_query(
+                self.contracts_query(filters, session=session), batch_size
+            )
+
+    def import_contracts(self):
+        """
+        Loads the contracts listed in a CSV file chosen by the manager.
+
+        This method prompts for the path of the CSV file, loads it and displays the
+        import report.
+
+        Returns:
+            None
+        """
+        self.view.display_import_contracts()
+        path = self.view.input_csv_path()
+        try:
+            report = self.import_contracts_csv(path)
+        except (OSError, ValueError) as err:
+            self.view.display_error(f"Error : {err}")
+            logger.info("Import contracts : " + path + " failed " + str(err))
+            return
+        logger.info(
+            f"Import contracts : {report['created']} created, "
+            f"{report['updated']} updated, {report['rejected']} rejected"
+        )
+        return self.view.display_import_contracts_report(report)
+
+    def import_contracts_csv(self, path, reject_path=None, batch_size=None):
+        """
+        Creates or updates the contracts listed in a CSV file, one batch at a time.
+
+        Each line is identified by its reference: a contract already loaded with the
+        same reference is updated (customer, sales contact, amounts, signature) when
+        its values changed and left untouched otherwise, so the same file can be
+        loaded again safely, for instance to sync the payment status.
+
+        The file holds the columns of constantes.CONTRACT_IMPORT_COLUMNS and, optionally,
+        a sales_username column; without it, the sales contact of the customer is used.
+        Rejected lines are written to the reject file with the reason of the rejection.
+
+        Args:
+            path (str): The path of the CSV file.
+            reject_path (str): The path of the reject file (default is the path followed by constantes.REJECT_FILE_SUFFIX).
+            batch_size (int): The number of lines per transaction (default is the configured batch size).
+
+        Returns:
+            dict: The number of lines read, of contracts created, updated and unchanged,
+            of lines rejected, the reject file path, the elapsed seconds and the lines
+            loaded per second.
+
+        Raises:
+            ValueError: If a column is missing from the file.
+        """
+        started = time.perf_counter()
+        batch_size = batch_size or utils.get_import_batch_size()
+        reject_path = reject_path or path + constantes.REJECT_FILE_SUFFIX
+        report = {"read": 0, "created": 0, "updated": 0, "unchanged": 0}
+        references = set()
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            missing = set(constantes.CONTRACT_IMPORT_COLUMNS) - set(
+                reader.fieldnames or []
+            )
+            if missing:
+                raise ValueError(
+                    "missing columns : " + ", ".join(sorted(missing))
+                )
+            lines = ((reader.line_num, row) for row in reader)
+            with utils.RejectFile(reject_path, reader.fieldnames) as rejects:
+                for chunk in utils.batched(lines, batch_size):
+                    report["read"] += len(chunk)
+                    contracts = []
+                    for line, row in chunk:
+                        try:
+                            values = self.validate_contract_row(row)
+                            if values["reference"] in references:
+                                raise ValueError(
+                                    "reference duplicated in the file"
+                                )
+                        except ValueError as err:
+                            rejects.write(line, row, str(err))
+                            continue
+                        references.add(values["reference"])
+                        contracts.append((line, row, values))
+                    for key, count in self.load_contracts_batch(
+                        contracts, rejects
+                    ).items():
+                        report[key] += count
+                report["rejected"] = rejects.count
+
+        seconds = time.perf_counter() - started
+        loaded = report["created"] + report["updated"] + report["unchanged"]
+        report["reject_path"] = reject_path if report["rejected"] else None
+        report["seconds"] = seconds
+        report["contracts_per_second"] = loaded / seconds if seconds else 0.0
+        return report
+
+    def validate_contract_row(self, row):
+        """
+        Validates the values of a CSV line.
+
+        Args:
+            row (dict): The values of the line, by column.
+
+        Returns:
+            dict: The reference, customer email, sales username, amounts and signature.
+
+        Raises:
+            ValueError: If a value is not valid.
+        """
+        reference = (row.get("reference") or "").strip()
+        if not reference:
+            raise ValueError("reference is required")
+        if len(reference) > models.Contract.__table__.c.reference.type.length:
+            raise ValueError("reference too long")
+        try:
+            total_amount = models.to_money(row.get("total_amount") or "")
+            remaining_amount = models.to_money(row.get("remaining_amount") or "")
+        except ValueError:
+            raise ValueError("amount not valid")
+        if total_amount < 0 or not 0 <= remaining_amount <= total_amount:
+            raise ValueError("amount not valid")
+        is_signed = (row.get("is_signed") or "").strip().lower()
+        if is_signed not in (
+            constantes.IMPORT_TRUE_VALUES + constantes.IMPORT_FALSE_VALUES
+        ):
+            raise ValueError("is_signed not valid")
+        return {
+            "reference": reference,
+            "customer_email": (row.get("customer_email") or "").strip(),
+            "sales_username": (
+                row.get(constantes.CONTRACT_IMPORT_SALES_COLUMN) or ""
+            ).strip(),
+            "total_amount": total_amount,
+            "remaining_amount": remaining_amount,
+            "is_signed": is_signed in constantes.IMPORT_TRUE_VALUES,
+        }
+
+    def load_contracts_batch(self, contracts, rejects):
+        """
+        Creates or updates the contracts of a batch in one transaction.
+
+        The customers, the sales contacts and the contracts already loaded are each
+        looked up with a single IN query for the whole batch. The totals of the
+        contract managers are updated in the same transaction. When the database
+        rejects the batch, its lines are loaded again one at a time, so only the
+        failing lines are rejected, with the error of the database.
+
+        Args:
+            contracts (list): The (line number, line values, contract values) tuples.
+            rejects (RejectFile): The reject file of the import.
+
+        Returns:
+            dict: The number of contracts created, updated and unchanged.
+        """
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        if not contracts:
+            return counts
+        emails = {values["customer_email"] for _, _, values in contracts}
+        customers = {
+            email: (customer_id, sales_id)
+            for email, customer_id, sales_id in self.session.execute(
+                select(
+                    models.Customer.email,
+                    models.Customer.id,
+                    models.Customer.sales_id,
+                ).where(models.Customer.email.in_(emails))
+            )
+        }
+        usernames = {
+            values["sales_username"]
+            for _, _, values in contracts
+            if values["sales_username"]
+        }
+        sales_ids = {}
+        if usernames:
+            sales_ids = dict(
+                self.session.execute(
+                    select(models.User.username, models.User.id).where(
+                        models.User.username.in_(usernames)
+                    )
+                ).all()
+            )
+        existing = {
+            contract.reference: contract
+            for contract in self.session.execute(
+                select(
+                    models.Contract.id,
+                    models.Contract.reference,
+                    models.Contract.customer_id,
+                    models.Contract.manager_id,
+                    models.Contract.total_amount,
+                    models.Contract.remaining_amount,
+                    models.Contract.is_signed,
+                ).where(
+                    models.Contract.reference.in_(
+                        [values["reference"] for _, _, values in contracts]
+                    )
+                )
+            )
+        }
+
+        inserts = []
+        updates = []
+        loaded = []
+        balance_controller = self.balance_controller()
+        deltas = balance_controller.new_deltas()
+        now = datetime.now()
+        for line, row, values in contracts:
+            customer = customers.get(values["customer_email"])
+            if customer is None:
+                rejects.write(line, row, "unknown customer")
+                continue
+            if values["sales_username"]:
+                manager_id = sales_ids.get(values["sales_username"])
+            else:
+                manager_id = customer[1]
+            if manager_id is None:
+                rejects.write(line, row, "unknown sales contact")
+                continue
+            record = {
+                "reference": values["reference"],
+                "customer_id": customer[0],
+                "manager_id": manager_id,
+                "total_amount": values["total_amount"],
+                "remaining_amount": values["remaining_amount"],
+                "is_signed": values["is_signed"],
+            }
+            current = existing.get(values["reference"])
+            if current is None:
+                inserts.append(dict(record, creation_date=now))
+            elif any(
+                getattr(current, key) != value for key, value in record.items()
+            ):
+                updates.append(dict(record, id=current.id))
+                balance_controller.add_deltas(
+                    deltas, balance_controller.contract_values(current), -1
+                )
+            else:
+                counts["unchanged"] += 1
+                loaded.append((line, row, values))
+                continue
+            balance_controller.add_deltas(
+                deltas,
+                balance_controller.contract_values(SimpleNamespace(**record)),
+            )
+            loaded.append((line, row, values))
+
+        try:
+            if inserts:
+                self.session.execute(insert(models.Contract), inserts)
+            if updates:
+                self.session.execute(update(models.Contract), updates)
+            balance_controller.apply_deltas(deltas)
+            self.session.commit()
+        except SQLAlchemyError as err:
+            self.session.rollback()
+            logger.info("Import contracts : batch failed " + str(err))
+            counts = {"created": 0, "updated": 0, "unchanged": 0}
+            if len(loaded) == 1:
+                line, row, _ = loaded[0]
+                rejects.write(line, row, str(getattr(err, "orig", err)))
+                return counts
+            for contract in loaded:
+                for key, count in self.load_contracts_batch(
+                    [contract], rejects
+                ).items():
+                    counts[key] += count
+            return counts
+        counts["created"] = len(inserts)
+        counts["updated"] = len(updates)
+        return counts
+
+    def balance_controller(self):
+        """
+        Returns the controller maintaining the totals of the contract managers.
+
+        Returns:
+            BalanceController: The controller, working on the same session.
+        """
+        return controllers.BalanceController(self.session)
@@ -1,10 +1,17 @@
+import controllers
 import models
 import constantes
+import utils
 import validators
 import views
+import csv
+import time
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,7 +49,34 @@ class CustomerController:
             Retrieves the customer associated with the given user.
 
         list_customers(self):
-            Lists all customers in the database.
+            Lists all customers in the database, one page at a time.
+
+        customers_query(self, filters=None, session=None):
+            Builds the query used to list customers.
+
+        iter_customers(self, filters=None, batch_size=None):
+            Iterates over the customers through a server-side cursor.
+
+        import_customers(self):
+            Creates the customers listed in a CSV file chosen by the user.
+
+        import_customers_csv(self, path, reject_path=None, batch_size=None):
+            Creates the customers listed in a CSV file, one batch at a time.
+
+        insert_customers_batch(self, customers, rejects):
+            Inserts the customers of a batch in one transaction.
+
+        validate_customer_row(self, row):
+            Validates the values of a CSV line.
+
+        resolve_sales(self, customers, rejects):
+            Sets the sales contact of each customer of a batch.
+
+        remove_existing_customers(self, customers, rejects):
+            Removes the customers whose email is already in the database.
+
+        search_controller(self):
+            Returns the controller maintaining the search index of the customers.
 
     """
 
@@ -85,6 +119,8 @@ class CustomerController:
         )
         self.session.add(new_customer)
         try:
+            self.session.flush()
+            self.search_controller().index_customers([new_customer])
             self.session.commit()
             return self.view.display_new_customer_validation()
         except Exception as err:
@@ -195,6 +231,8 @@ class CustomerController:
                 customer.last_name = update_customer_input["last_name"]
                 customer.compagny_name = update_customer_input["compagny_name"]
                 customer.last_contact_date = datetime.now()
+                self.session.flush()
+                self.search_controller().index_customers([customer])
                 self.session.commit()
                 self.view.display_update_customer_validation()
         except ValueError as err:
@@ -234,16 +272,310 @@ class CustomerController:
         """
         Lists all customers in the database.
 
-        This method retrieves all customers from the database and displays their information
-        in a formatted table. If no customers are found, a message is displayed indicating
-        that no customers were found.
+        This method retrieves the customers one page at a time and displays their information
+        in a formatted table, letting the user move to the next or previous page.
+        If no customers are found, a message is displayed indicating that no customers were found.
 
         Returns:
             None
         """
-
-        customers = self.session.query(models.Customer).all()
+        paginator = utils.KeysetPaginator(
+            self.customers_query(), models.Customer.id
+        )
+        customers = paginator.first_page()
         if len(customers) == 0:
             return self.view.display_customer_not_found()
 
-        self.view.display_customer_information(customers)
+        while customers is not None:
+            self.view.display_customer_information(customers, wait=False)
+            customers = paginator.navigate(
+                self.view.input_page_navigation(
+                    paginator.has_previous, paginator.has_next
+                )
+            )
+
+    def customers_query(self, filters=None, session=None):
+        """
+        Builds the query used to list customers.
+
+        The sales contact is loaded in the same query since it is displayed for every customer.
+
+        Args:
+            filters: A list of SQLAlchemy filter expressions (default is None).
+            session: The session to build the query on (default is the controller session).
+
+        Returns:
+            Query: The customers query.
+        """
+        session = session or self.session
+        query = session.query(models.Customer).options(
+            joinedload(models.Customer.user)
+        )
+        if filters:
+            query = query.filter(*filters)
+        return query
+
+    def iter_customers(self, filters=None, batch_size=None):
+        """
+        Iterates over the customers through a server-side cursor.
+
+        Unlike list_customers, the whole result set is walked, batch_size rows at a
+        time, so full scans keep a bounded memory footprint whatever the table size.
+
+        Args:
+            filters: A list of SQLAlchemy filter expressions (default is None).
+            batch_size: The number of rows fetched at a time (default is the configured batch size).
+
+        Yields:
+            models.Customer: The customers matching the filters.
+        """
+        with utils.streaming_session(self.session) as session:
+            yield from utils.stream_query(
+                self.customers_query(filters, session=session), batch_size
+            )
+
+    def import_customers(self):
+        """
+        Creates the customers listed in a CSV file chosen by the user.
+
+        This method prompts for the path of the CSV file, imports it and displays the
+        import report.
+
+        Returns:
+            None
+        """
+        self.view.display_import_customers()
+        path = self.view.input_csv_path()
+        try:
+            report = self.import_customers_csv(path)
+        except (OSError, ValueError) as err:
+            self.view.display_error(f"Error : {err}")
+            logger.info("Import customers : " + path + " failed " + str(err))
+            return
+        logger.info(
+            f"Import customers : {report['created']} created, "
+            f"{report['rejected']} rejected"
+        )
+        return self.view.display_import_customers_report(report)
+
+    def import_customers_csv(self, path, reject_path=None, batch_size=None):
+        """
+        Creates the customers listed in a CSV file, one batch at a time.
+
+        The file is read as a stream, batch_size lines at a time. For each batch, the
+        lines are validated with the rules of validators, the emails already in the
+        database are found with a single IN query, the sales contacts are resolved
+        with another one and the valid customers are inserted in one transaction.
+        Rejected lines are written to the reject file with the reason of the rejection.
+
+        The file holds the columns of constantes.CUSTOMER_IMPORT_COLUMNS and, optionally,
+        a sales_username column; without it, the logged-in user is the sales contact.
+
+        Args:
+            path (str): The path of the CSV file.
+            reject_path (str): The path of the reject file (default is the path followed by constantes.REJECT_FILE_SUFFIX).
+            batch_size (int): The number of lines per batch (default is the configured batch size).
+
+        Returns:
+            dict: The number of lines read, of customers created and of lines rejected,
+            the reject file path, the elapsed seconds and the customers per second.
+
+        Raises:
+            ValueError: If a column is missing from the file.
+        """
+        started = time.perf_counter()
+        batch_size = batch_size or utils.get_import_batch_size()
+        reject_path = reject_path or path + constantes.REJECT_FILE_SUFFIX
+        read = 0
+        created = 0
+        emails = set()
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            missing = set(constantes.CUSTOMER_IMPORT_COLUMNS) - set(
+                reader.fieldnames or []
+            )
+            if missing:
+                raise ValueError(
+                    "missing columns : " + ", ".join(sorted(missing))
+                )
+            lines = ((reader.line_num, row) for row in reader)
+            with utils.RejectFile(reject_path, reader.fieldnames) as rejects:
+                for chunk in utils.batched(lines, batch_size):
+                    read += len(chunk)
+                    customers = []
+                    for line, row in chunk:
+                        try:
+                            values = self.validate_customer_row(row)
+                            if values["email"] in emails:
+                                raise ValueError(
+                                    "email duplicated in the file"
+                                )
+                        except ValueError as err:
+                            rejects.write(line, row, str(err))
+                            continue
+                        emails.add(values["email"])
+                        customers.append((line, row, values))
+                    customers = self.remove_existing_customers(
+                        customers, rejects
+                    )
+                    customers = self.resolve_sales(customers, rejects)
+                    created += self.insert_customers_batch(customers, rejects)
+                rejected = rejects.count
+
+        seconds = time.perf_counter() - started
+        return {
+            "read": read,
+            "created": created,
+            "rejected": rejected,
+            "reject_path": reject_path if rejected else None,
+            "seconds": seconds,
+            "customers_per_second": created / seconds if seconds else 0.0,
+        }
+
+    def insert_customers_batch(self, customers, rejects):
+        """
+        Inserts the customers of a batch in one transaction.
+
+        When the database rejects the batch, its customers are inserted again one
+        at a time, so only the failing lines are rejected, with the error of the
+        database.
+
+        Args:
+            customers (list): The (line number, line values, customer values) tuples.
+            rejects (RejectFile): The reject file of the import.
+
+        Returns:
+            int: The number of customers created.
+        """
+        if not customers:
+            return 0
+        try:
+            self.session.execute(
+                insert(models.Customer),
+                [values for _, _, values in customers],
+            )
+            self.search_controller().index_emails(
+                [values["email"] for _, _, values in customers]
+            )
+            self.session.commit()
+        except SQLAlchemyError as err:
+            self.session.rollback()
+            logger.info("Import customers : batch failed " + str(err))
+            if len(customers) == 1:
+                line, row, _ = customers[0]
+                rejects.write(line, row, str(getattr(err, "orig", err)))
+                return 0
+            return sum(
+                self.insert_customers_batch([customer], rejects)
+                for customer in customers
+            )
+        return len(customers)
+
+    def validate_customer_row(self, row):
+        """
+        Validates the values of a CSV line.
+
+        Args:
+            row (dict): The values of the line, by column.
+
+        Returns:
+            dict: The customer column values.
+
+        Raises:
+            ValueError: If a value is not valid.
+        """
+        values = {
+            column: (row.get(column) or "").strip()
+            for column in constantes.CUSTOMER_IMPORT_COLUMNS
+        }
+        for column, value in values.items():
+            if not value:
+                raise ValueError(f"{column} is required")
+            if len(value) > models.Customer.__table__.c[column].type.length:
+                raise ValueError(f"{column} too long")
+        validators.validate_email(values["email"])
+        validators.validate_phone(values["phone_number"])
+        values["sales_username"] = (
+            row.get(constantes.CUSTOMER_IMPORT_SALES_COLUMN) or ""
+        ).strip()
+        return values
+
+    def resolve_sales(self, customers, rejects):
+        """
+        Sets the sales contact of each customer of a batch.
+
+        The sales contacts given by username are loaded with a single query; the
+        customers without one are given to the logged-in user.
+
+        Args:
+            customers (list): The (line number, line values, customer values) tuples.
+            rejects (RejectFile): The reject file of the import.
+
+        Returns:
+            list: The customers whose sales contact was found.
+        """
+        usernames = {
+            values["sales_username"]
+            for _, _, values in customers
+            if values["sales_username"]
+        }
+        sales_ids = {}
+        if usernames:
+            sales_ids = dict(
+                self.session.query(models.User.username, models.User.id)
+                .filter(models.User.username.in_(usernames))
+                .all()
+            )
+        resolved = []
+        for line, row, values in customers:
+            username = values.pop("sales_username")
+            if username:
+                sales_id = sales_ids.get(username)
+            else:
+                sales_id = self.user.id if self.user is not None else None
+            if sales_id is None:
+                rejects.write(line, row, "unknown sales contact")
+                continue
+            values["sales_id"] = sales_id
+            resolved.append((line, row, values))
+        return resolved
+
+    def remove_existing_customers(self, customers, rejects):
+        """
+        Removes the customers whose email is already in the database.
+
+        The emails of the whole batch are checked with a single IN query.
+
+        Args:
+            customers (list): The (line number, line values, customer values) tuples.
+            rejects (RejectFile): The reject file of the import.
+
+        Returns:
+            list: The customers that can be created.
+        """
+        if not customers:
+            return customers
+        emails = [values["email"] for _, _, values in customers]
+        existing = set(
+            self.session.scalars(
+                select(models.Customer.email).where(
+                    models.Customer.email.in_(emails)
+                )
+            )
+        )
+        remaining = []
+        for line, row, values in customers:
+            if values["email"] in existing:
+                rejects.write(line, row, "customer already exists")
+            else:
+                remaining.append((line, row, values))
+        return remaining
+
+    def search_controller(self):
+        """
+        Returns the controller maintaining the search index of the customers.
+
+        Returns:
+            SearchController: The controller, working on the same session.
+        """
+        return controllers.SearchController(self.session)
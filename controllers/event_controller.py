@@ -1,5 +1,8 @@
-from sqlalchemy import and_, or_
+from collections import defaultdict
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import aliased
 import models
+import utils
 import views
 from datetime import datetime
 import validators
@@ -32,14 +35,47 @@ class EventController:
         get_event(self, assigned_support):
             Retrieves the event associated with the given support user.
 
+        event_names(self, assigned_support=None):
+            Returns the index of the event names the user can pick from.
+
+        complete_event_name(self, prefix, assigned_support=None):
+            Returns the event names starting with a prefix.
+
+        reset_event_names(self):
+            Drops the cached event names.
+
         set_new_event(self):
             Sets the start and end dates for a new event.
 
         list_events(self):
-            Lists all events in the database.
+            Lists all events in the database, one page at a time.
+
+        own_events_filter(self):
+            Builds the filter keeping the events of the logged-in user.
+
+        events_query(self, filters=None, session=None):
+            Builds the single joined query used to display events.
+
+        iter_events(self, filters=None, batch_size=None):
+            Iterates over the events through a server-side cursor.
+
+        build_events_table(self, rows):
+            Builds the table displaying the given events.
 
         sales_manager_events(self, support_user=None, assigned_support=None):
             Displays the events managed by the sales manager.
+
+        find_support_conflict(self, support_id, start_date, end_date, exclude_id=None):
+            Returns an event of the support overlapping a period.
+
+        check_support_bookings(self, assignments):
+            Checks a batch of support assignments against the bookings and each other.
+
+        find_double_bookings(self):
+            Returns every pair of overlapping events booked for the same support.
+
+        list_double_bookings(self):
+            Displays every pair of overlapping events booked for the same support.
     """
 
     def __init__(self, session, view: views.EventView, user=None):
@@ -54,6 +90,7 @@ class EventController:
         self.session = session
         self.view = view
         self.user = user
+        self._event_names = {}
 
     def create_event(
         self, customer: models.Customer, contract: models.Contract
@@ -90,6 +127,7 @@ class EventController:
         try:
             self.session.add(new_event)
             self.session.commit()
+            self._index_event_name(new_event.event_name)
             return self.view.display_new_event_validation()
         except Exception as err:
             self.session.rollback()
@@ -118,9 +156,28 @@ class EventController:
             if event_to_update is None:
                 return
             if support_user is not None:
+                conflict = self.find_support_conflict(
+                    support_user.id,
+                    event_to_update.start_date,
+                    event_to_update.end_date,
+                    exclude_id=event_to_update.id,
+                )
+                if conflict is not None:
+                    return self.view.display_support_already_booked(conflict)
                 event_to_update.user = support_user
             else:
                 start_date, end_date = self.set_new_event()
+                if event_to_update.support_id is not None:
+                    conflict = self.find_support_conflict(
+                        event_to_update.support_id,
+                        start_date,
+                        end_date,
+                        exclude_id=event_to_update.id,
+                    )
+                    if conflict is not None:
+                        return self.view.display_support_already_booked(
+                            conflict
+                        )
                 event_to_update.location = self.view.input_event_location()
                 event_to_update.nb_attendees = (
                     self.view.input_event_nb_attendees()
@@ -130,46 +187,14 @@ class EventController:
                 event_to_update.end_date = end_date
 
             self.session.commit()
-            table = Table(title="Liste des events")
-            table.add_column("Event Name")
-            table.add_column("Event ID")
-            table.add_column("Contract ID")
-            table.add_column("Customer Name")
-            table.add_column("Sales Contact")
-            table.add_column("Event Start Date")
-            table.add_column("Event End Date")
-            table.add_column("Event Location")
-            table.add_column("Number of attendees")
-            table.add_column("Event Notes")
-            table.add_column("Support")
-            support_email = (
-                event_to_update.user.email if event_to_update.user else ""
-            )
-            manager_id = (
-                self.session.query(models.Contract.manager_id)
-                .filter(models.Contract.id == event_to_update.contract_id)
-                .scalar()
-            )
-            sales_contact_name = (
-                self.session.query(models.User.full_name)
-                .filter(models.User.id == manager_id)
-                .scalar()
-                if manager_id
-                else ""
-            )
-            table.add_row(
-                str(event_to_update.event_name),
-                str(event_to_update.id),
-                str(event_to_update.contract_id),
-                str(event_to_update.customer_name),
-                str(sales_contact_name),
-                str(event_to_update.start_date),
-                str(event_to_update.end_date),
-                str(event_to_update.location),
-                str(event_to_update.nb_attendees),
-                str(event_to_update.notes),
-                str(support_email),
-            )
+            if support_user is not None:
+                self._index_event_name(
+                    event_to_update.event_name, support_user.id
+                )
+            rows = self.events_query(
+                [models.Event.id == event_to_update.id]
+            ).all()
+            table = self.build_events_table(rows)
             self.view.display_event(event_to_update, table)
             return self.view.display_update_event_validation()
         except ValueError as err:
@@ -236,7 +261,9 @@ class EventController:
         Returns:
             event: The event associated with the given support user.
         """
-        event_name = self.view.input_event_name()
+        event_name = self.view.input_event_name(
+            lambda prefix: self.complete_event_name(prefix, assigned_support)
+        )
         filters = {"event_name": event_name}
         if assigned_support is not None:
             filters["user"] = assigned_support
@@ -245,12 +272,66 @@ class EventController:
             self.view.display_error(
                 constantes.EVENT_CONTROLLER_EVENT_NOT_FOUND
             )
+            suggestions = self.complete_event_name(
+                event_name, assigned_support
+            )
+            if suggestions:
+                self.view.display_event_name_suggestions(suggestions)
             return
         return event
 
+    def event_names(self, assigned_support=None):
+        """
+        Returns the index of the event names the user can pick from.
+
+        Every user can pick any event, except a support updating their events, who
+        picks among the events assigned to them. Each index is read with a single
+        query the first time it is used, then kept for the session and updated when
+        this controller creates, assigns or deletes an event. Events changed by
+        other sessions appear after the next login.
+
+        Args:
+            assigned_support: The support user whose events are picked (default is None for every event).
+
+        Returns:
+            utils.PrefixIndex: The event names.
+        """
+        scope = None if assigned_support is None else assigned_support.id
+        if scope not in self._event_names:
+            query = select(models.Event.event_name).where(
+                models.Event.event_name.is_not(None)
+            )
+            if scope is not None:
+                query = query.where(models.Event.support_id == scope)
+            self._event_names[scope] = utils.PrefixIndex(
+                self.session.scalars(query)
+            )
+        return self._event_names[scope]
+
+    def complete_event_name(self, prefix, assigned_support=None):
+        """
+        Returns the event names starting with a prefix.
+
+        Args:
+            prefix (str): The beginning of the event name, in any case.
+            assigned_support: The support user whose events are picked (default is None for every event).
+
+        Returns:
+            list[str]: At most constantes.EVENT_NAME_COMPLETIONS names, in alphabetical order.
+        """
+        return self.event_names(assigned_support).complete(
+            prefix, constantes.EVENT_NAME_COMPLETIONS
+        )
+
+    def reset_event_names(self):
+        """
+        Drops the cached event names, read again on next use.
+        """
+        self._event_names.clear()
+
     def list_events(self):
         """
-        Lists all events in the database.
+        Lists all events in the database, one page at a time.
 
         Returns:
             None
@@ -261,24 +342,109 @@ class EventController:
 
             filters = []
         elif event_filters_input == 2:
-            filters.append(
-                or_(
-                    models.Event.contract.has(manager_id=self.user.id),
-                    models.Event.support_id == self.user.id,
-                )
-            )
+            filters.append(self.own_events_filter())
         elif event_filters_input == 3:
             filters.append(
                 models.Event.support_id == None,
             )
 
-        if filters:
-            events = self.session.query(models.Event).filter(*filters).all()
-        else:
-            events = self.session.query(models.Event).all()
+        paginator = utils.KeysetPaginator(
+            self.events_query(filters),
+            models.Event.id,
+            key=lambda row: row[0].id,
+        )
+        events = paginator.first_page()
 
         if len(events) == 0:
             return self.view.display_no_events_found()
+        while events is not None:
+            table = self.build_events_table(events)
+            self.view.display_event(events, table)
+            events = paginator.navigate(
+                self.view.input_page_navigation(
+                    paginator.has_previous, paginator.has_next
+                )
+            )
+
+    def own_events_filter(self):
+        """
+        Builds the filter keeping the events of the logged-in user.
+
+        An event belongs to the user when they are the sales contact of its contract or
+        the support assigned to it.
+
+        Returns:
+            The SQLAlchemy filter expression.
+        """
+        return or_(
+            models.Event.contract_id.in_(
+                select(models.Contract.id).where(
+                    models.Contract.manager_id == self.user.id
+                )
+            ),
+            models.Event.support_id == self.user.id,
+        )
+
+    def events_query(self, filters=None, session=None):
+        """
+        Builds the query used to display events.
+
+        The query joins the contract, the sales contact and the support user so that
+        every row of the events table is loaded in a single round trip.
+
+        Args:
+            filters: A list of SQLAlchemy filter expressions (default is None).
+            session: The session to build the query on (default is the controller session).
+
+        Returns:
+            Query: A query returning (event, sales contact name, support email) rows.
+        """
+        session = session or self.session
+        sales_user = aliased(models.User)
+        support_user = aliased(models.User)
+        query = (
+            session.query(
+                models.Event, sales_user.full_name, support_user.email
+            )
+            .outerjoin(models.Event.contract)
+            .outerjoin(sales_user, models.Contract.manager_id == sales_user.id)
+            .outerjoin(
+                support_user, models.Event.support_id == support_user.id
+            )
+        )
+        if filters:
+            query = query.filter(*filters)
+        return query
+
+    def iter_events(self, filters=None, batch_size=None):
+        """
+        Iterates over the events through a server-side cursor.
+
+        Unlike list_events, the whole result set is walked, batch_size rows at a
+        time, so full scans keep a bounded memory footprint whatever the table size.
+
+        Args:
+            filters: A list of SQLAlchemy filter expressions (default is None).
+            batch_size: The number of rows fetched at a time (default is the configured batch size).
+
+        Yields:
+            tuple: (event, sales contact name, support email) rows.
+        """
+        with utils.streaming_session(self.session) as session:
+            yield from utils.stream_query(
+                self.events_query(filters, session=session), batch_size
+            )
+
+    def build_events_table(self, rows):
+        """
+        Builds the table displaying the given events.
+
+        Args:
+            rows: The (event, sales contact name, support email) rows returned by events_query.
+
+        Returns:
+            Table: The table containing one line per event.
+        """
         table = Table(title="Liste des events")
         table.add_column("Event Name")
         table.add_column("Event ID")
@@ -291,36 +457,21 @@ class EventController:
         table.add_column("Number of attendees")
         table.add_column("Event Notes")
         table.add_column("Support")
-        for event_item in events:
-
-            support_email = event_item.user.email if event_item.user else ""
-            manager_id = (
-                self.session.query(models.Contract.manager_id)
-                .filter(models.Contract.id == event_item.contract_id)
-                .scalar()
-            )
-            sales_contact_name = (
-                self.session.query(models.User.full_name)
-                .filter(models.User.id == manager_id)
-                .scalar()
-                if manager_id
-                else ""
-            )
+        for event_item, sales_contact_name, support_email in rows:
             table.add_row(
-                event_item.event_name,
+                str(event_item.event_name),
                 str(event_item.id),
                 str(event_item.contract_id),
-                event_item.customer_name,
-                sales_contact_name,
+                str(event_item.customer_name),
+                sales_contact_name or "",
                 str(event_item.start_date),
                 str(event_item.end_date),
-                event_item.location,
+                str(event_item.location),
                 str(event_item.nb_attendees),
-                event_item.notes,
-                support_email,
+                str(event_item.notes),
+                support_email or "",
             )
-        self.view.display_event(events, table)
-        views.BaseView.wait_for_key_press(self)
+        return table
 
     def sales_manager_events(self, support_user=None, assigned_support=None):
         """
@@ -340,6 +491,156 @@ class EventController:
             assigned_support=self.user,
         )
 
+    def find_support_conflict(
+        self, support_id, start_date, end_date, exclude_id=None
+    ):
+        """
+        Returns an event of the support overlapping a period.
+
+        Two events overlap when each starts before the other ends; events only
+        touching the period do not. The search is a range scan of the
+        (support_id, start_date, end_date) index.
+
+        Args:
+            support_id (int): The id of the support user.
+            start_date (datetime): The start of the period.
+            end_date (datetime): The end of the period.
+            exclude_id (int): The id of an event to ignore, such as the event being updated (default is None).
+
+        Returns:
+            models.Event: The overlapping event starting first, or None.
+        """
+        query = self.session.query(models.Event).filter(
+            models.Event.support_id == support_id,
+            models.Event.start_date < end_date,
+            models.Event.end_date > start_date,
+        )
+        if exclude_id is not None:
+            query = query.filter(models.Event.id != exclude_id)
+        return query.order_by(models.Event.start_date).first()
+
+    def check_support_bookings(self, assignments):
+        """
+        Checks a batch of support assignments against the bookings and each other.
+
+        The bookings of the supports over the period of the batch are read in one
+        query and kept in an interval tree per support; each assignment is then
+        checked in O(log n) with IntervalTree.any_overlap and, when accepted,
+        added to the tree of its support so that the next assignments are checked
+        against it too.
+
+        Args:
+            assignments (list): The (event, support id) pairs to check, in order of priority.
+
+        Returns:
+            tuple: The accepted (event, support id) pairs and the rejected
+            (event, support id, id of the overlapping event) tuples.
+        """
+        accepted = []
+        rejected = []
+        if not assignments:
+            return accepted, rejected
+        trees = defaultdict(utils.IntervalTree)
+        bookings = self.session.execute(
+            select(
+                models.Event.id,
+                models.Event.support_id,
+                models.Event.start_date,
+                models.Event.end_date,
+            ).where(
+                models.Event.support_id.in_(
+                    {support_id for _, support_id in assignments}
+                ),
+                models.Event.start_date
+                < max(event.end_date for event, _ in assignments),
+                models.Event.end_date
+                > min(event.start_date for event, _ in assignments),
+            )
+        )
+        for event_id, support_id, start_date, end_date in bookings:
+            trees[support_id].add(start_date, end_date, event_id)
+        for event, support_id in assignments:
+            tree = trees[support_id]
+            conflict = None
+            # The bookings are only listed when one overlaps, to skip the
+            # booking of the event itself
+            if tree.any_overlap(event.start_date, event.end_date):
+                conflict = next(
+                    (
+                        booking
+                        for booking in tree.overlaps(
+                            event.start_date, event.end_date
+                        )
+                        if booking[2] != event.id
+                    ),
+                    None,
+                )
+            if conflict is not None:
+                rejected.append((event, support_id, conflict[2]))
+                continue
+            trees[support_id].add(event.start_date, event.end_date, event.id)
+            accepted.append((event, support_id))
+        return accepted, rejected
+
+    def find_double_bookings(self):
+        """
+        Returns every pair of overlapping events booked for the same support.
+
+        The booked events are read through a server-side cursor in the order of the
+        (support_id, start_date, end_date) index; each event is checked against an
+        interval tree of the previous events of its support, then added to it.
+
+        Returns:
+            list: The (support email, event name, overlapping event name, overlap
+            start, overlap end) rows.
+        """
+        rows = []
+        current_support = None
+        tree = None
+        with utils.streaming_session(self.session) as session:
+            query = (
+                session.query(
+                    models.Event.support_id,
+                    models.Event.event_name,
+                    models.Event.start_date,
+                    models.Event.end_date,
+                    models.User.email,
+                )
+                .join(models.User, models.Event.support_id == models.User.id)
+                .order_by(models.Event.support_id, models.Event.start_date)
+            )
+            for support_id, name, start_date, end_date, email in (
+                utils.stream_query(query)
+            ):
+                if support_id != current_support:
+                    current_support = support_id
+                    tree = utils.IntervalTree()
+                for other_start, other_end, other_name in tree.overlaps(
+                    start_date, end_date
+                ):
+                    rows.append(
+                        (
+                            email,
+                            other_name,
+                            name,
+                            max(start_date, other_start),
+                            min(end_date, other_end),
+                        )
+                    )
+                tree.add(start_date, end_date, name)
+        return rows
+
+    def list_double_bookings(self):
+        """
+        Displays every pair of overlapping events booked for the same support.
+
+        Returns:
+            None
+        """
+        rows = self.find_double_bookings()
+        logger.info("Double bookings : " + str(len(rows)))
+        return self.view.display_double_bookings(rows)
+
     def delete_event(self):
         """
         Deletes an existing customer from the system.
@@ -355,6 +656,7 @@ class EventController:
             event = self.get_event()
             self.session.delete(event)
             self.session.commit()
+            self._unindex_event_name(event.event_name)
             self.view.display_delete_event_validation()
             if event:
                 logger.info("Delete event : " + event.event_name + " success")
@@ -364,3 +666,15 @@ class EventController:
             if event:
                 logger.info("Delete event : " + event.event_name + " failed")
             return
+
+    def _index_event_name(self, name, support_id=None):
+        # The event now belongs to the support scope only
+        for scope, names in self._event_names.items():
+            if scope is None or scope == support_id:
+                names.add(name)
+            else:
+                names.discard(name)
+
+    def _unindex_event_name(self, name):
+        for names in self._event_names.values():
+            names.discard(name)
@@ -1,5 +1,6 @@
 import os
 import constantes
+import database
 import logging
 import models
 import controllers
@@ -11,6 +12,17 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# The menu loop methods, profiled through the actions they dispatch to
+MENU_LOOP_METHODS = (
+    "run",
+    "get_user_main_menu",
+    "process_manager_action",
+    "process_sales_action",
+    "process_support_action",
+    "process_admin_action",
+    "logout",
+)
+
 
 class MainController:
     """
@@ -24,10 +36,15 @@ class MainController:
         customer_controller: The controller responsible for customer-related operations.
         contract_controller: The controller responsible for contract-related operations.
         event_controller: The controller responsible for event-related operations.
+        report_controller: The controller responsible for the revenue reports.
+        assignment_controller: The controller assigning the supports to the events.
+        search_controller: The controller searching the customers.
         user: The currently logged-in user.
+        role_name: The role name of the logged-in user.
+        user_name: The username of the logged-in user.
 
     Methods:
-        __init__(self, session, console):
+        __init__(self, session, console, profiler=None):
             Initializes the MainController with the given parameters.
 
         run(self):
@@ -69,13 +86,17 @@ class MainController:
 
     """
 
-    def __init__(self, session, console):
+    def __init__(self, session, console, profiler=None):
         """
         Initializes the MainController with the given parameters.
 
+        With a profiler, every controller method run from the menu is profiled and
+        its summary displayed once it returns.
+
         Args:
             session: The database session used for database operations.
             console: The console object used for displaying views.
+            profiler (utils.QueryProfiler): The profiler of the actions (default is None).
 
         Attributes:
             session: The database session used for database operations.
@@ -84,6 +105,9 @@ class MainController:
             customer_controller: The controller responsible for customer-related operations.
             contract_controller: The controller responsible for contract-related operations.
             event_controller: The controller responsible for event-related operations.
+            report_controller: The controller responsible for the revenue reports.
+            assignment_controller: The controller assigning the supports to the events.
+            search_controller: The controller searching the customers.
             user: The currently logged-in user.
         """
         self.session = session
@@ -100,8 +124,33 @@ class MainController:
         self.event_controller = controllers.EventController(
             session=session, view=views.EventView(console)
         )
+        self.report_controller = controllers.ReportController(
+            session=session, view=views.ReportView(console)
+        )
+        self.assignment_controller = controllers.AssignmentController(
+            session=session, view=views.EventView(console)
+        )
+        self.search_controller = controllers.SearchController(
+            session=session, view=views.CustomerView(console)
+        )
 
         self.user = None
+        self.role_name = None
+        self.user_name = None
+
+        if profiler is not None:
+            profiler.on_action = self.view.display_action_profile
+            for controller in (
+                self.user_controller,
+                self.customer_controller,
+                self.contract_controller,
+                self.event_controller,
+                self.report_controller,
+                self.assignment_controller,
+                self.search_controller,
+            ):
+                profiler.instrument(controller)
+            profiler.instrument(self, exclude=MENU_LOOP_METHODS)
 
     def run(self):
         """
@@ -163,10 +212,8 @@ class MainController:
             .first()
         )
         if not admin_user:
-            manager_role = (
-                self.session.query(models.Role)
-                .filter_by(name="MANAGER")
-                .first()
+            manager_role = database.reference_cache.get(
+                models.Role, name=constantes.ROLE_MANAGER
             )
             if not manager_role:
                 raise ValueError(
@@ -194,15 +241,28 @@ class MainController:
         Sets the user for the main controller and its associated controllers.
 
         This method assigns the given user to the main controller as well as to the
-        customer_controller, contract_controller, and event_controller.
+        customer_controller, contract_controller, and event_controller. The role name
+        and username used by the menu are read once here, from the principal of the
+        login token or else from the reference cache.
 
         Args:
             user (models.User): The user to be set for the controllers.
         """
         self.user = user
+        principal = self.user_controller.principal
+        if principal and principal["user_id"] == user.id:
+            self.role_name = principal["role"]
+        else:
+            self.role_name = database.reference_cache.get(
+                models.Role, id=user.role_id
+            ).name
+        self.user_name = user.username
         self.customer_controller.user = user
         self.contract_controller.user = user
         self.event_controller.user = user
+        self.event_controller.reset_event_names()
+        self.report_controller.user = user
+        self.search_controller.user = user
 
     def get_user_main_menu(self):
         """
@@ -221,10 +281,9 @@ class MainController:
 
         running = True
         while running:
-            role_name = self.user.role.name
-            user_name = self.user.username
+            role_name = self.role_name
             menu_selection = self.user_controller.view.display_user_menu(
-                role_name, user_name
+                role_name, self.user_name
             )
 
             if menu_selection == "0":
@@ -251,8 +310,9 @@ class MainController:
 
         This method processes the menu selection made by a manager and performs the
         corresponding action. It handles various options such as listing customers,
-        contracts, events, assigning support to an event, managing users, and managing
-        contracts.
+        contracts, events, assigning support to an event, managing users, managing
+        contracts, displaying the database pool statistics, importing contracts and
+        displaying the revenue reports.
 
         Args:
             menu_selection (str): The menu option selected by the manager.
@@ -281,6 +341,23 @@ class MainController:
             case constantes.LIST_MANAGER_MANAGE_CONTRACT:
                 self.view.clear_screen()
                 self.manage_contract()
+            case constantes.LIST_MANAGER_POOL_STATS:
+                self.view.clear_screen()
+                self.view.display_pool_metrics(
+                    database.pool_metrics.snapshot()
+                )
+            case constantes.LIST_MANAGER_IMPORT_CONTRACTS:
+                self.view.clear_screen()
+                self.contract_controller.import_contracts()
+            case constantes.LIST_MANAGER_REPORTS:
+                self.view.clear_screen()
+                self.report_controller.show_reports()
+            case constantes.LIST_MANAGER_DOUBLE_BOOKINGS:
+                self.view.clear_screen()
+                self.event_controller.list_double_bookings()
+            case constantes.LIST_MANAGER_AUTO_ASSIGN:
+                self.view.clear_screen()
+                self.assignment_controller.auto_assign()
             case _:
                 self.view.display_error(constantes.MAIN_CONTROLLER_ERR_INPUT)
 
@@ -290,7 +367,7 @@ class MainController:
 
         This method processes the menu selection made by a sales representative and performs the
         corresponding action. It handles various options such as listing customers, contracts, events,
-        creating and updating customers, updating contracts, and creating events.
+        creating, updating and importing customers, updating contracts, and creating events.
 
         Args:
             menu_selection (str): The menu option selected by the sales representative.
@@ -324,6 +401,12 @@ class MainController:
             case constantes.LIST_SALES_DELETE_EVENT:
                 self.view.clear_screen()
                 self.event_controller.delete_event()
+            case constantes.LIST_SALES_IMPORT_CUSTOMERS:
+                self.view.clear_screen()
+                self.customer_controller.import_customers()
+            case constantes.LIST_SALES_SEARCH_CUSTOMERS:
+                self.view.clear_screen()
+                self.search_controller.search_customers()
             case _:
                 self.view.display_error(constantes.MAIN_CONTROLLER_ERR_INPUT)
 
@@ -452,10 +535,8 @@ class MainController:
             support_user = self.user_controller.get_user()
             if support_user is None:
                 return
-            support_user_role = (
-                self.session.query(models.Role)
-                .filter_by(id=support_user.role_id)
-                .first()
+            support_user_role = database.reference_cache.get(
+                models.Role, id=support_user.role_id
             )
             if support_user_role.name != constantes.ROLE_SUPPORT:
                 return self.view.display_not_support_user()
@@ -493,7 +574,10 @@ class MainController:
         # clear session
         self.session.close()
         self.user = None
+        self.role_name = None
+        self.user_name = None
         self.user_controller.user = None
+        self.user_controller.principal = None
         self.customer_controller.user = None
         self.contract_controller.user = None
         self.event_controller.user = None
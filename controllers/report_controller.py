@@ -0,0 +1,252 @@
+import models
+import views
+import numpy
+from sqlalchemy import case, extract, func, select
+import constantes
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPORT_METRIC_COLUMNS = (
+    "contracts",
+    "signed_contracts",
+    "revenue_signed",
+    "outstanding",
+)
+REPORT_KEY_COLUMNS = {
+    constantes.REPORT_SALES: ("sales_contact", "full_name"),
+    constantes.REPORT_CUSTOMERS: ("customer_email", "compagny_name"),
+    constantes.REPORT_MONTHS: ("month",),
+}
+REPORT_TITLES = {
+    constantes.REPORT_SALES: "Revenue per sales contact",
+    constantes.REPORT_CUSTOMERS: "Revenue per customer",
+    constantes.REPORT_MONTHS: "Revenue per month",
+}
+
+
+class ReportController:
+    """
+    The ReportController class builds the revenue reports of the contracts.
+
+    The contracts are aggregated by the database with GROUP BY queries, so only one
+    row per group is read; the totals and means of the groups are summed exactly,
+    and only their percentiles and distribution are computed with NumPy floats.
+
+    Attributes:
+        session: The database session used for database operations.
+        view: The view displaying the reports.
+        user: The currently logged-in user.
+
+    Methods:
+        __init__(self, session, view, user=None):
+            Initializes the ReportController with the given parameters.
+
+        show_reports(self):
+            Displays the report chosen by the manager.
+
+        report_query(self, name):
+            Builds the GROUP BY query of a report.
+
+        build_report(self, name):
+            Runs a report and returns its columns and rows.
+
+        summarize(self, values):
+            Computes the statistics of the values of a report column.
+
+        distribution(self, values, bins=None):
+            Splits the values of a report column into ranges of equal width.
+    """
+
+    def __init__(self, session, view: views.ReportView, user=None):
+        """
+        Initializes the ReportController with the given parameters.
+
+        Args:
+            session: The database session used for database operations.
+            view: The view displaying the reports.
+            user: The currently logged-in user (default is None).
+        """
+        self.session = session
+        self.view = view
+        self.user = user
+
+    def show_reports(self):
+        """
+        Displays the report chosen by the manager.
+
+        The rows of the report are displayed with the statistics and the distribution
+        of the signed revenue and of the outstanding amount.
+
+        Returns:
+            None
+        """
+        name = self.view.input_report_choice()
+        if name is None:
+            return
+        columns, rows = self.build_report(name)
+        if not rows:
+            return self.view.display_no_contracts_to_report()
+        summary = {
+            metric: self.summarize(
+                [row[columns.index(metric)] for row in rows]
+            )
+            for metric in ("revenue_signed", "outstanding")
+        }
+        distribution = self.distribution(
+            [row[columns.index("revenue_signed")] for row in rows]
+        )
+        logger.info("Report " + name + " : " + str(len(rows)) + " rows")
+        return self.view.display_report(
+            REPORT_TITLES[name], columns, rows, summary, distribution
+        )
+
+    def report_query(self, name):
+        """
+        Builds the GROUP BY query of a report.
+
+        Every report counts the contracts and the signed contracts and sums the
+        amount of the signed contracts (revenue_signed) and what remains to be paid on
+        them (outstanding), for each sales contact, customer or creation month.
+
+        Args:
+            name (str): One of constantes.REPORT_NAMES.
+
+        Returns:
+            Select: The query returning the key columns then the metrics of each group.
+
+        Raises:
+            ValueError: If the report does not exist.
+        """
+        signed = models.Contract.is_signed.is_(True)
+        metrics = (
+            func.count(models.Contract.id),
+            func.coalesce(func.sum(case((signed, 1), else_=0)), 0),
+            func.coalesce(
+                func.sum(
+                    case((signed, models.Contract.total_amount), else_=0)
+                ),
+                0,
+            ),
+            func.coalesce(
+                func.sum(
+                    case((signed, models.Contract.remaining_amount), else_=0)
+                ),
+                0,
+            ),
+        )
+        revenue = metrics[2]
+        if name == constantes.REPORT_SALES:
+            return (
+                select(models.User.username, models.User.full_name, *metrics)
+                .join(
+                    models.Contract,
+                    models.Contract.manager_id == models.User.id,
+                )
+                .group_by(
+                    models.User.id, models.User.username, models.User.full_name
+                )
+                .order_by(revenue.desc(), models.User.username)
+            )
+        if name == constantes.REPORT_CUSTOMERS:
+            return (
+                select(
+                    models.Customer.email,
+                    models.Customer.compagny_name,
+                    *metrics,
+                )
+                .join(
+                    models.Contract,
+                    models.Contract.customer_id == models.Customer.id,
+                )
+                .group_by(
+                    models.Customer.id,
+                    models.Customer.email,
+                    models.Customer.compagny_name,
+                )
+                .order_by(revenue.desc(), models.Customer.email)
+            )
+        if name == constantes.REPORT_MONTHS:
+            year = extract("year", models.Contract.creation_date)
+            month = extract("month", models.Contract.creation_date)
+            return (
+                select(year, month, *metrics)
+                .group_by(year, month)
+                .order_by(year, month)
+            )
+        raise ValueError("unknown report : " + name)
+
+    def build_report(self, name):
+        """
+        Runs a report and returns its columns and rows.
+
+        Args:
+            name (str): One of constantes.REPORT_NAMES.
+
+        Returns:
+            tuple: The column names and the list of value tuples, one per group.
+        """
+        rows = self.session.execute(self.report_query(name)).all()
+        if name == constantes.REPORT_MONTHS:
+            rows = [
+                (f"{int(year):04d}-{int(month):02d}", *metrics)
+                for year, month, *metrics in rows
+            ]
+        else:
+            rows = [tuple(row) for row in rows]
+        return REPORT_KEY_COLUMNS[name] + REPORT_METRIC_COLUMNS, rows
+
+    def summarize(self, values):
+        """
+        Computes the statistics of the values of a report column.
+
+        Args:
+            values (list): The values of the column, one per group.
+
+        Returns:
+            dict: The count, total, mean, minimum, maximum and the percentiles of
+            constantes.REPORT_PERCENTILES (keys p50, p90...), or only the count when
+            there is no value. The total, mean, minimum and maximum keep the type of
+            the values (Decimal amounts stay exact); only the percentiles are
+            computed on floats.
+        """
+        values = list(values)
+        if not values:
+            return {"count": 0}
+        total = sum(values)
+        summary = {
+            "count": len(values),
+            "total": total,
+            "mean": total / len(values),
+            "min": min(values),
+            "max": max(values),
+        }
+        array = numpy.fromiter((float(value) for value in values), dtype=float)
+        percentiles = numpy.percentile(array, constantes.REPORT_PERCENTILES)
+        for percentile, value in zip(
+            constantes.REPORT_PERCENTILES, percentiles
+        ):
+            summary[f"p{percentile}"] = float(value)
+        return summary
+
+    def distribution(self, values, bins=None):
+        """
+        Splits the values of a report column into ranges of equal width.
+
+        Args:
+            values (list): The values of the column, one per group.
+            bins (int): The number of ranges (default is constantes.REPORT_HISTOGRAM_BINS).
+
+        Returns:
+            list: The (lower bound, upper bound, number of groups) tuples, in order.
+        """
+        array = numpy.fromiter((float(value) for value in values), dtype=float)
+        if not array.size:
+            return []
+        counts, edges = numpy.histogram(
+            array, bins=bins or constantes.REPORT_HISTOGRAM_BINS
+        )
+        return [
+            (float(low), float(high), int(count))
+            for low, high, count in zip(edges[:-1], edges[1:], counts)
+        ]
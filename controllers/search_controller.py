@@ -0,0 +1,386 @@
+import math
+import models
+import utils
+import constantes
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import joinedload
+import logging
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email", "compagny_name")
+
+
+class SearchController:
+    """
+    The SearchController class finds the customers matching a search, ranked by
+    relevance.
+
+    The first name, last name, email and company name of the customers are
+    searched. On MySQL the search uses the FULLTEXT index of the customers in
+    boolean mode, every word of the search being a prefix, required unless the
+    index does not hold it (too short or a stopword). Other databases use the
+    n-gram table models.CustomerSearchGram: a customer is found when they hold
+    enough of the n-grams of the search (constantes.SEARCH_MIN_SIMILARITY), which
+    tolerates typos, and ranked by the number of n-grams they hold. Only the first
+    constantes.SEARCH_MAX_CANDIDATES holders of the rarest n-grams of the search
+    are ranked, so a frequent word does not aggregate its whole posting list. In
+    both cases the search is answered from an index, without reading the
+    customers table.
+
+    Attributes:
+        session: The database session used for database operations.
+        view: The view associated with customer operations.
+        user: The currently logged-in user.
+
+    Methods:
+        __init__(self, session, view=None, user=None):
+            Initializes the SearchController with the given parameters.
+
+        uses_fulltext(self):
+            Tells whether the database searches with a FULLTEXT index.
+
+        index_customers(self, customers):
+            Replaces the n-grams of the given customers.
+
+        index_emails(self, emails):
+            Replaces the n-grams of the customers with the given emails.
+
+        search_query(self, text, mine=False, limit=None, offset=0):
+            Builds the query returning the customers matching a search, best first.
+
+        rarest_grams(self, grams, count):
+            Returns the n-grams of a search held by the fewest customers.
+
+        fulltext_against(words):
+            Builds the boolean mode search of the FULLTEXT index.
+
+        search(self, text, page=0, page_size=None, mine=False):
+            Returns a page of the customers matching a search.
+
+        search_customers(self):
+            Asks for a search and displays the matching customers, one page at a time.
+
+        rebuild(self):
+            Recomputes the n-grams of every customer.
+    """
+
+    def __init__(self, session, view=None, user=None):
+        """
+        Initializes the SearchController with the given parameters.
+
+        Args:
+            session: The database session used for database operations.
+            view: The view associated with customer operations (default is None).
+            user: The currently logged-in user (default is None).
+        """
+        self.session = session
+        self.view = view
+        self.user = user
+
+    @property
+    def uses_fulltext(self):
+        """
+        bool: True if the database searches with a FULLTEXT index (MySQL).
+        """
+        return self.session.get_bind().dialect.name == "mysql"
+
+    def index_customers(self, customers):
+        """
+        Replaces the n-grams of the given customers.
+
+        Must be called in the transaction saving the customers. Does nothing on
+        MySQL, where the FULLTEXT index is maintained by the database.
+
+        Args:
+            customers: The models.Customer, or rows with the id and searched columns.
+        """
+        if self.uses_fulltext:
+            return
+        customers = list(customers)
+        if not customers:
+            return
+        table = models.CustomerSearchGram.__table__
+        self.session.execute(
+            delete(table).where(
+                table.c.customer_id.in_(
+                    [customer.id for customer in customers]
+                )
+            )
+        )
+        self._insert_grams(customers)
+
+    def index_emails(self, emails):
+        """
+        Replaces the n-grams of the customers with the given emails.
+
+        Used after a bulk insert, which does not return the new customers.
+
+        Args:
+            emails (list): The emails of the customers.
+        """
+        if self.uses_fulltext or not emails:
+            return
+        self.index_customers(
+            self.session.execute(
+                select(
+                    models.Customer.id,
+                    *(
+                        getattr(models.Customer, column)
+                        for column in SEARCH_COLUMNS
+                    ),
+                ).where(models.Customer.email.in_(emails))
+            )
+        )
+
+    def search_query(self, text, mine=False, limit=None, offset=0):
+        """
+        Builds the query returning the customers matching a search, best first.
+
+        Without FULLTEXT, a customer holding enough n-grams of the search holds at
+        least one of its len(grams) - needed + 1 rarest n-grams, so the candidates
+        are read from these n-grams only, by id and up to
+        constantes.SEARCH_MAX_CANDIDATES. The candidates are then ranked and cut
+        to the page before the customers are read, so only the customers of the
+        page are loaded.
+
+        Args:
+            text (str): The search typed by the user.
+            mine (bool): Only search the customers of the logged-in user (default is False).
+            limit (int): The maximum number of customers returned (default is None, no limit).
+            offset (int): The number of best customers skipped (default is 0).
+
+        Returns:
+            Select: The query returning (customer, score) rows, the score being
+            between 0 and 1 without FULLTEXT, or None when the search has no word
+            long enough.
+        """
+        if self.uses_fulltext:
+            words = [
+                word
+                for word in utils.search_words(text)
+                if len(word) >= constantes.SEARCH_MIN_WORD_LENGTH
+            ]
+            if not words:
+                return None
+            score = match(
+                *(
+                    getattr(models.Customer, column)
+                    for column in SEARCH_COLUMNS
+                ),
+                against=self.fulltext_against(words),
+            ).in_boolean_mode()
+            query = (
+                select(models.Customer, score.label("score"))
+                .where(score > 0)
+                .order_by(score.desc(), models.Customer.id)
+                .limit(limit)
+                .offset(offset)
+            )
+            if mine:
+                query = query.where(models.Customer.sales_id == self.user.id)
+        else:
+            grams = utils.query_grams(text)
+            if not grams:
+                return None
+            table = models.CustomerSearchGram
+            needed = math.ceil(len(grams) * constantes.SEARCH_MIN_SIMILARITY)
+            candidates = (
+                select(table.customer_id)
+                .where(
+                    table.gram.in_(
+                        self.rarest_grams(grams, len(grams) - needed + 1)
+                    )
+                )
+                .order_by(table.customer_id)
+                .limit(constantes.SEARCH_MAX_CANDIDATES)
+            )
+            if mine:
+                # Looked up per candidate, so the plan still starts from the
+                # n-grams rather than from every customer of the user
+                candidates = candidates.where(
+                    select(models.Customer.sales_id)
+                    .where(models.Customer.id == table.customer_id)
+                    .scalar_subquery()
+                    == self.user.id
+                )
+            hits = func.count().label("hits")
+            matches = (
+                select(table.customer_id, hits)
+                .where(
+                    table.gram.in_(grams),
+                    table.customer_id.in_(candidates.scalar_subquery()),
+                )
+                .group_by(table.customer_id)
+                .having(func.count() >= needed)
+                .order_by(hits.desc(), table.customer_id)
+                .limit(limit)
+                .offset(offset)
+                .subquery()
+            )
+            query = (
+                select(
+                    models.Customer,
+                    (matches.c.hits / float(len(grams))).label("score"),
+                )
+                .join(matches, models.Customer.id == matches.c.customer_id)
+                .order_by(matches.c.hits.desc(), models.Customer.id)
+            )
+        return query.options(joinedload(models.Customer.user))
+
+    def rarest_grams(self, grams, count):
+        """
+        Returns the n-grams of a search held by the fewest customers.
+
+        The holders of each n-gram are counted in one query, each count stopping
+        at constantes.SEARCH_MAX_CANDIDATES, so a frequent n-gram costs a bounded
+        index range scan.
+
+        Args:
+            grams (set): The n-grams of the search.
+            count (int): The number of n-grams returned.
+
+        Returns:
+            list: The count rarest n-grams.
+        """
+        table = models.CustomerSearchGram
+        grams = sorted(grams)
+        holders = self.session.execute(
+            select(
+                *(
+                    select(func.count())
+                    .select_from(
+                        select(table.customer_id)
+                        .where(table.gram == gram)
+                        .limit(constantes.SEARCH_MAX_CANDIDATES)
+                        .subquery()
+                    )
+                    .scalar_subquery()
+                    for gram in grams
+                )
+            )
+        ).one()
+        return [gram for _, gram in sorted(zip(holders, grams))[:count]]
+
+    @staticmethod
+    def fulltext_against(words):
+        """
+        Builds the boolean mode search of the FULLTEXT index.
+
+        Every word is a prefix. The words the index does not hold, shorter than
+        constantes.MYSQL_FULLTEXT_MIN_TOKEN_SIZE or stopwords, are optional: a
+        required one would make every customer fail the search.
+
+        Args:
+            words (list): The words of the search.
+
+        Returns:
+            str: The AGAINST expression.
+        """
+        return " ".join(
+            (
+                f"{word}*"
+                if len(word) < constantes.MYSQL_FULLTEXT_MIN_TOKEN_SIZE
+                or word in constantes.MYSQL_FULLTEXT_STOPWORDS
+                else f"+{word}*"
+            )
+            for word in words
+        )
+
+    def search(self, text, page=0, page_size=None, mine=False):
+        """
+        Returns a page of the customers matching a search.
+
+        Args:
+            text (str): The search typed by the user.
+            page (int): The number of the page, from 0 (default is 0).
+            page_size (int): The number of customers per page (default is the configured page size).
+            mine (bool): Only search the customers of the logged-in user (default is False).
+
+        Returns:
+            tuple: The (customer, score) rows of the page and True if a next page exists.
+        """
+        page_size = page_size or utils.get_page_size()
+        query = self.search_query(
+            text, mine=mine, limit=page_size + 1, offset=page * page_size
+        )
+        if query is None:
+            return [], False
+        rows = self.session.execute(query).all()
+        return [tuple(row) for row in rows[:page_size]], len(rows) > page_size
+
+    def search_customers(self):
+        """
+        Asks for a search and displays the matching customers, one page at a time.
+
+        Returns:
+            None
+        """
+        text = self.view.input_search()
+        page = 0
+        rows, has_next = self.search(text)
+        if not rows:
+            return self.view.display_customer_not_found()
+        while True:
+            self.view.display_search_results(rows)
+            choice = self.view.input_page_navigation(page > 0, has_next)
+            if choice == constantes.PAGE_NEXT and has_next:
+                page += 1
+            elif choice == constantes.PAGE_PREVIOUS and page > 0:
+                page -= 1
+            else:
+                return
+            rows, has_next = self.search(text, page=page)
+
+    def rebuild(self):
+        """
+        Recomputes the n-grams of every customer.
+
+        The customers are read in batches of the stream batch size and the n-grams
+        replaced in a single transaction. Does nothing on MySQL.
+
+        Returns:
+            int: The number of customers indexed.
+        """
+        if self.uses_fulltext:
+            return 0
+        columns = [
+            getattr(models.Customer, column) for column in SEARCH_COLUMNS
+        ]
+        indexed = 0
+        last_id = 0
+        try:
+            self.session.execute(delete(models.CustomerSearchGram))
+            while True:
+                customers = self.session.execute(
+                    select(models.Customer.id, *columns)
+                    .where(models.Customer.id > last_id)
+                    .order_by(models.Customer.id)
+                    .limit(utils.get_stream_batch_size())
+                ).all()
+                if not customers:
+                    break
+                self._insert_grams(customers)
+                indexed += len(customers)
+                last_id = customers[-1].id
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        logger.info(f"Rebuild search index : {indexed} customers")
+        return indexed
+
+    def _insert_grams(self, customers):
+        # Core insert: the ORM bulk insert costs more than the statement itself
+        rows = [
+            {"gram": gram, "customer_id": customer.id}
+            for customer in customers
+            for gram in utils.index_grams(
+                *(getattr(customer, column) for column in SEARCH_COLUMNS)
+            )
+        ]
+        if rows:
+            self.session.execute(
+                insert(models.CustomerSearchGram.__table__), rows
+            )
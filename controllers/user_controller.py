@@ -1,11 +1,20 @@
 from controllers import main_controller
 import models
+import utils
 import bcrypt
 import constantes
+import database
 import validators
 import jwt
 import os
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 import views
 import logging
 
@@ -20,6 +29,7 @@ class UserController:
         session: The database session used for database operations.
         view: The view associated with user operations.
         user: The currently logged-in user.
+        principal: The id, username and role of the logged-in user, as signed in the token.
 
     Methods:
         __init__(self, session, view, user=None):
@@ -28,6 +38,9 @@ class UserController:
         run_login_menu(self):
             Runs the login menu, allowing the user to log in with their email and password.
 
+        rehash_password(self, user, password):
+            Replaces an outdated password hash after a successful login.
+
         manage_user(self):
             Manages user-related operations, such as creating, updating, and deleting users.
 
@@ -58,6 +71,9 @@ class UserController:
         is_password_correct(self, input_password, user):
             Checks if the provided password is correct for the user.
 
+        build_principal(self, user):
+            Builds the principal of the user stored in the JWT token.
+
         generate_token(self, user):
             Generates a JWT token for the user.
 
@@ -67,11 +83,41 @@ class UserController:
         load_token(self, email):
             Loads the JWT token for the user from a file.
 
+        decode_token(self, token):
+            Decodes and verifies the provided JWT token.
+
         is_token_valid(self, token):
             Checks if the provided JWT token is valid.
 
         get_user_from_token(self, token):
             Retrieves a user from the database based on their ID extracted from the JWT token.
+
+        get_user_from_principal(self, payload):
+            Retrieves the user of a decoded token and checks it against the principal.
+
+        list_user(self):
+            Lists all users in the database, one page at a time.
+
+        users_query(self, session=None):
+            Builds the query used to list users.
+
+        iter_users(self, batch_size=None):
+            Iterates over the users through a server-side cursor.
+
+        import_users(self):
+            Creates the users listed in a CSV file chosen by the manager.
+
+        import_users_csv(self, path, batch_size=None, workers=None):
+            Creates the users listed in a CSV file, hashing passwords in parallel.
+
+        insert_users_batch(self, users, rejected):
+            Inserts the users of a batch in one transaction.
+
+        read_users_csv(self, file):
+            Reads and validates the users of a CSV file.
+
+        remove_existing_users(self, users, rejected, batch_size):
+            Removes the users whose email or username is already taken.
     """
 
     def __init__(self, session, view, user=None):
@@ -87,6 +133,7 @@ class UserController:
         self.secret_key = os.getenv("secret_key")
         self.view = view
         self.user = user
+        self.principal = None
 
     def run_login_menu(self):
         """
@@ -96,13 +143,17 @@ class UserController:
         It checks if the user exists in the database and if the provided password is correct.
         If the login is successful, it returns the logged-in user.
 
+        A saved token is decoded once and its principal is trusted for the role, so a
+        relaunch with a valid token only loads the user row.
+
         Returns:
             user: The logged-in user.
         """
         views.MainView.clear_screen(self)
         token = self.load_token()
-        if token and self.is_token_valid(token):
-            self.user = self.get_user_from_token(token)
+        payload = self.decode_token(token) if token else None
+        if payload:
+            self.user = self.get_user_from_principal(payload)
             if self.user:
                 return self.user
         self.view.login_menu()
@@ -149,19 +200,49 @@ class UserController:
 
                         continue
 
+                self.rehash_password(user, password)
                 self.user = user
+                self.principal = self.build_principal(user)
                 self.save_token(self.generate_token(user))
                 return user
         self.view.display_error(constantes.ERR_TOO_MANY_ATTEMPTS)
         raise ValueError(constantes.ERR_TOO_MANY_ATTEMPTS)
 
+    def rehash_password(self, user, password):
+        """
+        Replaces an outdated password hash after a successful login.
+
+        Hashes made with the legacy global salt or with another cost factor than
+        BCRYPT_ROUNDS are upgraded transparently, the plain text password being only
+        known at login. A failure is logged and does not prevent the login.
+
+        Args:
+            user (models.User): The user who just logged in.
+            password (str): The password the user logged in with.
+
+        Returns:
+            None
+        """
+        if not user.password_needs_rehash():
+            return
+        try:
+            user.set_password(password)
+            self.session.commit()
+            logger.info("Rehash password : " + user.username + " success")
+        except SQLAlchemyError as err:
+            self.session.rollback()
+            logger.info(
+                "Rehash password : " + user.username + " failed " + str(err)
+            )
+
     def manage_user(self):
         """
         Manages user-related operations such as creating, updating, and deleting users.
 
         This method displays the user management menu and handles the user's selection.
         Depending on the user's choice, it either creates a new user, updates an existing user,
-        deletes a user, or returns to the previous menu.
+        deletes a user, lists the users, imports users from a CSV file, or returns to the
+        previous menu.
 
         Returns:
             None
@@ -184,6 +265,9 @@ class UserController:
             case constantes.MANAGER_LIST_USER:
                 views.MainView.clear_screen(self)
                 self.list_user()
+            case constantes.MANAGER_IMPORT_USERS:
+                views.MainView.clear_screen(self)
+                self.import_users()
             case _:
                 self.view.display_error(constantes.MAIN_CONTROLLER_ERR_INPUT)
 
@@ -352,6 +436,13 @@ class UserController:
         self.view.display_delete_user()
         try:
             user = self.get_user()
+            if user is not None:
+                # The totals of the contracts reference the user
+                self.session.execute(
+                    delete(models.SalesBalance).where(
+                        models.SalesBalance.manager_id == user.id
+                    )
+                )
             self.session.delete(user)
             self.session.commit()
             self.view.display_delete_user_validation()
@@ -382,11 +473,28 @@ class UserController:
             return None
         return user
 
+    def build_principal(self, user):
+        """
+        Builds the principal of the user stored in the JWT token.
+
+        The role name is read from the reference cache.
+
+        Returns:
+            principal: A dict with the user's ID, username, role ID and role name.
+        """
+        role = database.reference_cache.get(models.Role, id=user.role_id)
+        return {
+            "user_id": user.id,
+            "username": user.username,
+            "role_id": user.role_id,
+            "role": role.name,
+        }
+
     def generate_token(self, user):
         """
         Generates a JWT token for the user.
 
-        This method creates a payload with the user's ID and sets the token to expire in 1 hour.
+        This method creates a payload with the user's principal and sets the token to expire in 1 hour.
         It then encodes the payload using the secret key and returns the token.
 
         Returns:
@@ -395,7 +503,7 @@ class UserController:
         token_validity_period = constantes.TOKEN_VALIDITY_PERIOD
 
         payload = {
-            "user_id": user.id,
+            **self.build_principal(user),
             "exp": datetime.utcnow() + timedelta(hours=token_validity_period),
         }
         return jwt.encode(payload, self.secret_key, algorithm="HS256")
@@ -430,58 +538,341 @@ class UserController:
                 return file.read()
         return None
 
-    def is_token_valid(self, token):
+    def decode_token(self, token):
         """
-        Checks if the provided JWT token is valid.
+        Decodes and verifies the provided JWT token.
 
-        This method attempts to decode the JWT token using the secret key and returns True if the token is valid.
-        If the token is invalid, it returns False.
+        This method decodes the JWT token using the secret key and returns its payload.
+        If the token is expired or invalid, a message is displayed and it returns None.
 
         Returns:
-            is_valid: A boolean indicating whether the token is valid.
+            payload: The payload of the token, or None.
         """
         try:
-            jwt.decode(token, self.secret_key, algorithms=["HS256"])
-            return True
+            return jwt.decode(token, self.secret_key, algorithms=["HS256"])
         except jwt.ExpiredSignatureError:
             self.view.display_token_expire()
         except jwt.InvalidTokenError:
             self.view.display_token_invalide()
-        return False
+        return None
+
+    def is_token_valid(self, token):
+        """
+        Checks if the provided JWT token is valid.
+
+        This method attempts to decode the JWT token using the secret key and returns True if the token is valid.
+        If the token is invalid, it returns False.
+
+        Returns:
+            is_valid: A boolean indicating whether the token is valid.
+        """
+        return self.decode_token(token) is not None
 
     def get_user_from_token(self, token):
         """
         Retrieves a user from the database based on their ID extracted from the JWT token.
 
-        This method attempts to decode the JWT token and extract the user's ID from the payload.
-        It then queries the database to find the corresponding user and returns it.
+        This method decodes the JWT token and retrieves the user of its principal.
 
         Returns:
             user: The user found in the database.
         """
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
-            user_id = payload["user_id"]
-            return (
-                self.session.query(models.User).filter_by(id=user_id).first()
-            )
-        except jwt.InvalidTokenError:
+        payload = self.decode_token(token)
+        if payload is None:
+            return None
+        return self.get_user_from_principal(payload)
+
+    def get_user_from_principal(self, payload):
+        """
+        Retrieves the user of a decoded token and checks it against the principal.
+
+        The user is loaded with a single query. When the user no longer exists, or when
+        its username or role changed since the token was issued (or the token predates
+        the principal), None is returned so that the user logs in again.
+
+        Args:
+            payload (dict): The decoded token.
+
+        Returns:
+            user: The user found in the database, or None.
+        """
+        user = self.session.get(models.User, payload.get("user_id"))
+        if (
+            user is None
+            or "role" not in payload
+            or user.username != payload.get("username")
+            or user.role_id != payload.get("role_id")
+        ):
             return None
+        self.principal = {
+            key: payload[key] for key in ("user_id", "username", "role_id", "role")
+        }
+        return user
 
     def list_user(self):
         """
         Lists all users in the database.
 
-        This method retrieves all users from the database and displays their information
-        in a formatted table. If no users are found, a message is displayed indicating
-        that no users were found.
+        This method retrieves the users one page at a time and displays their information
+        in a formatted table, letting the user move to the next or previous page.
+        If no users are found, a message is displayed indicating that no users were found.
 
         Returns:
             None
         """
-
-        users = self.session.query(models.User).all()
+        paginator = utils.KeysetPaginator(
+            self.users_query(), models.User.id
+        )
+        users = paginator.first_page()
 
         if len(users) == 0:
             return self.view.display_user_not_found()
-        self.view.display_list_user(users)
+        while users is not None:
+            self.view.display_list_user(users, wait=False)
+            users = paginator.navigate(
+                self.view.input_page_navigation(
+                    paginator.has_previous, paginator.has_next
+                )
+            )
+
+    def users_query(self, session=None):
+        """
+        Builds the query used to list users.
+
+        The role is loaded in the same query since it is displayed for every user.
+
+        Args:
+            session: The session to build the query on (default is the controller session).
+
+        Returns:
+            Query: The users query.
+        """
+        session = session or self.session
+        return session.query(models.User).options(joinedload(models.User.role))
+
+    def iter_users(self, batch_size=None):
+        """
+        Iterates over the users through a server-side cursor.
+
+        Unlike list_user, the whole result set is walked, batch_size rows at a time,
+        so full scans keep a bounded memory footprint whatever the table size.
+
+        Args:
+            batch_size: The number of rows fetched at a time (default is the configured batch size).
+
+        Yields:
+            models.User: The users.
+        """
+        with utils.streaming_session(self.session) as session:
+            yield from utils.stream_query(
+                self.users_query(session=session), batch_size
+            )
+
+    def import_users(self):
+        """
+        Creates the users listed in a CSV file chosen by the manager.
+
+        This method prompts for the path of the CSV file, imports it and displays the
+        import report.
+
+        Returns:
+            None
+        """
+        self.view.display_import_users()
+        path = self.view.input_csv_path()
+        try:
+            report = self.import_users_csv(path)
+        except (OSError, ValueError) as err:
+            self.view.display_error(f"Error : {err}")
+            logger.info("Import users : " + path + " failed " + str(err))
+            return
+        logger.info(
+            f"Import users : {report['created']} created, "
+            f"{len(report['rejected'])} rejected"
+        )
+        return self.view.display_import_users_report(report)
+
+    def import_users_csv(self, path, batch_size=None, workers=None):
+        """
+        Creates the users listed in a CSV file, hashing passwords in parallel.
+
+        The file holds one user per line with the columns of
+        constantes.USER_IMPORT_COLUMNS, the role being given by its name. Bcrypt is
+        deliberately slow, so the passwords are hashed across a process pool while
+        the users are inserted batch_size at a time, one transaction per batch.
+
+        Args:
+            path (str): The path of the CSV file.
+            batch_size (int): The number of users per transaction (default is the configured batch size).
+            workers (int): The number of hashing processes (default is the configured number of workers).
+
+        Returns:
+            dict: The number of lines read, of users created, the rejected lines as
+            (line number, reason) tuples, the elapsed seconds and the users per second.
+
+        Raises:
+            ValueError: If a column is missing from the file.
+        """
+        started = time.perf_counter()
+        batch_size = batch_size or utils.get_import_batch_size()
+        workers = workers or utils.get_import_workers()
+        with open(path, newline="", encoding="utf-8") as file:
+            users, rejected = self.read_users_csv(file)
+        read = len(users) + len(rejected)
+        users = self.remove_existing_users(users, rejected, batch_size)
+
+        created = 0
+        if users:
+            rounds = models.get_bcrypt_rounds()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                hashes = executor.map(
+                    models.hash_password,
+                    [user["password"] for _, user in users],
+                    repeat(rounds),
+                    chunksize=max(1, len(users) // (workers * 4)),
+                )
+                for batch in utils.batched(zip(users, hashes), batch_size):
+                    created += self.insert_users_batch(
+                        [
+                            (line, dict(user, password=password_hash))
+                            for (line, user), password_hash in batch
+                        ],
+                        rejected,
+                    )
+
+        seconds = time.perf_counter() - started
+        return {
+            "read": read,
+            "created": created,
+            "rejected": sorted(rejected),
+            "workers": workers,
+            "seconds": seconds,
+            "users_per_second": created / seconds if seconds else 0.0,
+        }
+
+    def insert_users_batch(self, users, rejected):
+        """
+        Inserts the users of a batch in one transaction.
+
+        When the database rejects the batch, its users are inserted again one at a
+        time, so only the failing lines are rejected, with the error of the
+        database. The passwords are already hashed and are not hashed again.
+
+        Args:
+            users (list): The (line number, column values) tuples, with the password hashes.
+            rejected (list): The rejected lines, as (line number, reason) tuples.
+
+        Returns:
+            int: The number of users created.
+        """
+        try:
+            self.session.execute(
+                insert(models.User), [user for _, user in users]
+            )
+            self.session.commit()
+        except SQLAlchemyError as err:
+            self.session.rollback()
+            logger.info("Import users : batch failed " + str(err))
+            if len(users) == 1:
+                rejected.append((users[0][0], str(getattr(err, "orig", err))))
+                return 0
+            return sum(
+                self.insert_users_batch([user], rejected) for user in users
+            )
+        return len(users)
+
+    def read_users_csv(self, file):
+        """
+        Reads and validates the users of a CSV file.
+
+        Args:
+            file: The opened CSV file.
+
+        Returns:
+            tuple: The valid users as (line number, column values) tuples and the
+            rejected lines as (line number, reason) tuples.
+
+        Raises:
+            ValueError: If a column is missing from the file.
+        """
+        reader = csv.DictReader(file)
+        missing = set(constantes.USER_IMPORT_COLUMNS) - set(
+            reader.fieldnames or []
+        )
+        if missing:
+            raise ValueError("missing columns : " + ", ".join(sorted(missing)))
+
+        users = []
+        rejected = []
+        emails = set()
+        usernames = set()
+        for row in reader:
+            line = reader.line_num
+            values = {
+                column: (row[column] or "").strip()
+                for column in constantes.USER_IMPORT_COLUMNS
+            }
+            try:
+                validators.validate_email(values["email"])
+                validators.validate_phone(values["phone_number"])
+                validators.validate_password(values["password"])
+                if not values["username"] or not values["full_name"]:
+                    raise ValueError("username and full name are required")
+                role = database.reference_cache.get(
+                    models.Role, name=values.pop("role").upper()
+                )
+                if role is None:
+                    raise ValueError("unknown role")
+                if values["email"] in emails:
+                    raise ValueError("email duplicated in the file")
+                if values["username"] in usernames:
+                    raise ValueError("username duplicated in the file")
+            except ValueError as err:
+                rejected.append((line, str(err)))
+                continue
+            values["role_id"] = role.id
+            emails.add(values["email"])
+            usernames.add(values["username"])
+            users.append((line, values))
+        return users, rejected
+
+    def remove_existing_users(self, users, rejected, batch_size):
+        """
+        Removes the users whose email or username is already taken.
+
+        The database is checked with one query per batch_size users, before any
+        password is hashed.
+
+        Args:
+            users (list): The (line number, column values) tuples to check.
+            rejected (list): The rejected lines, extended with the users removed.
+            batch_size (int): The number of users checked per query.
+
+        Returns:
+            list: The users that can be created.
+        """
+        remaining = []
+        for batch in utils.batched(users, batch_size):
+            emails = [user["email"] for _, user in batch]
+            usernames = [user["username"] for _, user in batch]
+            taken_emails = set()
+            taken_usernames = set()
+            for email, username in self.session.query(
+                models.User.email, models.User.username
+            ).filter(
+                or_(
+                    models.User.email.in_(emails),
+                    models.User.username.in_(usernames),
+                )
+            ):
+                taken_emails.add(email)
+                taken_usernames.add(username)
+            for line, user in batch:
+                if (
+                    user["email"] in taken_emails
+                    or user["username"] in taken_usernames
+                ):
+                    rejected.append((line, "user already exists"))
+                else:
+                    remaining.append((line, user))
+        return remaining
@@ -1,4 +1,7 @@
-from sqlalchemy import create_engine
+import hashlib
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, registry
 import configparser
 import mysql.connector
@@ -8,26 +11,191 @@ from models.user import User
 from models.customers import Customer
 from models.contract import Contract
 from models.event import Event
+from models.app_metadata import AppMetadata
+from models.sales_balance import SalesBalance
+from models.migrations import MigrationEngine
 from dotenv import load_dotenv
 from constantes import ROLES
+from utils import (
+    MeteredQueuePool,
+    PoolMetrics,
+    QueryProfiler,
+    ReferenceCache,
+    SlowQueryLog,
+    set_stream_engine_factory,
+)
+import constantes
 import os
 
+load_dotenv()
+
 DATABASE_USERNAME = os.getenv("username")
 DATABASE_PASSWORD = os.getenv("password")
 DATABASE_HOST = os.getenv("host")
 DATABASE_NAME = os.getenv("database_name")
 DATABASE_PORT = os.getenv("port")
-DATABASE_URL = f"mysql+mysqlconnector://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
+DATABASE_URL = (
+    os.getenv("DATABASE_URL")
+    or f"mysql+mysqlconnector://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
+)
+BOOTSTRAP_FINGERPRINT_KEY = "bootstrap_fingerprint"
+
+# Statistics of the application connection pool, filled once init_db has run.
+pool_metrics = PoolMetrics()
+
+# Statements and database time of each action, recorded once main.py enables
+# the profile mode.
+query_profiler = QueryProfiler()
+
+# Statements slower than SLOW_QUERY_MS, with their plan, attached by init_db.
+slow_query_log = SlowQueryLog()
+
+# Small, rarely changing tables kept in memory, attached to the session by init_db.
+reference_cache = ReferenceCache()
+reference_cache.register(Role, "id", "name")
+
+
+def env_int(name, default):
+    """
+    Reads an integer from the environment.
+
+    Returns:
+        int: The value of the variable, or default when it is missing or invalid.
+    """
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def env_float(name, default):
+    """
+    Reads a float from the environment.
+
+    Returns:
+        float: The value of the variable, or default when it is missing or invalid.
+    """
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def env_bool(name, default):
+    """
+    Reads a boolean ("1", "true", "yes", "on") from the environment.
+
+    Returns:
+        bool: The value of the variable, or default when it is missing.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_engine_options():
+    """
+    Returns the connection pool settings of the application engine.
+
+    The settings are read from the DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE and DB_POOL_PRE_PING environment variables.
+
+    Returns:
+        dict: The keyword arguments passed to create_engine.
+    """
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": env_int("DB_POOL_SIZE", constantes.DEFAULT_DB_POOL_SIZE),
+        "max_overflow": env_int(
+            "DB_MAX_OVERFLOW", constantes.DEFAULT_DB_MAX_OVERFLOW
+        ),
+        "pool_timeout": env_int(
+            "DB_POOL_TIMEOUT", constantes.DEFAULT_DB_POOL_TIMEOUT
+        ),
+        "pool_recycle": env_int(
+            "DB_POOL_RECYCLE", constantes.DEFAULT_DB_POOL_RECYCLE
+        ),
+        "pool_pre_ping": env_bool(
+            "DB_POOL_PRE_PING", constantes.DEFAULT_DB_POOL_PRE_PING
+        ),
+    }
+
+
+def get_slow_query_options():
+    """
+    Returns the settings of the slow query log.
+
+    The settings are read from the SLOW_QUERY_MS, SLOW_QUERY_LOG,
+    SLOW_QUERY_LOG_MAX_BYTES and SLOW_QUERY_LOG_BACKUPS environment variables.
+
+    Returns:
+        dict: The keyword arguments passed to SlowQueryLog.attach, or None when
+        SLOW_QUERY_MS is 0.
+    """
+    threshold_ms = env_int("SLOW_QUERY_MS", constantes.DEFAULT_SLOW_QUERY_MS)
+    if threshold_ms <= 0:
+        return None
+    return {
+        "path": os.getenv("SLOW_QUERY_LOG")
+        or constantes.DEFAULT_SLOW_QUERY_LOG,
+        "threshold_ms": threshold_ms,
+        "max_bytes": env_int(
+            "SLOW_QUERY_LOG_MAX_BYTES",
+            constantes.DEFAULT_SLOW_QUERY_LOG_MAX_BYTES,
+        ),
+        "backup_count": env_int(
+            "SLOW_QUERY_LOG_BACKUPS", constantes.DEFAULT_SLOW_QUERY_LOG_BACKUPS
+        ),
+    }
+
+
+def create_app_engine(url):
+    """
+    Creates an engine with the configured connection pool, whose statements are
+    recorded by query_profiler and slow_query_log.
+
+    Used for the application engine and for the streaming engines of
+    utils.streaming_session.
+
+    Args:
+        url: The database URL.
+
+    Returns:
+        Engine: The engine.
+    """
+    engine = create_engine(url, **get_engine_options())
+    query_profiler.attach(engine)
+    slow_query_log.watch(engine)
+    return engine
+
+
+set_stream_engine_factory(create_app_engine)
+
+
+def is_mysql_database():
+    """
+    Checks if the application database is a MySQL database.
+
+    Returns:
+        bool: True if DATABASE_URL targets MySQL.
+    """
+    return make_url(DATABASE_URL).get_backend_name() == "mysql"
 
 
 def database_exists():
     """
     Checks if the database exists.
 
+    Databases other than MySQL (SQLite for tests and benchmarks) are created on
+    first connection and always considered to exist.
+
     Returns:
         bool: True if the database exists, False otherwise.
     """
 
+    if not is_mysql_database():
+        return True
     connection = None
     try:
         connection = mysql.connector.connect(
@@ -76,31 +244,131 @@ def create_database():
             connection.close()
 
 
+def bootstrap_fingerprint():
+    """
+    Computes the fingerprint of everything the startup bootstrap creates.
+
+    The fingerprint covers the latest schema migration, the tables, columns and indexes
+    of the models, the default roles and the admin account settings, so it changes
+    whenever the bootstrap would have something new to do.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    parts = [f"migration:{MigrationEngine(None).head()}"]
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table:{table.name}")
+        for column in table.columns:
+            parts.append(
+                f"column:{column.name}:{column.type}:{column.nullable}:"
+                f"{column.primary_key}:{column.unique}"
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"index:{index.name}:{columns}:{index.unique}")
+    parts.append("roles:" + ",".join(ROLES))
+    parts.append("admin:" + str(os.getenv("ADMIN_FIRST_NAME")))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def is_bootstrap_current(engine):
+    """
+    Checks, in a single query, if the stored bootstrap fingerprint is up to date
+    and the rows created by the bootstrap still exist.
+
+    The query also checks that the default roles and the admin account are present,
+    so a role or an admin deleted since the last launch is created again. Any error
+    (missing database, missing table...) means the full bootstrap is needed.
+
+    Args:
+        engine: The engine of the application database.
+
+    Returns:
+        bool: True if the database was bootstrapped with the current fingerprint.
+    """
+    try:
+        with engine.connect() as connection:
+            stored, roles, admin = connection.execute(
+                select(
+                    select(AppMetadata.value)
+                    .where(AppMetadata.name == BOOTSTRAP_FINGERPRINT_KEY)
+                    .scalar_subquery(),
+                    select(func.count(Role.id))
+                    .where(Role.name.in_(ROLES))
+                    .scalar_subquery(),
+                    select(User.id)
+                    .where(User.username == os.getenv("ADMIN_FIRST_NAME"))
+                    .exists(),
+                )
+            ).one()
+    except SQLAlchemyError:
+        return False
+    return (
+        stored == bootstrap_fingerprint() and roles == len(ROLES) and admin
+    )
+
+
+def store_bootstrap_fingerprint(session):
+    """
+    Stores the current bootstrap fingerprint once the bootstrap has completed.
+
+    Args:
+        session: The SQLAlchemy session.
+    """
+    session.merge(
+        AppMetadata(
+            name=BOOTSTRAP_FINGERPRINT_KEY, value=bootstrap_fingerprint()
+        )
+    )
+    session.commit()
+    session.info["bootstrap_current"] = True
+
+
 def init_db():
     """
     Initializes the database.
 
-    This function checks if the database exists, and if not, creates it.
-    It then creates all the tables defined in the SQLAlchemy models and initializes
-    the default roles in the database.
+    This function creates the engine with the configured connection pool and starts
+    collecting the pool statistics in pool_metrics, the statements of the profiled
+    actions in query_profiler and the statements slower than SLOW_QUERY_MS in
+    slow_query_log. If the stored bootstrap fingerprint
+    is current, nothing else is done. Otherwise it checks if the database exists, and
+    if not, creates it, then applies the pending schema migrations and initializes the
+    default roles in the database.
+
+    The returned session is attached to reference_cache. It has
+    session.info["bootstrap_current"] set to True when the bootstrap was skipped;
+    otherwise the caller finishes the bootstrap (admin account) and calls
+    store_bootstrap_fingerprint.
 
     Returns:
-        SessionLocal: The SQLAlchemy session factory.
+        Session: The SQLAlchemy session.
     """
 
+    engine = create_app_engine(DATABASE_URL)
+    pool_metrics.attach(engine)
+    slow_query_options = get_slow_query_options()
+    if slow_query_options is not None:
+        slow_query_log.attach(engine, **slow_query_options)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    if is_bootstrap_current(engine):
+        session = SessionLocal()
+        session.info["bootstrap_current"] = True
+        reference_cache.attach(session)
+        return session
+
     if not database_exists():
         create_database()
-    engine = create_engine(DATABASE_URL)
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    MigrationEngine(engine).upgrade()
     # Initialize default roles after creating the tables
     session = SessionLocal()
 
-    for role_name in ROLES:
-        existing_role = session.query(Role).filter_by(name=role_name).first()
-        if not existing_role:
-            role = Role(name=role_name)
-            session.add(role)
+    existing_roles = set(session.scalars(select(Role.name)))
+    session.add_all(
+        Role(name=role_name)
+        for role_name in ROLES
+        if role_name not in existing_roles
+    )
 
     try:
         session.commit()
@@ -111,4 +379,7 @@ def init_db():
     finally:
         session.close()
 
-    return SessionLocal()
+    session = SessionLocal()
+    session.info["bootstrap_current"] = False
+    reference_cache.attach(session)
+    return session
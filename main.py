@@ -1,9 +1,22 @@
+from controllers.cli_controller import CliController
 from controllers.main_controller import MainController
-from database import init_db
+from database import (
+    env_float,
+    env_int,
+    init_db,
+    query_profiler,
+    reference_cache,
+    slow_query_log,
+    store_bootstrap_fingerprint,
+)
+import constantes
 import models
 import models.user
+import utils
 
+import argparse
 import os
+import sys
 import views.themes
 import sentry_sdk
 from sentry_sdk.integrations.logging import LoggingIntegration
@@ -12,43 +25,149 @@ import logging
 
 sentry_sdk.init(
     dsn=os.getenv("sentry_url"),
-    # Set traces_sample_rate to 1.0 to capture 100%
-    # of transactions for performance monitoring.
-    traces_sample_rate=1.0,
-    # Set profiles_sample_rate to 1.0 to profile 100%
-    # of sampled transactions.
-    # We recommend adjusting this value in production.
-    profiles_sample_rate=1.0,
+    # Share of the transactions traced for performance monitoring
+    traces_sample_rate=env_float(
+        "SENTRY_TRACES_SAMPLE_RATE",
+        constantes.DEFAULT_SENTRY_TRACES_SAMPLE_RATE,
+    ),
+    # Share of the traced transactions that are also profiled
+    profiles_sample_rate=env_float(
+        "SENTRY_PROFILES_SAMPLE_RATE",
+        constantes.DEFAULT_SENTRY_PROFILES_SAMPLE_RATE,
+    ),
+    # The log records reach Sentry through the telemetry thread only
+    integrations=[LoggingIntegration(level=None, event_level=None)],
 )
 
-# configure the logging module to send messages only to Sentry
+
+def init_telemetry():
+    """
+    Sends the log records to the telemetry sinks from a background thread.
+
+    The sinks are listed in TELEMETRY_SINKS, separated by commas: "file" appends
+    the records to TELEMETRY_FILE as JSON lines, "stdout" writes them to the
+    standard output and "sentry" sends the errors to Sentry. TELEMETRY_LEVEL is
+    the lowest level logged, TELEMETRY_SAMPLE_RATE the share of the records below
+    WARNING that are kept and TELEMETRY_QUEUE_SIZE the number of records waiting
+    for the background thread, beyond which records are dropped.
+
+    Returns:
+        utils.Telemetry: The telemetry, to close before leaving.
+    """
+    sinks = []
+    names = os.getenv("TELEMETRY_SINKS", constantes.DEFAULT_TELEMETRY_SINKS)
+    for name in filter(None, (name.strip() for name in names.split(","))):
+        if name == "file":
+            sinks.append(
+                utils.FileSink(
+                    os.getenv("TELEMETRY_FILE")
+                    or constantes.DEFAULT_TELEMETRY_FILE
+                )
+            )
+        elif name == "stdout":
+            sinks.append(utils.StreamSink())
+        elif name == "sentry":
+            sinks.append(utils.SentrySink())
+        else:
+            print(
+                f"Unknown telemetry sink {name}, expected one of "
+                + ", ".join(constantes.TELEMETRY_SINKS),
+                file=sys.stderr,
+            )
+    telemetry = utils.Telemetry(
+        sinks,
+        sample_rate=env_float(
+            "TELEMETRY_SAMPLE_RATE", constantes.DEFAULT_TELEMETRY_SAMPLE_RATE
+        ),
+        queue_size=env_int(
+            "TELEMETRY_QUEUE_SIZE", constantes.DEFAULT_TELEMETRY_QUEUE_SIZE
+        ),
+    )
+    root_logger = logging.getLogger()
+    level = os.getenv("TELEMETRY_LEVEL") or constantes.DEFAULT_TELEMETRY_LEVEL
+    root_logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(telemetry.handler())
+    return telemetry
+
+
+telemetry = init_telemetry()
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
 
-# Remove all existing handlers
-for handler in logger.handlers[:]:
-    logger.removeHandler(handler)
 
-# Add a Sentry handler
-sentry_handler = sentry_sdk.integrations.logging.EventHandler()
-sentry_handler.setLevel(logging.DEBUG)
-logger.addHandler(sentry_handler)
+def parse_profile_options(argv):
+    """
+    Extracts the profile options from the command line.
+
+    --profile displays the statements and database time of each action once it has
+    run, --profile-log FILE also appends them to FILE as JSON lines. Both work with
+    the interactive menu and with the headless commands.
+
+    Args:
+        argv (list): The command line arguments, without the program name.
+
+    Returns:
+        tuple: The profiler, or None when profiling is off, and the other arguments.
+    """
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--profile-log")
+    options, argv = parser.parse_known_args(argv)
+    if not (options.profile or options.profile_log):
+        return None, argv
+    query_profiler.log_path = options.profile_log
+    return query_profiler, argv
+
+
+def finish_bootstrap(main_controller):
+    """
+    Finishes the database bootstrap started by init_db.
+
+    When init_db ran the full bootstrap, the admin account is created and the
+    bootstrap fingerprint is stored so that the next launches take the fast path.
+    Nothing is done when init_db took the fast path.
+
+    Args:
+        main_controller (MainController): The main controller of the application.
+    """
+    session = main_controller.session
+    if not session.info.get("bootstrap_current"):
+        main_controller.create_admin()
+        store_bootstrap_fingerprint(session)
+
+
 try:
     # Main program
     if __name__ == "__main__":
+        # With arguments, run a headless command instead of the menus
+        exit_code = 0
+        profiler, argv = parse_profile_options(sys.argv[1:])
         session = init_db()
         main_controller = MainController(
-            session, console=views.themes.theme_console()
+            session,
+            console=views.themes.theme_console(),
+            profiler=None if argv else profiler,
         )
 
         try:
-            main_controller.create_admin()
-            main_controller.run()
+            finish_bootstrap(main_controller)
+            if argv:
+                exit_code = CliController(session, profiler=profiler).run(
+                    argv
+                )
+            else:
+                reference_cache.load()
+                main_controller.run()
         except Exception as e:
             sentry_sdk.capture_exception(e)
             logger.info("Error exception : " + str(e))
+            exit_code = 1
         finally:
+            telemetry.close()
             sentry_sdk.flush()
             session.close()
+            slow_query_log.close()
+        sys.exit(exit_code)
 except KeyboardInterrupt as err:
     print("vous avez quitter le programme")
@@ -4,3 +4,8 @@ from .contract import Contract
 from .customers import Customer
 from .role import Role
 from .user import User
+from .sales_balance import SalesBalance
+from .customer_search_gram import CustomerSearchGram
+from .money import Money, to_money
+from .password import check_password, get_bcrypt_rounds, hash_password
+from .app_metadata import AppMetadata
@@ -0,0 +1,32 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from models.base import Base
+
+
+class AppMetadata(Base):
+    """
+    Represents a setting stored by the application itself in the database.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the setting.
+    value : str
+        The value of the setting.
+    """
+
+    __tablename__ = "app_metadata"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    def __str__(self):
+        """
+        Returns a string representation of the setting.
+
+        Returns:
+        --------
+        str
+            The name and value of the setting.
+        """
+        return f"{self.name}={self.value}"
@@ -1,9 +1,9 @@
 from sqlalchemy import (
     Column,
     ForeignKey,
-    Float,
     DateTime,
     Boolean,
+    Index,
     String,
 )
 from datetime import datetime
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models.base import Base
+from models.money import Money
 from models.user import User
 
 
@@ -30,19 +31,31 @@ class Contract(Base):
         Foreign key referencing the customer.
     customer : Customer
         The customer associated with the contract.
-    total_amount : float
+    total_amount : Decimal
         Total amount of the contract.
-    remaining_amount : float
+    remaining_amount : Decimal
         Remaining amount to be paid on the contract.
     creation_date : datetime
         The date and time when the contract was created.
     is_signed : bool
         Indicates whether the contract is signed.
+    reference : str
+        The external reference of the contract, set by the bulk import.
     event : Event
         The event associated with the contract (one-to-one relationship).
     """
 
     __tablename__ = "contracts"
+    __table_args__ = (
+        # Contracts not signed, or not signed and not fully paid
+        Index(
+            "ix_contracts_signed_remaining", "is_signed", "remaining_amount"
+        ),
+        # Contracts not fully paid
+        Index("ix_contracts_remaining", "remaining_amount"),
+        # Contracts of a manager, optionally by signature
+        Index("ix_contracts_manager_signed", "manager_id", "is_signed"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     # Relation with Users:
@@ -54,10 +67,11 @@ class Contract(Base):
     customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
     customer: Mapped["Customer"] = relationship(back_populates="contracts")
 
-    total_amount = Column(Float, nullable=False)
-    remaining_amount = Column(Float, nullable=False)
+    total_amount = Column(Money, nullable=False)
+    remaining_amount = Column(Money, nullable=False)
     creation_date = Column(DateTime, default=datetime.now, nullable=False)
     is_signed = Column(Boolean, default=False, nullable=False)
+    reference = Column(String(50), unique=True, index=True, nullable=True)
 
     # Relation with Events one to one :
     event: Mapped["Event"] = relationship(
@@ -71,15 +85,16 @@ class Contract(Base):
         is_signed=False,
         user=None,
         customer=None,
+        reference=None,
     ):
         """
         Initializes a new Contract instance.
 
         Parameters:
         -----------
-        total_amount : float
+        total_amount : Decimal
             The total amount of the contract.
-        remaining_amount : float
+        remaining_amount : Decimal
             The remaining amount to be paid.
         is_signed : bool, optional
             Indicates whether the contract is signed (default is False).
@@ -87,6 +102,8 @@ class Contract(Base):
             The user associated with the contract (default is None).
         customer : Customer, optional
             The customer associated with the contract (default is None).
+        reference : str, optional
+            The external reference of the contract (default is None).
         """
         self.total_amount = total_amount
         self.remaining_amount = remaining_amount
@@ -94,6 +111,7 @@ class Contract(Base):
         self.is_signed = is_signed
         self.user = user
         self.customer = customer
+        self.reference = reference
 
     def __str__(self):
         """
@@ -0,0 +1,44 @@
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+from models.base import Base
+
+
+class CustomerSearchGram(Base):
+    """
+    Represents an n-gram of the searchable values of a customer.
+
+    Each customer has one row per distinct n-gram of the words of their first name,
+    last name, email and company name (see utils.index_grams). The primary key
+    starts with the n-gram, so the customers holding the n-grams of a search are
+    found with index range scans. The rows are written by
+    SearchController.index_customers in the transaction that saves the customer.
+    On MySQL, the search uses the FULLTEXT index of the customers instead and the
+    table stays empty.
+
+    Attributes:
+    -----------
+    gram : str
+        The n-gram, lowercase and without accents.
+    customer_id : int
+        Foreign key referencing the customer.
+    """
+
+    __tablename__ = "customer_search_grams"
+
+    gram: Mapped[str] = mapped_column(String(3), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(
+        ForeignKey("customers.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+    def __str__(self):
+        """
+        Returns a string representation of the n-gram.
+
+        Returns:
+        --------
+        str
+            A string containing the n-gram and its customer.
+        """
+        return f"Customer ID: {self.customer_id}, Gram: {self.gram!r}"
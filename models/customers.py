@@ -8,6 +8,7 @@ from sqlalchemy import (
     ForeignKey,
     UUID,
     DateTime,
+    Index,
 )
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -47,11 +48,22 @@ class Customer(Base):
     """
 
     __tablename__ = "customers"
+    __table_args__ = (
+        # Only created on MySQL, other databases use CustomerSearchGram
+        Index(
+            "ix_customers_search",
+            "first_name",
+            "last_name",
+            "email",
+            "compagny_name",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
     # Relation with User:
-    sales_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    sales_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     user: Mapped["User"] = relationship(back_populates="customers")
 
     # Relation with Contract
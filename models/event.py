@@ -1,5 +1,13 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Column, Integer, String, ForeignKey, UUID, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    UUID,
+    DateTime,
+    Index,
+)
 
 from models.base import Base
 
@@ -37,6 +45,13 @@ class Event(Base):
     """
 
     __tablename__ = "events"
+    __table_args__ = (
+        # Events of a support, or without support, and the bookings of a support
+        # overlapping a period
+        Index(
+            "ix_events_support_period", "support_id", "start_date", "end_date"
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     # Relation with Users:
     support_id: Mapped[int] = mapped_column(
@@ -0,0 +1,2 @@
+from .operations import Operations
+from .engine import MigrationEngine, Migration
@@ -0,0 +1,66 @@
+"""
+Command line interface of the schema migrations.
+
+Usage:
+    python -m models.migrations upgrade [target]
+    python -m models.migrations downgrade <target>
+    python -m models.migrations current
+    python -m models.migrations history
+"""
+
+import argparse
+from sqlalchemy import create_engine
+import database
+from models.migrations import MigrationEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m models.migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser(
+        "upgrade", help="apply the pending migrations"
+    )
+    upgrade_parser.add_argument(
+        "target", type=int, nargs="?", help="version to upgrade to"
+    )
+    downgrade_parser = subparsers.add_parser(
+        "downgrade", help="revert migrations"
+    )
+    downgrade_parser.add_argument(
+        "target", type=int, help="version to downgrade to (0 for none)"
+    )
+    subparsers.add_parser("current", help="show the database version")
+    subparsers.add_parser("history", help="list the known migrations")
+    args = parser.parse_args()
+
+    if not database.database_exists():
+        database.create_database()
+    engine = create_engine(database.DATABASE_URL)
+    migration_engine = MigrationEngine(engine)
+    try:
+        if args.command == "upgrade":
+            applied = migration_engine.upgrade(args.target)
+            for migration in applied:
+                print(f"upgraded  {migration}")
+            print(f"database at version {migration_engine.current_version()}")
+        elif args.command == "downgrade":
+            reverted = migration_engine.downgrade(args.target)
+            for migration in reverted:
+                print(f"reverted  {migration}")
+            print(f"database at version {migration_engine.current_version()}")
+        elif args.command == "current":
+            print(
+                f"database at version {migration_engine.current_version()}, "
+                f"head is {migration_engine.head()}"
+            )
+        else:
+            current = migration_engine.current_version()
+            for migration in migration_engine.migrations:
+                state = "applied" if migration.version <= current else "pending"
+                print(f"{state:>8}  {migration}")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import importlib
+import logging
+import pkgutil
+from datetime import datetime
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    func,
+    insert,
+    select,
+)
+from models.migrations import versions
+from models.migrations.operations import Operations
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration:
+    """
+    Represents one versioned schema change.
+
+    Attributes:
+        version (int): The version number, migrations run in increasing order.
+        name (str): A short description of the change.
+        module: The module defining upgrade(op) and downgrade(op).
+    """
+
+    def __init__(self, module):
+        """
+        Initializes the Migration from its module.
+
+        Args:
+            module: A module of the models.migrations.versions package.
+        """
+        self.module = module
+        self.version = module.version
+        self.name = module.name
+
+    def upgrade(self, op):
+        """
+        Applies the change.
+        """
+        self.module.upgrade(op)
+
+    def downgrade(self, op):
+        """
+        Reverts the change.
+        """
+        self.module.downgrade(op)
+
+    def __str__(self):
+        return f"{self.version:04d} {self.name}"
+
+
+class MigrationEngine:
+    """
+    The MigrationEngine class applies the versioned migrations to a database.
+
+    The migrations are the modules of the models.migrations.versions package.
+    The applied versions are recorded in the schema_migrations table. Each
+    migration runs in its own transaction together with its version row.
+
+    Attributes:
+        engine: The engine of the migrated database.
+        migrations (list[Migration]): The known migrations, sorted by version.
+
+    Methods:
+        head(self):
+            Returns the latest known version.
+
+        current_version(self):
+            Returns the version the database is at.
+
+        pending(self, target=None):
+            Returns the migrations that upgrade would apply.
+
+        upgrade(self, target=None):
+            Upgrades the database to the target version.
+
+        downgrade(self, target):
+            Downgrades the database to the target version.
+    """
+
+    def __init__(self, engine, migrations=None):
+        """
+        Initializes the MigrationEngine with the given parameters.
+
+        Args:
+            engine: The engine of the migrated database.
+            migrations (list[Migration]): The migrations to use (default is the
+                modules of the models.migrations.versions package).
+        """
+        self.engine = engine
+        self.migrations = sorted(
+            migrations if migrations is not None else load_migrations(),
+            key=lambda migration: migration.version,
+        )
+
+    def head(self):
+        """
+        Returns the latest known version.
+
+        Returns:
+            int: The version of the last migration, 0 if there is none.
+        """
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self):
+        """
+        Returns the version the database is at.
+
+        Returns:
+            int: The highest applied version, 0 for an unversioned database.
+        """
+        with self.engine.begin() as connection:
+            VERSION_TABLE.create(connection, checkfirst=True)
+            return connection.execute(
+                select(func.coalesce(func.max(VERSION_TABLE.c.version), 0))
+            ).scalar()
+
+    def pending(self, target=None):
+        """
+        Returns the migrations that upgrade would apply.
+
+        Args:
+            target (int): The version to upgrade to (default is the head).
+
+        Returns:
+            list[Migration]: The migrations to apply, in order.
+        """
+        target = self.head() if target is None else target
+        current = self.current_version()
+        return [
+            migration
+            for migration in self.migrations
+            if current < migration.version <= target
+        ]
+
+    def upgrade(self, target=None):
+        """
+        Upgrades the database to the target version.
+
+        Args:
+            target (int): The version to upgrade to (default is the head).
+
+        Returns:
+            list[Migration]: The migrations applied.
+        """
+        applied = []
+        for migration in self.pending(target):
+            with self.engine.begin() as connection:
+                logger.info("Upgrade schema to " + str(migration))
+                migration.upgrade(Operations(connection))
+                connection.execute(
+                    insert(VERSION_TABLE).values(
+                        version=migration.version,
+                        name=migration.name,
+                        applied_at=datetime.now(),
+                    )
+                )
+            applied.append(migration)
+        return applied
+
+    def downgrade(self, target):
+        """
+        Downgrades the database to the target version.
+
+        Args:
+            target (int): The version to downgrade to, 0 removes every migration.
+
+        Returns:
+            list[Migration]: The migrations reverted.
+        """
+        current = self.current_version()
+        reverted = []
+        for migration in reversed(self.migrations):
+            if not target < migration.version <= current:
+                continue
+            with self.engine.begin() as connection:
+                logger.info("Downgrade schema from " + str(migration))
+                migration.downgrade(Operations(connection))
+                connection.execute(
+                    delete(VERSION_TABLE).where(
+                        VERSION_TABLE.c.version == migration.version
+                    )
+                )
+            reverted.append(migration)
+        return reverted
+
+
+def load_migrations():
+    """
+    Loads the migrations of the models.migrations.versions package.
+
+    Returns:
+        list[Migration]: The migrations, in no particular order.
+    """
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(
+            f"{versions.__name__}.{module_info.name}"
+        )
+        migrations.append(Migration(module))
+    return migrations
@@ -0,0 +1,262 @@
+import logging
+from sqlalchemy import Index, MetaData, Table, inspect, text
+from sqlalchemy.schema import CreateColumn
+
+logger = logging.getLogger(__name__)
+
+
+class Operations:
+    """
+    The Operations class provides the schema changes available to a migration.
+
+    Every operation is idempotent (creating something that exists or dropping
+    something that does not is a no-op), so databases created before the
+    migrations existed can be brought under version control.
+
+    Attributes:
+        connection: The connection the migration runs on.
+        dialect_name: The name of the database dialect ("mysql", "sqlite"...).
+
+    Methods:
+        create_table(self, name, *columns, **kwargs):
+            Creates a table.
+
+        drop_table(self, name):
+            Drops a table.
+
+        create_index(self, name, table_name, columns, unique=False, online=True):
+            Creates an index, without locking the table on MySQL when online is True.
+
+        drop_index(self, name, table_name, online=True):
+            Drops an index.
+
+        add_column(self, table_name, column):
+            Adds a column to a table.
+
+        drop_column(self, table_name, column_name):
+            Drops a column from a table.
+
+        alter_column_type(self, table_name, column_name, type_, nullable=True):
+            Changes the type of a column.
+
+        execute(self, statement, parameters=None):
+            Executes a SQL statement.
+    """
+
+    def __init__(self, connection):
+        """
+        Initializes the Operations with the given connection.
+
+        Args:
+            connection: The connection the migration runs on.
+        """
+        self.connection = connection
+        self.dialect_name = connection.dialect.name
+        self.metadata = MetaData()
+
+    @property
+    def is_mysql(self):
+        """
+        bool: True if the migration runs on MySQL.
+        """
+        return self.dialect_name == "mysql"
+
+    def has_table(self, name):
+        """
+        Checks if a table exists.
+
+        Returns:
+            bool: True if the table exists.
+        """
+        return inspect(self.connection).has_table(name)
+
+    def has_index(self, name, table_name):
+        """
+        Checks if an index exists on a table.
+
+        Returns:
+            bool: True if the index exists.
+        """
+        if not self.has_table(table_name):
+            return False
+        indexes = inspect(self.connection).get_indexes(table_name)
+        return any(index["name"] == name for index in indexes)
+
+    def has_column(self, table_name, column_name):
+        """
+        Checks if a column exists in a table.
+
+        Returns:
+            bool: True if the column exists.
+        """
+        if not self.has_table(table_name):
+            return False
+        columns = inspect(self.connection).get_columns(table_name)
+        return any(column["name"] == column_name for column in columns)
+
+    def create_table(self, name, *columns, **kwargs):
+        """
+        Creates a table, with the indexes declared on its columns.
+
+        Args:
+            name (str): The name of the table.
+            *columns: The columns and constraints of the table.
+            **kwargs: Extra arguments passed to sqlalchemy.Table.
+
+        Returns:
+            Table: The table definition.
+        """
+        for column in columns:
+            for foreign_key in getattr(column, "foreign_keys", ()):
+                self._load_table(foreign_key.target_fullname.split(".")[0])
+        if name in self.metadata.tables:
+            self.metadata.remove(self.metadata.tables[name])
+        table = Table(name, self.metadata, *columns, **kwargs)
+        table.create(self.connection, checkfirst=True)
+        return table
+
+    def drop_table(self, name):
+        """
+        Drops a table.
+
+        Args:
+            name (str): The name of the table.
+        """
+        if self.has_table(name):
+            self.execute(f"DROP TABLE {self._quote(name)}")
+
+    def create_index(
+        self, name, table_name, columns, unique=False, online=True
+    ):
+        """
+        Creates an index.
+
+        On MySQL the index is built with ALGORITHM=INPLACE and LOCK=NONE when online
+        is True, so reads and writes on the table go on while the index is built.
+
+        Args:
+            name (str): The name of the index.
+            table_name (str): The name of the indexed table.
+            columns (list[str]): The indexed columns, in order.
+            unique (bool): Create a unique index (default is False).
+            online (bool): Build the index without locking the table (default is True).
+        """
+        if self.has_index(name, table_name):
+            return
+        if self.is_mysql:
+            column_list = ", ".join(self._quote(column) for column in columns)
+            statement = (
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX {self._quote(name)} "
+                f"ON {self._quote(table_name)} ({column_list})"
+            )
+            if online:
+                statement += " ALGORITHM=INPLACE LOCK=NONE"
+            self.execute(statement)
+            return
+        table = self._load_table(table_name)
+        Index(
+            name, *[table.c[column] for column in columns], unique=unique
+        ).create(self.connection)
+
+    def drop_index(self, name, table_name, online=True):
+        """
+        Drops an index.
+
+        Args:
+            name (str): The name of the index.
+            table_name (str): The name of the indexed table.
+            online (bool): Drop the index without locking the table on MySQL (default is True).
+        """
+        if not self.has_index(name, table_name):
+            return
+        if self.is_mysql:
+            statement = (
+                f"DROP INDEX {self._quote(name)} ON {self._quote(table_name)}"
+            )
+            if online:
+                statement += " ALGORITHM=INPLACE LOCK=NONE"
+            self.execute(statement)
+            return
+        self.execute(f"DROP INDEX {self._quote(name)}")
+
+    def add_column(self, table_name, column):
+        """
+        Adds a column to a table.
+
+        Args:
+            table_name (str): The name of the table.
+            column (Column): The column to add.
+        """
+        if self.has_column(table_name, column.name):
+            return
+        Table(table_name, MetaData(), column)
+        ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+        self.execute(f"ALTER TABLE {self._quote(table_name)} ADD COLUMN {ddl}")
+
+    def drop_column(self, table_name, column_name):
+        """
+        Drops a column from a table.
+
+        Args:
+            table_name (str): The name of the table.
+            column_name (str): The name of the column.
+        """
+        if not self.has_column(table_name, column_name):
+            return
+        self.execute(
+            f"ALTER TABLE {self._quote(table_name)} "
+            f"DROP COLUMN {self._quote(column_name)}"
+        )
+
+    def alter_column_type(self, table_name, column_name, type_, nullable=True):
+        """
+        Changes the type of a column.
+
+        SQLite cannot alter a column type and stores values by type affinity, so the
+        change is only applied on MySQL.
+
+        Args:
+            table_name (str): The name of the table.
+            column_name (str): The name of the column.
+            type_: The new SQLAlchemy type of the column.
+            nullable (bool): Whether the column accepts NULL (default is True).
+        """
+        if not self.is_mysql:
+            logger.info(
+                "alter_column_type skipped on "
+                + self.dialect_name
+                + " for "
+                + table_name
+                + "."
+                + column_name
+            )
+            return
+        type_ddl = type_.compile(dialect=self.connection.dialect)
+        self.execute(
+            f"ALTER TABLE {self._quote(table_name)} MODIFY COLUMN "
+            f"{self._quote(column_name)} {type_ddl}"
+            f"{'' if nullable else ' NOT NULL'}"
+        )
+
+    def execute(self, statement, parameters=None):
+        """
+        Executes a SQL statement.
+
+        Args:
+            statement: The SQL statement, as a string or a SQLAlchemy construct.
+            parameters (dict): The bound parameters (default is None).
+
+        Returns:
+            The result of the statement.
+        """
+        if isinstance(statement, str):
+            statement = text(statement)
+        return self.connection.execute(statement, parameters or {})
+
+    def _load_table(self, name):
+        if name not in self.metadata.tables:
+            Table(name, self.metadata, autoload_with=self.connection)
+        return self.metadata.tables[name]
+
+    def _quote(self, name):
+        return self.connection.dialect.identifier_preparer.quote(name)
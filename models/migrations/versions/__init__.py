@@ -0,0 +1,9 @@
+"""
+Versioned schema migrations.
+
+Each module defines:
+    version (int): The version number, unique and increasing.
+    name (str): A short description of the change.
+    upgrade(op): Applies the change with a models.migrations.Operations.
+    downgrade(op): Reverts the change.
+"""
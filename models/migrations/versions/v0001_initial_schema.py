@@ -0,0 +1,97 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+)
+
+version = 1
+name = "initial schema"
+
+
+def upgrade(op):
+    """
+    Creates the tables of the application.
+
+    Databases created by Base.metadata.create_all before the migrations existed
+    already have these tables; they are left untouched and only get versioned.
+    """
+    op.create_table(
+        "roles",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("name", String(50), nullable=False, unique=True),
+    )
+    op.create_table(
+        "users",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("username", String(50), nullable=False, unique=True),
+        Column("password", String(60), nullable=False),
+        Column("full_name", String(100), nullable=False),
+        Column("email", String(60), nullable=False, unique=True),
+        Column("phone_number", String(20), nullable=False),
+        Column("role_id", Integer, ForeignKey("roles.id"), nullable=False),
+    )
+    op.create_table(
+        "customers",
+        Column("id", Integer, primary_key=True),
+        Column("sales_id", Integer, ForeignKey("users.id"), nullable=False),
+        Column("first_name", String(50), nullable=False),
+        Column("last_name", String(50), nullable=False),
+        Column("email", String(50), unique=True, index=True),
+        Column("phone_number", String(20), index=True),
+        Column("compagny_name", String(100), index=True),
+        Column("creation_date", DateTime),
+        Column("last_contact_date", DateTime),
+    )
+    op.create_table(
+        "contracts",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("manager_id", Integer, ForeignKey("users.id"), nullable=False),
+        Column("customer_id", Integer, ForeignKey("customers.id"), nullable=False),
+        Column("total_amount", Float, nullable=False),
+        Column("remaining_amount", Float, nullable=False),
+        Column("creation_date", DateTime, nullable=False),
+        Column("is_signed", Boolean, nullable=False),
+    )
+    op.create_table(
+        "events",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("support_id", Integer, ForeignKey("users.id"), nullable=True),
+        Column(
+            "contract_id",
+            Integer,
+            ForeignKey("contracts.id"),
+            nullable=False,
+            unique=True,
+        ),
+        Column("event_name", String(50), unique=True, index=True),
+        Column("customer_name", String(50), unique=True, index=True),
+        Column("start_date", DateTime, index=True),
+        Column("end_date", DateTime, index=True),
+        Column("location", String(50), index=True),
+        Column("nb_attendees", Integer),
+        Column("notes", String(200)),
+    )
+    op.create_table(
+        "app_metadata",
+        Column("name", String(50), primary_key=True),
+        Column("value", String(255), nullable=False),
+    )
+
+
+def downgrade(op):
+    """
+    Drops the tables of the application.
+    """
+    for table_name in (
+        "app_metadata",
+        "events",
+        "contracts",
+        "customers",
+        "users",
+        "roles",
+    ):
+        op.drop_table(table_name)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String
+
+version = 2
+name = "contract reference"
+
+
+def upgrade(op):
+    """
+    Adds the external reference of the contracts, used by the bulk contract import
+    to find the contracts of a file that were already loaded.
+    """
+    op.add_column("contracts", Column("reference", String(50), nullable=True))
+    op.create_index(
+        "ix_contracts_reference", "contracts", ["reference"], unique=True
+    )
+
+
+def downgrade(op):
+    """
+    Drops the external reference of the contracts.
+    """
+    op.drop_index("ix_contracts_reference", "contracts")
+    op.drop_column("contracts", "reference")
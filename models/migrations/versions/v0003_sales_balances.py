@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer
+
+version = 3
+name = "sales balances"
+
+BACKFILL = """
+INSERT INTO sales_balances
+    (manager_id, signed_count, unsigned_count, total_amount, remaining_amount)
+SELECT
+    manager_id,
+    SUM(CASE WHEN is_signed THEN 1 ELSE 0 END),
+    SUM(CASE WHEN is_signed THEN 0 ELSE 1 END),
+    SUM(total_amount),
+    SUM(remaining_amount)
+FROM contracts
+GROUP BY manager_id
+"""
+
+
+def upgrade(op):
+    """
+    Creates the running totals of the contracts of each user and fills them from
+    the existing contracts.
+
+    The totals are only filled when the table is empty, so running the migration on a
+    database where the application already maintains them changes nothing.
+    """
+    op.create_table(
+        "sales_balances",
+        Column(
+            "manager_id",
+            Integer,
+            ForeignKey("users.id"),
+            primary_key=True,
+            autoincrement=False,
+        ),
+        Column("signed_count", Integer, nullable=False),
+        Column("unsigned_count", Integer, nullable=False),
+        Column("total_amount", Float, nullable=False),
+        Column("remaining_amount", Float, nullable=False),
+    )
+    if op.execute("SELECT 1 FROM sales_balances").first() is None:
+        op.execute(BACKFILL)
+
+
+def downgrade(op):
+    """
+    Drops the running totals of the contracts.
+    """
+    op.drop_table("sales_balances")
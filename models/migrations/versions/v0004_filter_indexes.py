@@ -0,0 +1,32 @@
+version = 4
+name = "filter indexes"
+
+INDEXES = (
+    (
+        "ix_contracts_signed_remaining",
+        "contracts",
+        ["is_signed", "remaining_amount"],
+    ),
+    ("ix_contracts_remaining", "contracts", ["remaining_amount"]),
+    ("ix_contracts_manager_signed", "contracts", ["manager_id", "is_signed"]),
+    ("ix_events_support_start", "events", ["support_id", "start_date"]),
+    ("ix_customers_sales_id", "customers", ["sales_id"]),
+)
+
+
+def upgrade(op):
+    """
+    Creates the indexes of the filters used by the listings: contracts not signed or
+    not fully paid, contracts of a manager, events of a support and customers of a
+    sales contact. The indexes are built online on MySQL.
+    """
+    for index_name, table_name, columns in INDEXES:
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade(op):
+    """
+    Drops the indexes of the filters used by the listings.
+    """
+    for index_name, table_name, _ in reversed(INDEXES):
+        op.drop_index(index_name, table_name)
@@ -0,0 +1,34 @@
+from sqlalchemy import Float, Numeric
+import constantes
+
+version = 5
+name = "money columns"
+
+MONEY_COLUMNS = (
+    ("contracts", "total_amount"),
+    ("contracts", "remaining_amount"),
+    ("sales_balances", "total_amount"),
+    ("sales_balances", "remaining_amount"),
+)
+
+
+def upgrade(op):
+    """
+    Stores the amounts as fixed-point decimals, so sums are computed exactly by the
+    database. The existing amounts are rounded to the cent by MySQL.
+    """
+    for table_name, column_name in MONEY_COLUMNS:
+        op.alter_column_type(
+            table_name,
+            column_name,
+            Numeric(constantes.MONEY_PRECISION, constantes.MONEY_SCALE),
+            nullable=False,
+        )
+
+
+def downgrade(op):
+    """
+    Stores the amounts as floating point numbers again.
+    """
+    for table_name, column_name in MONEY_COLUMNS:
+        op.alter_column_type(table_name, column_name, Float, nullable=False)
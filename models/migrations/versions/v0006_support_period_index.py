@@ -0,0 +1,26 @@
+version = 6
+name = "support period index"
+
+
+def upgrade(op):
+    """
+    Replaces the (support_id, start_date) index of the events by a
+    (support_id, start_date, end_date) index, which also answers the search of the
+    events of a support overlapping a period without reading the table.
+    """
+    op.create_index(
+        "ix_events_support_period",
+        "events",
+        ["support_id", "start_date", "end_date"],
+    )
+    op.drop_index("ix_events_support_start", "events")
+
+
+def downgrade(op):
+    """
+    Restores the (support_id, start_date) index of the events.
+    """
+    op.create_index(
+        "ix_events_support_start", "events", ["support_id", "start_date"]
+    )
+    op.drop_index("ix_events_support_period", "events")
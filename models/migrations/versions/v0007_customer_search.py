@@ -0,0 +1,94 @@
+import re
+import unicodedata
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+version = 7
+name = "customer search"
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email", "compagny_name")
+BACKFILL_BATCH_SIZE = 1000
+GRAM_SIZE = 3
+WORD = re.compile(r"\w+")
+
+
+def index_grams(*values):
+    """
+    Returns the n-grams a customer is indexed under.
+
+    A copy of utils.index_grams as it was when the migration was written, so the
+    migration does not change with the application code.
+    """
+    grams = set()
+    for value in values:
+        if not value:
+            continue
+        decomposed = unicodedata.normalize("NFKD", value)
+        stripped = "".join(
+            char for char in decomposed if not unicodedata.combining(char)
+        )
+        for word in WORD.findall(stripped.casefold()):
+            padded = f" {word} "
+            grams.update(
+                padded[i : i + GRAM_SIZE]
+                for i in range(len(padded) - GRAM_SIZE + 1)
+            )
+    return grams
+
+
+def upgrade(op):
+    """
+    Creates the search index of the customers.
+
+    MySQL gets a FULLTEXT index on the searched columns. Other databases get the
+    n-gram table, filled from the existing customers, a batch at a time, when it
+    is empty.
+    """
+    op.create_table(
+        "customer_search_grams",
+        Column("gram", String(3), primary_key=True),
+        Column(
+            "customer_id",
+            Integer,
+            ForeignKey("customers.id", ondelete="CASCADE"),
+            primary_key=True,
+            index=True,
+        ),
+    )
+    if op.is_mysql:
+        if not op.has_index("ix_customers_search", "customers"):
+            op.execute(
+                "CREATE FULLTEXT INDEX ix_customers_search ON customers "
+                f"({', '.join(SEARCH_COLUMNS)})"
+            )
+        return
+    if op.execute("SELECT 1 FROM customer_search_grams").first() is not None:
+        return
+    last_id = 0
+    while True:
+        customers = op.execute(
+            f"SELECT id, {', '.join(SEARCH_COLUMNS)} FROM customers "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit",
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not customers:
+            return
+        last_id = customers[-1][0]
+        rows = [
+            {"gram": gram, "customer_id": customer_id}
+            for customer_id, *values in customers
+            for gram in index_grams(*values)
+        ]
+        if rows:
+            op.execute(
+                "INSERT INTO customer_search_grams (gram, customer_id) "
+                "VALUES (:gram, :customer_id)",
+                rows,
+            )
+
+
+def downgrade(op):
+    """
+    Drops the search index of the customers.
+    """
+    op.drop_index("ix_customers_search", "customers", online=False)
+    op.drop_table("customer_search_grams")
@@ -0,0 +1,82 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from sqlalchemy import Numeric
+from sqlalchemy.types import TypeDecorator
+import constantes
+
+CENT = Decimal(1).scaleb(-constantes.MONEY_SCALE)
+
+
+def to_money(value):
+    """
+    Converts an amount to a Decimal rounded to the cent.
+
+    Strings are parsed as written, so "0.1" gives exactly Decimal("0.10").
+
+    Args:
+        value: The amount, as a Decimal, a string, an integer or a float.
+
+    Returns:
+        Decimal: The amount, with constantes.MONEY_SCALE decimal places.
+
+    Raises:
+        ValueError: If the value is not a finite number.
+    """
+    try:
+        if not isinstance(value, (Decimal, int)):
+            value = str(value).strip()
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"amount not valid : {value}")
+    if not amount.is_finite():
+        raise ValueError(f"amount not valid : {value}")
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class Money(TypeDecorator):
+    """
+    A fixed-point amount, stored as DECIMAL(MONEY_PRECISION, MONEY_SCALE).
+
+    Values are bound and returned as Decimal rounded to the cent, so sums computed
+    by the database with SUM() come out exact on MySQL. SQLite has no decimal
+    storage: amounts are stored as floating point there and rounded to the cent
+    when read back.
+    """
+
+    impl = Numeric(constantes.MONEY_PRECISION, constantes.MONEY_SCALE)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        """
+        Returns the column type used by the given dialect.
+
+        SQLite reads the values as floats, converted by process_result_value, to
+        avoid SQLAlchemy's float-to-Decimal warning.
+        """
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(
+                Numeric(
+                    constantes.MONEY_PRECISION,
+                    constantes.MONEY_SCALE,
+                    asdecimal=False,
+                )
+            )
+        return dialect.type_descriptor(self.impl)
+
+    def process_bind_param(self, value, dialect):
+        """
+        Rounds an amount to the cent before it is sent to the database.
+        """
+        if value is None:
+            return None
+        amount = to_money(value)
+        if dialect.name == "sqlite":
+            return float(amount)
+        return amount
+
+    def process_result_value(self, value, dialect):
+        """
+        Returns the amounts read from the database as Decimal rounded to the cent.
+        """
+        if value is None:
+            return None
+        return to_money(value)
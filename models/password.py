@@ -0,0 +1,116 @@
+import os
+import time
+import bcrypt
+import constantes
+
+
+def get_bcrypt_rounds():
+    """
+    Returns the bcrypt cost factor used for new password hashes.
+
+    The cost is read from the BCRYPT_ROUNDS environment variable and falls back to
+    constantes.DEFAULT_BCRYPT_ROUNDS when it is missing or out of the bcrypt range.
+
+    Returns:
+        int: The bcrypt cost factor.
+    """
+    try:
+        rounds = int(
+            os.getenv("BCRYPT_ROUNDS", constantes.DEFAULT_BCRYPT_ROUNDS)
+        )
+    except ValueError:
+        return constantes.DEFAULT_BCRYPT_ROUNDS
+    if not constantes.MIN_BCRYPT_ROUNDS <= rounds <= constantes.MAX_BCRYPT_ROUNDS:
+        return constantes.DEFAULT_BCRYPT_ROUNDS
+    return rounds
+
+
+def hash_password(password, rounds=None):
+    """
+    Hashes a password with bcrypt and a new random salt.
+
+    The salt and the cost factor are stored in the hash itself, so each hash can be
+    checked on its own whatever the current settings. This function is defined at
+    module level so that it can be sent to the worker processes of a process pool.
+
+    Args:
+        password (str): The plain text password to hash.
+        rounds (int): The bcrypt cost factor (default is get_bcrypt_rounds()).
+
+    Returns:
+        str: The bcrypt hash of the password.
+    """
+    salt = bcrypt.gensalt(rounds=rounds or get_bcrypt_rounds())
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def check_password(password, password_hash):
+    """
+    Checks a password against a bcrypt hash.
+
+    Args:
+        password (str): The plain text password.
+        password_hash (str): The stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches the hash.
+    """
+    try:
+        return bcrypt.checkpw(
+            password.encode("utf-8"), password_hash.encode("utf-8")
+        )
+    except ValueError:
+        return False
+
+
+def needs_rehash(password_hash, rounds=None):
+    """
+    Tells if a bcrypt hash should be replaced by a new one.
+
+    A hash is outdated when its cost factor differs from the configured one, or when
+    it was made with the legacy salt shared by every account (the salt environment
+    variable).
+
+    Args:
+        password_hash (str): The stored bcrypt hash.
+        rounds (int): The expected cost factor (default is get_bcrypt_rounds()).
+
+    Returns:
+        bool: True if the hash should be replaced.
+    """
+    try:
+        hash_rounds = int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    if hash_rounds != (rounds or get_bcrypt_rounds()):
+        return True
+    legacy_salt = os.getenv("salt")
+    return bool(legacy_salt) and password_hash[:29] == legacy_salt[:29]
+
+
+def calibrate_rounds(target_ms, max_rounds=constantes.MAX_BCRYPT_ROUNDS):
+    """
+    Finds the highest bcrypt cost factor whose hashing time stays under a target.
+
+    Each extra round doubles the hashing time, so the cost factors are timed from
+    the minimum upwards until one exceeds the target.
+
+    Args:
+        target_ms (float): The maximum hashing time, in milliseconds.
+        max_rounds (int): The highest cost factor tried.
+
+    Returns:
+        tuple: The chosen cost factor and the measured (cost factor, milliseconds) pairs.
+    """
+    timings = []
+    chosen = constantes.MIN_BCRYPT_ROUNDS
+    for rounds in range(constantes.MIN_BCRYPT_ROUNDS, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds=rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration password", salt)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timings.append((rounds, elapsed_ms))
+        if elapsed_ms > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
@@ -0,0 +1,54 @@
+from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from models.base import Base
+from models.money import Money
+
+
+class SalesBalance(Base):
+    """
+    Represents the running totals of the contracts managed by a user.
+
+    The rows are kept up to date in the transaction that creates or updates a
+    contract, so dashboards read one row per sales contact instead of scanning the
+    contracts. BalanceController.rebuild recomputes them from the contracts.
+
+    Attributes:
+    -----------
+    manager_id : int
+        Foreign key referencing the user who manages the contracts.
+    signed_count : int
+        Number of signed contracts.
+    unsigned_count : int
+        Number of contracts not signed yet.
+    total_amount : Decimal
+        Sum of the total amounts of the contracts.
+    remaining_amount : Decimal
+        Sum of the remaining amounts of the contracts.
+    """
+
+    __tablename__ = "sales_balances"
+
+    manager_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id"), primary_key=True, autoincrement=False
+    )
+    signed_count = Column(Integer, default=0, nullable=False)
+    unsigned_count = Column(Integer, default=0, nullable=False)
+    total_amount = Column(Money, default=0, nullable=False)
+    remaining_amount = Column(Money, default=0, nullable=False)
+
+    def __str__(self):
+        """
+        Returns a string representation of the balance.
+
+        Returns:
+        --------
+        str
+            A string containing the balance details.
+        """
+        return (
+            f"User ID: {self.manager_id}, "
+            f"Signed: {self.signed_count}, "
+            f"Not Signed: {self.unsigned_count}, "
+            f"Total Amount: {self.total_amount}, "
+            f"Remaining Amount: {self.remaining_amount}"
+        )
@@ -1,6 +1,4 @@
-import os
 from typing import List
-import bcrypt
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy import (
     Column,
@@ -11,6 +9,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from models.base import Base
+from models.password import check_password, hash_password, needs_rehash
 
 
 class User(Base):
@@ -43,7 +42,6 @@ class User(Base):
         List of events managed by the user.
     """
 
-    salt = os.getenv("salt")
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -76,7 +74,6 @@ class User(Base):
         phone_number,
         role_id,
         password=None,
-        salt=salt,
     ):
         """
         Initializes a new User instance.
@@ -102,7 +99,6 @@ class User(Base):
         self.role_id = role_id
         self.email = email
         self.phone_number = phone_number
-        self.salt = os.getenv("salt")
         if password:
             self.set_password(password)
 
@@ -131,23 +127,32 @@ class User(Base):
         password : str
             The plain text password to be hashed and set for the user.
         """
-        salt = os.getenv("salt")
-        bytes = password.encode("utf-8")
-        hash_password = bcrypt.hashpw(bytes, self.salt.encode("utf-8"))
-        self.password = hash_password.decode("utf-8")
+        self.password = hash_password(password)
 
     def is_password_correct(self, input_password):
         """
         Checks if the provided password is correct for the user.
 
-        This method hashes the input password using the salt and compares it to the user's password stored in the database.
+        This method checks the input password against the user's password hash with bcrypt,
+        the salt and the cost factor being read from the hash itself.
         If the passwords match, it returns True. Otherwise, it returns False.
 
         Returns:
             is_correct: A boolean indicating whether the password is correct.
         """
-        salt = os.getenv("salt")
-        input_bytes = input_password.encode("utf-8")
-        hash_input_password = bcrypt.hashpw(input_bytes, salt.encode("utf-8"))
-        is_correct = hash_input_password == self.password.encode("utf-8")
-        return is_correct
+        return check_password(input_password, self.password)
+
+    def password_needs_rehash(self):
+        """
+        Checks if the user's password hash is outdated.
+
+        The hash is outdated when it was made with the legacy global salt or with a cost
+        factor other than the configured one. It can only be replaced at login, when the
+        plain text password is known.
+
+        Returns:
+        --------
+        bool
+            True if the password should be hashed again.
+        """
+        return needs_rehash(self.password)
@@ -1,5 +1,9 @@
 from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import constantes
 import controllers
+import models
 
 
 def new_mock_main_controller():
@@ -64,3 +68,52 @@ def new_mock_event_controller():
     )
     mock_event_controller.view = MagicMock()
     return mock_event_controller
+
+
+def new_sqlite_session():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def new_sqlite_user(session, username, role_name=constantes.ROLE_SALES):
+    # The role is created with its first user
+    role = session.query(models.Role).filter_by(name=role_name).first()
+    if role is None:
+        role = models.Role(name=role_name)
+        session.add(role)
+        session.flush()
+    user = models.User(
+        username=username,
+        full_name=username.title(),
+        email=f"{username}@example.com",
+        phone_number="+33110203040",
+        role_id=role.id,
+    )
+    user.password = "hash"
+    session.add(user)
+    session.flush()
+    return user
+
+
+def new_sqlite_customer(session, sales, email="known@customer.com"):
+    customer = models.Customer(
+        first_name="Known",
+        last_name="Customer",
+        email=email,
+        phone_number="+33110203042",
+        compagny_name="Known Company",
+        sales_id=sales.id,
+    )
+    session.add(customer)
+    session.flush()
+    return customer
+
+
+def new_sqlite_sales_session():
+    # A sales user and one of their customers
+    session = new_sqlite_session()
+    sales = new_sqlite_user(session, "sales")
+    customer = new_sqlite_customer(session, sales)
+    session.commit()
+    return session, sales, customer
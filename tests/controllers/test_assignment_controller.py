@@ -0,0 +1,134 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from sqlalchemy import select
+import controllers
+import models
+import views
+from tests.config_test import new_sqlite_sales_session, new_sqlite_user
+import constantes
+
+
+class TestAssignmentController(TestCase):
+    def setUp(self):
+        self.session, self.sales, self.customer = new_sqlite_sales_session()
+        self.busy = new_sqlite_user(
+            self.session, "busy", constantes.ROLE_SUPPORT
+        )
+        self.idle = new_sqlite_user(
+            self.session, "idle", constantes.ROLE_SUPPORT
+        )
+        # busy is booked for the first two days
+        self.new_event("Booked", datetime(2024, 1, 1), 2, self.busy)
+        self.session.commit()
+        self.view = MagicMock(spec=views.EventView)
+        self.controller = controllers.AssignmentController(
+            self.session, self.view
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def new_event(self, name, start_date, days, support=None):
+        self.session.add(
+            models.Event(
+                event_name=name,
+                customer_name=f"{name} Company",
+                customer_contact="Sales User",
+                start_date=start_date,
+                end_date=start_date + timedelta(days=days),
+                location="Paris",
+                nb_attendees=10,
+                notes="",
+                user=support,
+                contract=models.Contract(
+                    total_amount=100,
+                    remaining_amount=0,
+                    is_signed=True,
+                    user=self.sales,
+                    customer=self.customer,
+                ),
+            )
+        )
+
+    def supports_by_event(self):
+        return dict(
+            self.session.execute(
+                select(models.Event.event_name, models.User.username).join(
+                    models.User, models.Event.support_id == models.User.id
+                )
+            ).all()
+        )
+
+    def test_plan_balances_load_and_respects_overlaps(self):
+        self.new_event("Overlap", datetime(2024, 1, 2), 1)
+        self.new_event("Same day", datetime(2024, 1, 2), 1)
+        self.new_event("Later", datetime(2024, 1, 5), 1)
+        self.new_event("Much later", datetime(2024, 1, 10), 1)
+        self.session.commit()
+
+        assignments, unassigned = self.controller.plan()
+
+        # idle takes the events until both supports have 48 booked hours;
+        # nobody is free for the second event of the 2nd
+        self.assertEqual(
+            [(assignment[1], assignment[4]) for assignment in assignments],
+            [
+                ("Overlap", "idle@example.com"),
+                ("Later", "idle@example.com"),
+                ("Much later", "busy@example.com"),
+            ],
+        )
+        self.assertEqual([event[1] for event in unassigned], ["Same day"])
+
+    def test_dry_run_then_apply(self):
+        self.new_event("Free", datetime(2024, 1, 5), 1)
+        self.session.commit()
+        self.view.input_apply_assignment_plan.return_value = False
+
+        self.controller.auto_assign()
+
+        self.view.display_assignment_plan.assert_called_once()
+        self.assertNotIn("Free", self.supports_by_event())
+
+        self.view.input_apply_assignment_plan.return_value = True
+        self.controller.auto_assign()
+
+        self.view.display_assignment_applied.assert_called_once_with(1)
+        self.assertEqual(self.supports_by_event()["Free"], "idle")
+
+    def test_apply_keeps_supports_assigned_since_the_plan(self):
+        self.new_event("Free", datetime(2024, 1, 5), 1)
+        self.session.commit()
+        assignments, _ = self.controller.plan()
+        event = self.session.scalars(
+            select(models.Event).filter_by(event_name="Free")
+        ).one()
+        event.user = self.busy
+        self.session.commit()
+
+        self.assertEqual(self.controller.apply(assignments), 0)
+        self.assertEqual(self.supports_by_event()["Free"], "busy")
+
+    def test_undated_events_are_unassignable(self):
+        self.new_event("Free", datetime(2024, 1, 5), 1)
+        self.new_event("Undated", datetime(2024, 1, 6), 1)
+        self.new_event("Booked undated", datetime(2024, 1, 6), 1, self.idle)
+        self.session.flush()
+        for event in self.session.scalars(
+            select(models.Event).where(
+                models.Event.event_name.in_(["Undated", "Booked undated"])
+            )
+        ):
+            event.start_date = None
+        self.session.commit()
+
+        assignments, unassigned = self.controller.plan()
+
+        self.assertEqual(
+            [(assignment[1], assignment[4]) for assignment in assignments],
+            [("Free", "idle@example.com")],
+        )
+        self.assertEqual(
+            [event[1:3] for event in unassigned], [("Undated", None)]
+        )
@@ -0,0 +1,129 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import tempfile
+from sqlalchemy import text, update
+import controllers
+import models
+from tests.config_test import new_sqlite_sales_session
+import constantes
+
+
+class TestBalanceController(TestCase):
+    def setUp(self):
+        self.session, self.sales, self.customer = new_sqlite_sales_session()
+        self.controller = controllers.BalanceController(self.session)
+        self.contract_controller = controllers.ContractController(
+            self.session, MagicMock(), self.sales
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def balance(self):
+        balance = self.session.get(models.SalesBalance, self.sales.id)
+        self.session.refresh(balance)
+        return (
+            balance.signed_count,
+            balance.unsigned_count,
+            balance.total_amount,
+            balance.remaining_amount,
+        )
+
+    def test_create_and_update_contract(self):
+        view = self.contract_controller.view
+        view.input_new_contract.return_value = {
+            "total_amount": "1000",
+            "is_signed": False,
+        }
+        self.contract_controller.create_contract(self.customer)
+        self.assertEqual(self.balance(), (0, 1, 1000, 1000))
+
+        view.input_contract_signed.return_value = True
+        view.input_contract_remaining_amount.return_value = 400
+        self.contract_controller.update_contract(self.customer)
+
+        self.assertEqual(self.balance(), (1, 0, 1000, 400))
+
+    def test_import_contracts_updates_balances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contracts.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(",".join(constantes.CONTRACT_IMPORT_COLUMNS) + "\n")
+                file.write("REF-1,known@customer.com,1000,1000,no\n")
+                file.write("REF-2,known@customer.com,500,0,yes\n")
+            self.contract_controller.import_contracts_csv(path)
+            self.assertEqual(self.balance(), (1, 1, 1500, 1000))
+
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(",".join(constantes.CONTRACT_IMPORT_COLUMNS) + "\n")
+                file.write("REF-1,known@customer.com,1000,250,yes\n")
+                file.write("REF-2,known@customer.com,500,0,yes\n")
+            self.contract_controller.import_contracts_csv(path)
+
+        self.assertEqual(self.balance(), (2, 0, 1500, 250))
+        self.assertEqual(
+            self.controller.expected_balances(),
+            {
+                self.sales.id: {
+                    "signed_count": 2,
+                    "unsigned_count": 0,
+                    "total_amount": 1500,
+                    "remaining_amount": 250,
+                }
+            },
+        )
+
+    def test_rebuild_repairs_drift(self):
+        self.session.add(
+            models.Contract(
+                total_amount=300,
+                remaining_amount=100,
+                is_signed=True,
+                user=self.sales,
+                customer=self.customer,
+            )
+        )
+        self.session.commit()
+
+        report = self.controller.rebuild()
+
+        self.assertEqual(report, {"managers": 1, "drifted": 1})
+        self.assertEqual(self.balance(), (1, 0, 300, 100))
+
+        self.session.execute(
+            update(models.SalesBalance).values(remaining_amount=0)
+        )
+        self.session.commit()
+        self.assertEqual(self.controller.rebuild()["drifted"], 1)
+        self.assertEqual(self.controller.rebuild()["drifted"], 0)
+        self.assertEqual(self.balance(), (1, 0, 300, 100))
+
+    def test_apply_deltas_upserts(self):
+        deltas = self.controller.new_deltas()
+        deltas[self.sales.id]["unsigned_count"] = 1
+        deltas[self.sales.id]["total_amount"] = 200
+        self.controller.apply_deltas(deltas)
+        self.controller.apply_deltas(deltas)
+        self.session.commit()
+
+        self.assertEqual(self.balance(), (0, 2, 400, 0))
+        self.assertEqual(self.session.query(models.SalesBalance).count(), 1)
+
+    def test_delete_manager_with_contracts(self):
+        self.session.execute(text("PRAGMA foreign_keys=ON"))
+        self.contract_controller.view.input_new_contract.return_value = {
+            "total_amount": "1000",
+            "is_signed": False,
+        }
+        self.contract_controller.create_contract(self.customer)
+        view = MagicMock()
+        view.input_email.return_value = self.sales.email
+        user_controller = controllers.UserController(self.session, view)
+
+        user_controller.delete_user()
+
+        view.display_delete_user_validation.assert_called_once()
+        self.assertIsNone(self.session.get(models.User, self.sales.id))
+        self.assertEqual(self.session.query(models.SalesBalance).count(), 0)
+        self.assertEqual(self.session.query(models.Contract).count(), 0)
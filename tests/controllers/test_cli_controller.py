@@ -0,0 +1,323 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy import update
+import constantes
+import database
+import models
+import utils
+import views
+from controllers import CliController, UserController
+from tests.config_test import new_sqlite_session, new_sqlite_user
+
+
+class TestCliController(unittest.TestCase):
+
+    def setUp(self):
+        environ = patch.dict(
+            os.environ, {"BCRYPT_ROUNDS": "4", "secret_key": "test-secret"}
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.session = new_sqlite_session()
+        self.addCleanup(self.session.close)
+        self.session.add_all(
+            [models.Role(name=role_name) for role_name in constantes.ROLES]
+        )
+        self.session.commit()
+        database.reference_cache.attach(self.session)
+
+        self.sales = new_sqlite_user(self.session, "sales")
+        self.manager = new_sqlite_user(
+            self.session, "manager", constantes.ROLE_MANAGER
+        )
+        for index in range(4):
+            customer = models.Customer(
+                first_name="First",
+                last_name="Last",
+                email=f"customer{index}@test.com",
+                phone_number="+33110203042",
+                compagny_name=f"Company {index}",
+                sales_id=self.sales.id,
+            )
+            contract = models.Contract(
+                total_amount=100,
+                remaining_amount=50 if index % 2 else 0,
+                is_signed=index < 2,
+                user=self.sales if index < 3 else self.manager,
+                customer=customer,
+            )
+            models.Event(
+                event_name=f"Event {index}",
+                customer_name=f"Company {index}",
+                customer_contact="Sales User",
+                start_date=datetime(2024, 1, 1),
+                end_date=datetime(2024, 1, 2),
+                location="Paris",
+                nb_attendees=10,
+                notes="",
+                user=self.manager if index == 0 else None,
+                contract=contract,
+            )
+            self.session.add(customer)
+        self.session.commit()
+
+    def run_command(self, user, *argv, profiler=None):
+        token = None
+        if user is not None:
+            token = UserController(self.session, MagicMock()).generate_token(
+                user
+            )
+        self.stream = io.StringIO()
+        self.view = views.CliView(MagicMock(), stream=self.stream)
+        controller = CliController(
+            self.session, view=self.view, profiler=profiler
+        )
+        controller.user_controller.load_token = lambda: token
+        return controller.run(list(argv))
+
+    def test_list_unsigned_contracts_csv(self):
+        exit_code = self.run_command(
+            self.sales, "list", "contracts", "--unsigned", "--format", "csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        self.assertEqual(
+            [row["customer"] for row in rows], ["Company 2", "Company 3"]
+        )
+
+    def test_profile_counts_the_statements_of_the_command(self):
+        profiler = utils.QueryProfiler()
+        profiler.attach(self.session.get_bind())
+
+        self.run_command(
+            self.sales,
+            "list",
+            "contracts",
+            "--format",
+            "csv",
+            profiler=profiler,
+        )
+
+        (summary,) = profiler.summaries()
+        self.assertEqual(summary["action"], "CliController.list_contracts")
+        self.assertGreater(summary["statements"], 0)
+        self.assertIsNone(summary["repeated_statement"])
+        self.view.console.print.assert_called_once()
+
+    def test_list_mine_unpaid_contracts(self):
+        self.run_command(
+            self.sales,
+            "list",
+            "contracts",
+            "--mine",
+            "--unpaid",
+            "--format",
+            "csv",
+        )
+
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        self.assertEqual([row["customer"] for row in rows], ["Company 1"])
+
+    def test_list_events_without_support_json(self):
+        exit_code = self.run_command(
+            self.sales, "list", "events", "--no-support", "--format", "json"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        events = json.loads(self.stream.getvalue())
+        self.assertEqual(
+            [event["event_name"] for event in events],
+            ["Event 1", "Event 2", "Event 3"],
+        )
+        self.assertEqual(events[0]["sales_contact"], "Sales")
+
+    def test_export_contracts_ndjson_gzip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contracts.ndjson.gz")
+
+            exit_code = self.run_command(
+                self.manager,
+                "list",
+                "contracts",
+                "--format",
+                "ndjson",
+                "--output",
+                path,
+            )
+
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                contracts = [json.loads(line) for line in file]
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        self.assertEqual(len(contracts), 4)
+        self.assertEqual(
+            {contract["customer_email"] for contract in contracts},
+            {f"customer{index}@test.com" for index in range(4)},
+        )
+
+    def test_report_sales_csv(self):
+        exit_code = self.run_command(
+            self.manager, "report", "sales", "--format", "csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        self.assertEqual(
+            {row["sales_contact"]: row["contracts"] for row in rows},
+            {"sales": "3", "manager": "1"},
+        )
+        self.view.console.print.assert_called()
+
+    def test_list_double_bookings_csv(self):
+        self.session.execute(
+            update(models.Event)
+            .where(models.Event.event_name == "Event 1")
+            .values(support_id=self.manager.id)
+        )
+        self.session.commit()
+
+        exit_code = self.run_command(
+            self.manager, "list", "double-bookings", "--format", "csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(
+            lines[0],
+            "support,event_name,overlapping_event_name,overlap_start,"
+            "overlap_end",
+        )
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(
+            lines[1].startswith("manager@example.com,Event 0,Event 1")
+        )
+
+    def test_assign_supports_dry_run_then_apply(self):
+        support = new_sqlite_user(
+            self.session, "support", constantes.ROLE_SUPPORT
+        )
+
+        exit_code = self.run_command(
+            self.manager, "assign", "supports", "--dry-run", "--format", "csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        # The three events without support share the same day
+        self.assertEqual(
+            [row["support"] for row in rows], ["support@example.com", "", ""]
+        )
+        self.assertEqual(
+            self.session.query(models.Event)
+            .filter_by(support_id=support.id)
+            .count(),
+            0,
+        )
+
+        exit_code = self.run_command(self.manager, "assign", "supports")
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        self.assertEqual(
+            self.session.query(models.Event)
+            .filter_by(support_id=support.id)
+            .one()
+            .event_name,
+            rows[0]["event_name"],
+        )
+
+    def test_rebuild_search_index_and_search_customers(self):
+        exit_code = self.run_command(self.manager, "rebuild", "search-index")
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+
+        exit_code = self.run_command(
+            self.sales,
+            "search",
+            "customers",
+            "compan",
+            "--page-size",
+            "3",
+            "--format",
+            "csv",
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        self.assertEqual(
+            [row["email"] for row in rows],
+            [f"customer{index}@test.com" for index in range(3)],
+        )
+        self.assertEqual(rows[0]["score"], "1.0")
+
+    def test_rebuild_and_list_balances(self):
+        exit_code = self.run_command(self.manager, "rebuild", "balances")
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+
+        exit_code = self.run_command(
+            self.manager, "list", "balances", "--format", "json"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        balances = json.loads(self.stream.getvalue())
+        self.assertEqual(
+            {
+                balance["username"]: balance["signed_count"]
+                for balance in balances
+            },
+            {"sales": 2, "manager": 0},
+        )
+
+    def test_index_advisor_finds_no_full_scan(self):
+        exit_code = self.run_command(
+            self.manager, "index-advisor", "--strict", "--format", "csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        self.assertIn("events mine", {row["query"] for row in rows})
+        self.assertEqual([row for row in rows if row["full_scans"]], [])
+
+    def test_list_customers_table(self):
+        exit_code = self.run_command(self.sales, "list", "customers", "--mine")
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        self.assertIn("customer3@test.com", self.stream.getvalue())
+
+    def test_list_users_forbidden_for_sales(self):
+        exit_code = self.run_command(self.sales, "list", "users")
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_FORBIDDEN)
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_import_contracts_forbidden_for_sales(self):
+        exit_code = self.run_command(
+            self.sales, "import", "contracts", "contracts.csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_FORBIDDEN)
+
+    def test_list_users_as_manager(self):
+        exit_code = self.run_command(
+            self.manager, "list", "users", "--format", "csv"
+        )
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream.getvalue())))
+        self.assertEqual(
+            {row["username"]: row["role"] for row in rows},
+            {
+                "sales": constantes.ROLE_SALES,
+                "manager": constantes.ROLE_MANAGER,
+            },
+        )
+
+    def test_not_logged_in(self):
+        exit_code = self.run_command(None, "list", "contracts")
+
+        self.assertEqual(exit_code, constantes.CLI_EXIT_NOT_LOGGED_IN)
@@ -1,9 +1,17 @@
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
+import csv
 import os
+import tempfile
 import bcrypt
+from sqlalchemy import event, text
+import controllers
 import models
-from tests.config_test import new_mock_contract_controller
+from tests.config_test import (
+    new_mock_contract_controller,
+    new_sqlite_sales_session,
+    new_sqlite_user,
+)
 import constantes
 import validators
 from datetime import datetime
@@ -154,3 +162,159 @@ class UserContract(TestCase):
             constantes.CONTRACT_CONTROLLER_CONTRACT_SIGNED_PAID
         )
         self.controller.session.commit.assert_not_called()
+
+
+class TestContractControllerImport(TestCase):
+    def setUp(self):
+        self.session, self.sales, self.customer = new_sqlite_sales_session()
+        self.other_sales = new_sqlite_user(self.session, "other")
+        self.session.commit()
+        self.controller = controllers.ContractController(
+            self.session, MagicMock(), self.sales
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "contracts.csv")
+
+    def tearDown(self):
+        self.session.close()
+        self.directory.cleanup()
+
+    def write_csv(self, lines):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(
+                ",".join(
+                    constantes.CONTRACT_IMPORT_COLUMNS
+                    + (constantes.CONTRACT_IMPORT_SALES_COLUMN,)
+                )
+                + "\n"
+            )
+            file.write("\n".join(lines) + "\n")
+
+    def test_import_contracts_csv(self):
+        self.write_csv(
+            [
+                f"REF-{i},known@customer.com,1000,{i * 100},yes,"
+                for i in range(5)
+            ]
+            + [
+                "REF-OTHER,known@customer.com,500,0,no,other",
+                "REF-BAD,known@customer.com,abc,0,yes,",
+                "REF-NEG,known@customer.com,100,200,yes,",
+                "REF-SIGN,known@customer.com,100,0,maybe,",
+                ",known@customer.com,100,0,yes,",
+                "REF-0,known@customer.com,100,0,yes,",
+                "REF-GHOST,ghost@customer.com,100,0,yes,",
+                "REF-NOSALES,known@customer.com,100,0,yes,ghost",
+            ]
+        )
+        statements = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(
+                statement
+            ),
+        )
+
+        report = self.controller.import_contracts_csv(self.path, batch_size=5)
+
+        self.assertEqual(report["read"], 13)
+        self.assertEqual(report["created"], 6)
+        self.assertEqual(report["updated"], 0)
+        self.assertEqual(report["rejected"], 7)
+        existing_checks = [
+            statement
+            for statement in statements
+            if statement.startswith("SELECT contracts.id")
+        ]
+        self.assertEqual(len(existing_checks), 3)
+        other = (
+            self.session.query(models.Contract)
+            .filter_by(reference="REF-OTHER")
+            .one()
+        )
+        self.assertEqual(other.manager_id, self.other_sales.id)
+        self.assertFalse(other.is_signed)
+        self.assertEqual(other.customer_id, self.customer.id)
+
+        with open(report["reject_path"], encoding="utf-8") as file:
+            rejects = list(csv.DictReader(file))
+        self.assertEqual(
+            [(reject["line"], reject["error"]) for reject in rejects],
+            [
+                ("8", "amount not valid"),
+                ("9", "amount not valid"),
+                ("10", "is_signed not valid"),
+                ("11", "reference is required"),
+                ("12", "reference duplicated in the file"),
+                ("13", "unknown customer"),
+                ("14", "unknown sales contact"),
+            ],
+        )
+
+    def test_import_again_updates_changed_contracts(self):
+        self.write_csv(
+            [
+                f"REF-{i},known@customer.com,1000,1000,no,"
+                for i in range(3)
+            ]
+        )
+        self.controller.import_contracts_csv(self.path)
+        self.write_csv(
+            [
+                "REF-0,known@customer.com,1000,1000,no,",
+                "REF-1,known@customer.com,1000,0,yes,",
+                "REF-2,known@customer.com,1000,1000,no,other",
+            ]
+        )
+
+        report = self.controller.import_contracts_csv(self.path)
+
+        self.assertEqual(report["created"], 0)
+        self.assertEqual(report["updated"], 2)
+        self.assertEqual(report["unchanged"], 1)
+        self.assertEqual(self.session.query(models.Contract).count(), 3)
+        paid = (
+            self.session.query(models.Contract)
+            .filter_by(reference="REF-1")
+            .one()
+        )
+        self.session.refresh(paid)
+        self.assertEqual(paid.remaining_amount, 0)
+        self.assertTrue(paid.is_signed)
+
+    def test_failed_batch_only_rejects_the_failing_line(self):
+        self.session.execute(
+            text(
+                "CREATE TRIGGER reject_contract BEFORE INSERT ON contracts "
+                "WHEN NEW.reference = 'REF-DB' "
+                "BEGIN SELECT RAISE(ABORT, 'contract refused'); END"
+            )
+        )
+        self.session.commit()
+        self.write_csv(
+            [
+                "REF-1,known@customer.com,1000,0,yes,",
+                "REF-DB,known@customer.com,1000,0,yes,",
+                "REF-2,known@customer.com,1000,0,yes,",
+            ]
+        )
+
+        report = self.controller.import_contracts_csv(self.path)
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["rejected"], 1)
+        with open(report["reject_path"], encoding="utf-8") as file:
+            rejects = list(csv.DictReader(file))
+        self.assertEqual(
+            [(reject["reference"], reject["error"]) for reject in rejects],
+            [("REF-DB", "contract refused")],
+        )
+        balance = self.session.get(models.SalesBalance, self.sales.id)
+        self.assertEqual(balance.signed_count, 2)
+
+    def test_import_missing_column(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("reference,total_amount\n")
+        with self.assertRaises(ValueError):
+            self.controller.import_contracts_csv(self.path)
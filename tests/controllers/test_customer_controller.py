@@ -1,9 +1,17 @@
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
+import csv
 import os
+import tempfile
 import bcrypt
+from sqlalchemy import event
+import controllers
 import models
-from tests.config_test import new_mock_customer_controller
+from tests.config_test import (
+    new_mock_customer_controller,
+    new_sqlite_sales_session,
+    new_sqlite_user,
+)
 import constantes
 import validators
 
@@ -64,7 +72,9 @@ class CustomerController(TestCase):
             self.controller, "set_new_customer_email"
         ) as mock_set_email, patch.object(
             self.controller, "set_customer_phone"
-        ) as mock_set_phone:
+        ) as mock_set_phone, patch.object(
+            self.controller, "search_controller"
+        ):
 
             mock_set_email.return_value = "updated@customer.com"
             mock_set_phone.return_value = "+33110203041"
@@ -133,7 +143,12 @@ class CustomerController(TestCase):
                 sales_id=self.controller.user.id,
             ),
         ]
-        self.controller.session.query().all.return_value = mock_customers
+        self.controller.session.query().options().order_by().limit().all.return_value = (
+            mock_customers
+        )
+        self.controller.view.input_page_navigation.return_value = (
+            constantes.PAGE_QUIT
+        )
         with patch.object(
             self.controller.view, "display_customer_not_found"
         ) as mock_display_not_found, patch.object(
@@ -143,5 +158,140 @@ class CustomerController(TestCase):
             self.controller.list_customers()
 
             # Vérifier que les méthodes d'affichage sont appelées correctement
-            mock_display_info.assert_called_once_with(mock_customers)
+            mock_display_info.assert_called_once_with(
+                mock_customers, wait=False
+            )
             mock_display_not_found.assert_not_called()
+
+
+class TestCustomerControllerImport(TestCase):
+    def setUp(self):
+        self.session, self.sales, _ = new_sqlite_sales_session()
+        self.other_sales = new_sqlite_user(self.session, "other")
+        self.session.commit()
+        self.controller = controllers.CustomerController(
+            self.session, MagicMock(), self.sales
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "customers.csv")
+
+    def tearDown(self):
+        self.session.close()
+        self.directory.cleanup()
+
+    def write_csv(self, lines):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(
+                ",".join(
+                    constantes.CUSTOMER_IMPORT_COLUMNS
+                    + (constantes.CUSTOMER_IMPORT_SALES_COLUMN,)
+                )
+                + "\n"
+            )
+            file.write("\n".join(lines) + "\n")
+
+    def test_import_customers_csv(self):
+        self.write_csv(
+            [
+                f"First{i},Last{i},c{i}@customer.com,+3311020304{i},Company {i},"
+                for i in range(5)
+            ]
+            + [
+                "Other,Sales,o@customer.com,+33110203040,Other Co,other",
+                "Bad,Email,not-an-email,+33110203040,Bad Co,",
+                "Bad,Phone,phone@customer.com,0102,Bad Co,",
+                ",Missing,missing@customer.com,+33110203040,Bad Co,",
+                "Dup,Email,c0@customer.com,+33110203040,Dup Co,",
+                "Known,Again,known@customer.com,+33110203040,Known Co,",
+                "No,Sales,nosales@customer.com,+33110203040,No Co,ghost",
+            ]
+        )
+        statements = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(
+                statement
+            ),
+        )
+
+        report = self.controller.import_customers_csv(self.path, batch_size=4)
+
+        self.assertEqual(report["read"], 12)
+        self.assertEqual(report["created"], 6)
+        self.assertEqual(report["rejected"], 6)
+        duplicate_checks = [
+            statement
+            for statement in statements
+            if statement.startswith("SELECT customers.email")
+        ]
+        self.assertEqual(len(duplicate_checks), 3)
+        other = (
+            self.session.query(models.Customer)
+            .filter_by(email="o@customer.com")
+            .one()
+        )
+        self.assertEqual(other.sales_id, self.other_sales.id)
+        self.assertEqual(
+            self.session.query(models.Customer)
+            .filter_by(sales_id=self.sales.id)
+            .count(),
+            6,
+        )
+
+        with open(report["reject_path"], encoding="utf-8") as file:
+            rejects = list(csv.DictReader(file))
+        self.assertEqual(
+            [(reject["line"], reject["error"]) for reject in rejects],
+            [
+                ("8", "email not valid"),
+                ("9", "Phone number not valid"),
+                ("10", "first_name is required"),
+                ("11", "email duplicated in the file"),
+                ("12", "customer already exists"),
+                ("13", "unknown sales contact"),
+            ],
+        )
+
+    def test_failed_batch_only_rejects_the_failing_line(self):
+        # known@customer.com is inserted after the existing emails were checked
+        self.write_csv(
+            [
+                "New,Customer,new@customer.com,+33110203040,New Co,",
+                "Known,Again,known@customer.com,+33110203040,Known Co,",
+                "Other,Customer,other@customer.com,+33110203040,Other Co,",
+            ]
+        )
+
+        with patch.object(
+            self.controller,
+            "remove_existing_customers",
+            side_effect=lambda customers, rejects: customers,
+        ):
+            report = self.controller.import_customers_csv(self.path)
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["rejected"], 1)
+        with open(report["reject_path"], encoding="utf-8") as file:
+            rejects = list(csv.DictReader(file))
+        self.assertEqual(
+            [(reject["line"], reject["error"]) for reject in rejects],
+            [("3", "UNIQUE constraint failed: customers.email")],
+        )
+
+    def test_import_without_rejects(self):
+        self.write_csv(["New,Customer,new@customer.com,+33110203040,New Co,"])
+
+        report = self.controller.import_customers_csv(self.path)
+
+        self.assertEqual(report["created"], 1)
+        self.assertIsNone(report["reject_path"])
+        self.assertFalse(
+            os.path.exists(self.path + constantes.REJECT_FILE_SUFFIX)
+        )
+
+    def test_import_missing_column(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("first_name,email\n")
+        with self.assertRaises(ValueError):
+            self.controller.import_customers_csv(self.path)
@@ -1,11 +1,13 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 import models
 import views
 import constantes
 from controllers import EventController
+from tests.config_test import new_sqlite_session, new_sqlite_user
 
 
 class TestEventController(unittest.TestCase):
@@ -46,6 +48,7 @@ class TestEventController(unittest.TestCase):
         event.location = "Initial Location"
         event.nb_attendees = 100
         event.notes = "Initial Notes"
+        event.support_id = None
         self.controller.get_event = MagicMock(return_value=event)
 
         self.controller.set_new_event = MagicMock(
@@ -89,5 +92,240 @@ class TestEventController(unittest.TestCase):
         )
 
 
+class TestEventControllerQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.engine = self.session.get_bind()
+        sales = new_sqlite_user(self.session, "sales")
+        support = new_sqlite_user(
+            self.session, "support", constantes.ROLE_SUPPORT
+        )
+        for index in range(20):
+            customer = models.Customer(
+                first_name="First",
+                last_name="Last",
+                email=f"customer{index}@test.com",
+                phone_number="+33110203042",
+                compagny_name=f"Company {index}",
+                sales_id=sales.id,
+            )
+            contract = models.Contract(
+                total_amount=100,
+                remaining_amount=0,
+                is_signed=True,
+                user=sales,
+                customer=customer,
+            )
+            models.Event(
+                event_name=f"Event {index}",
+                customer_name=f"Company {index}",
+                customer_contact="Sales User",
+                start_date=datetime(2024, 1, 1),
+                end_date=datetime(2024, 1, 2),
+                location="Paris",
+                nb_attendees=10,
+                notes="",
+                user=support if index % 2 else None,
+                contract=contract,
+            )
+            self.session.add(customer)
+        self.session.commit()
+        user = MagicMock(spec=models.User)
+        user.id = sales.id
+        self.session.expunge_all()
+        self.view = MagicMock(spec=views.EventView)
+        self.controller = EventController(self.session, self.view, user)
+        self.statements = []
+        event.listen(
+            self.engine, "before_cursor_execute", self.count_statement
+        )
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def count_statement(self, *args):
+        self.statements.append(args[2])
+
+    def test_list_events_issues_one_query(self):
+        self.view.input_list_events_filters.return_value = 1
+        self.view.input_page_navigation.return_value = constantes.PAGE_QUIT
+
+        self.controller.list_events()
+
+        self.assertEqual(len(self.statements), 1)
+        table = self.view.display_event.call_args[0][1]
+        self.assertEqual(table.row_count, 20)
+        self.assertEqual(list(table.columns[4].cells), ["Sales"] * 20)
+        self.assertEqual(
+            list(table.columns[10].cells),
+            ["", "support@example.com"] * 10,
+        )
+
+    def test_list_events_only_yours_issues_one_query(self):
+        self.view.input_list_events_filters.return_value = 2
+        self.view.input_page_navigation.return_value = constantes.PAGE_QUIT
+
+        self.controller.list_events()
+
+        self.assertEqual(len(self.statements), 1)
+        table = self.view.display_event.call_args[0][1]
+        self.assertEqual(table.row_count, 20)
+
+
+class TestEventControllerSupportBookings(unittest.TestCase):
+
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.support = new_sqlite_user(
+            self.session, "support", constantes.ROLE_SUPPORT
+        )
+        customer = models.Customer(
+            first_name="First",
+            last_name="Last",
+            email="customer@test.com",
+            phone_number="+33110203042",
+            compagny_name="Company",
+            sales_id=self.support.id,
+        )
+        self.events = [
+            models.Event(
+                event_name=name,
+                customer_name=f"{name} Company",
+                customer_contact="Sales User",
+                start_date=start_date,
+                end_date=end_date,
+                location="Paris",
+                nb_attendees=10,
+                notes="",
+                user=self.support if booked else None,
+                contract=models.Contract(
+                    total_amount=100,
+                    remaining_amount=0,
+                    is_signed=True,
+                    user=self.support,
+                    customer=customer,
+                ),
+            )
+            for name, start_date, end_date, booked in (
+                ("Booked", datetime(2024, 1, 1), datetime(2024, 1, 3), True),
+                ("Overlap", datetime(2024, 1, 2), datetime(2024, 1, 4), True),
+                ("Touching", datetime(2024, 1, 4), datetime(2024, 1, 5), True),
+                ("Free", datetime(2024, 1, 2), datetime(2024, 1, 3), False),
+            )
+        ]
+        self.session.add_all([customer, *self.events])
+        self.session.commit()
+        self.view = MagicMock(spec=views.EventView)
+        self.controller = EventController(
+            self.session, self.view, self.support
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_find_support_conflict_ignores_touching_events(self):
+        conflict = self.controller.find_support_conflict(
+            self.support.id, datetime(2024, 1, 3), datetime(2024, 1, 4)
+        )
+        self.assertEqual(conflict.event_name, "Overlap")
+        self.assertIsNone(
+            self.controller.find_support_conflict(
+                self.support.id, datetime(2024, 1, 5), datetime(2024, 1, 6)
+            )
+        )
+
+    def test_assigning_a_booked_support_is_rejected(self):
+        self.controller.get_event = MagicMock(return_value=self.events[3])
+
+        self.controller.update_event(support_user=self.support)
+
+        self.view.display_support_already_booked.assert_called_once()
+        self.session.refresh(self.events[3])
+        self.assertIsNone(self.events[3].support_id)
+
+    def test_check_support_bookings_checks_the_batch(self):
+        free = self.events[3]
+        accepted, rejected = self.controller.check_support_bookings(
+            [(free, self.support.id)]
+        )
+        self.assertEqual(accepted, [])
+        self.assertEqual(rejected[0][2], self.events[0].id)
+
+        other = new_sqlite_user(
+            self.session, "other", constantes.ROLE_SUPPORT
+        )
+        accepted, rejected = self.controller.check_support_bookings(
+            [(free, other.id), (self.events[0], other.id)]
+        )
+        self.assertEqual(accepted, [(free, other.id)])
+        self.assertEqual(rejected, [(self.events[0], other.id, free.id)])
+
+    def test_event_names_are_scoped_and_cached(self):
+        self.assertEqual(
+            self.controller.complete_event_name("o"), ["Overlap"]
+        )
+        self.assertEqual(
+            self.controller.complete_event_name("", self.support),
+            ["Booked", "Overlap", "Touching"],
+        )
+        statements = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        self.controller.complete_event_name("f")
+        self.controller.complete_event_name("t", self.support)
+
+        self.assertEqual(statements, [])
+
+    def test_event_names_follow_assignments_and_deletions(self):
+        other = new_sqlite_user(
+            self.session, "other", constantes.ROLE_SUPPORT
+        )
+        self.session.commit()
+        names = self.controller.event_names()
+        supported = self.controller.event_names(self.support)
+        other_names = self.controller.event_names(other)
+        self.view.input_event_name.return_value = "Booked"
+
+        self.controller.delete_event()
+        self.view.input_event_name.return_value = "Free"
+        self.controller.update_event(support_user=other)
+
+        self.assertNotIn("Booked", names)
+        self.assertNotIn("Booked", supported)
+        self.assertIn("Free", names)
+        self.assertEqual(other_names.complete(""), ["Free"])
+
+    def test_unknown_event_name_suggests_names(self):
+        self.view.input_event_name.return_value = "touch"
+
+        self.assertIsNone(self.controller.get_event())
+
+        self.view.display_event_name_suggestions.assert_called_once_with(
+            ["Touching"]
+        )
+
+    def test_find_double_bookings(self):
+        rows = self.controller.find_double_bookings()
+
+        self.assertEqual(
+            rows,
+            [
+                (
+                    "support@example.com",
+                    "Booked",
+                    "Overlap",
+                    datetime(2024, 1, 2),
+                    datetime(2024, 1, 3),
+                )
+            ],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event
+import controllers
+import models
+from tests.config_test import (
+    new_sqlite_customer,
+    new_sqlite_session,
+    new_sqlite_user,
+)
+import constantes
+
+
+class TestReportController(TestCase):
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.sales = [
+            new_sqlite_user(self.session, username)
+            for username in ("alice", "bob")
+        ]
+        customers = [
+            new_sqlite_customer(
+                self.session, self.sales[0], f"customer{index}@example.com"
+            )
+            for index in range(2)
+        ]
+        # (sales, customer, total, remaining, signed, creation date)
+        for sales, customer, total, remaining, signed, created in (
+            (0, 0, 1000, 200, True, datetime(2024, 1, 10)),
+            (0, 0, 500, 0, True, datetime(2024, 1, 20)),
+            (0, 1, 300, 300, False, datetime(2024, 2, 5)),
+            (1, 1, 2000, 1000, True, datetime(2024, 3, 1)),
+        ):
+            contract = models.Contract(
+                total_amount=total,
+                remaining_amount=remaining,
+                is_signed=signed,
+                user=self.sales[sales],
+                customer=customers[customer],
+            )
+            contract.creation_date = created
+            self.session.add(contract)
+        self.session.commit()
+        self.controller = controllers.ReportController(
+            self.session, MagicMock()
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_report_per_sales(self):
+        statements = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(
+                statement
+            ),
+        )
+
+        columns, rows = self.controller.build_report(constantes.REPORT_SALES)
+
+        self.assertEqual(len(statements), 1)
+        self.assertIn("GROUP BY", statements[0])
+        self.assertEqual(columns[:2], ("sales_contact", "full_name"))
+        self.assertEqual(
+            rows,
+            [
+                ("bob", "Bob", 1, 1, 2000, 1000),
+                ("alice", "Alice", 3, 2, 1500, 200),
+            ],
+        )
+
+    def test_report_per_customer(self):
+        columns, rows = self.controller.build_report(
+            constantes.REPORT_CUSTOMERS
+        )
+
+        self.assertEqual(
+            [(row[0], row[2], row[4]) for row in rows],
+            [
+                ("customer1@example.com", 2, 2000),
+                ("customer0@example.com", 2, 1500),
+            ],
+        )
+
+    def test_report_per_month(self):
+        columns, rows = self.controller.build_report(constantes.REPORT_MONTHS)
+
+        self.assertEqual(columns[0], "month")
+        self.assertEqual(
+            [(row[0], row[1], row[3]) for row in rows],
+            [("2024-01", 2, 1500), ("2024-02", 1, 0), ("2024-03", 1, 2000)],
+        )
+
+    def test_unknown_report(self):
+        with self.assertRaises(ValueError):
+            self.controller.report_query("unknown")
+
+    def test_summarize(self):
+        summary = self.controller.summarize([10, 20, 30, 40, 100])
+
+        self.assertEqual(summary["count"], 5)
+        self.assertEqual(summary["total"], 200)
+        self.assertEqual(summary["p50"], 30)
+        self.assertEqual(summary["max"], 100)
+        self.assertEqual(self.controller.summarize([]), {"count": 0})
+
+    def test_summarize_keeps_decimal_totals_exact(self):
+        summary = self.controller.summarize([Decimal("0.10")] * 3)
+
+        self.assertEqual(summary["total"], Decimal("0.30"))
+        self.assertEqual(summary["mean"], Decimal("0.10"))
+        self.assertIsInstance(summary["p50"], float)
+
+    def test_distribution(self):
+        distribution = self.controller.distribution([0, 10, 20, 100], bins=2)
+
+        self.assertEqual(distribution, [(0, 50, 3), (50, 100, 1)])
+
+    def test_show_reports(self):
+        self.controller.view.input_report_choice.return_value = (
+            constantes.REPORT_SALES
+        )
+
+        self.controller.show_reports()
+
+        title, columns, rows, summary, distribution = (
+            self.controller.view.display_report.call_args.args
+        )
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(summary["revenue_signed"]["total"], 3500)
+        self.assertEqual(sum(count for _, _, count in distribution), 2)
@@ -0,0 +1,166 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, PropertyMock, patch
+import os
+import tempfile
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql
+import controllers
+import models
+import views
+from tests.config_test import new_sqlite_session, new_sqlite_user
+import constantes
+
+CUSTOMERS = (
+    ("Jean", "Dupont", "jean.dupont@acme.com", "Acme"),
+    ("Marie", "Dupond", "marie@globex.com", "Globex"),
+    ("Paul", "Martin", "paul.martin@initech.com", "Initech"),
+    ("Hélène", "Durand", "helene@acme.com", "Acme Industries"),
+)
+
+
+class TestSearchController(TestCase):
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.sales = new_sqlite_user(self.session, "sales")
+        self.other = new_sqlite_user(self.session, "other")
+        view = MagicMock(spec=views.CustomerView)
+        self.customer_controller = controllers.CustomerController(
+            self.session, view, self.sales
+        )
+        for index, (first, last, email, company) in enumerate(CUSTOMERS):
+            view.input_customer_information.return_value = {
+                "first_name": first,
+                "last_name": last,
+                "compagny_name": company,
+            }
+            self.customer_controller.set_new_customer_email = MagicMock(
+                return_value=email
+            )
+            self.customer_controller.set_customer_phone = MagicMock(
+                return_value="+33110203042"
+            )
+            self.customer_controller.user = (
+                self.other if index == 3 else self.sales
+            )
+            self.customer_controller.create_customer()
+        self.view = MagicMock(spec=views.CustomerView)
+        self.controller = controllers.SearchController(
+            self.session, self.view, self.sales
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def emails(self, rows):
+        return [customer.email for customer, _ in rows]
+
+    def test_search_is_ranked_and_tolerates_typos(self):
+        rows, has_next = self.controller.search("dupont")
+
+        self.assertEqual(
+            self.emails(rows), ["jean.dupont@acme.com", "marie@globex.com"]
+        )
+        self.assertEqual(rows[0][1], 1.0)
+        self.assertLess(rows[1][1], 1.0)
+        self.assertFalse(has_next)
+
+    def test_mysql_search_only_requires_indexed_words(self):
+        with patch.object(
+            controllers.SearchController,
+            "uses_fulltext",
+            new_callable=PropertyMock,
+            return_value=True,
+        ):
+            query = self.controller.search_query("Jo the Dupont de Acme")
+        compiled = query.compile(dialect=mysql.dialect())
+
+        self.assertIn("IN BOOLEAN MODE", str(compiled))
+        self.assertIn("jo* the* +dupont* de* +acme*", compiled.params.values())
+
+    def test_search_by_prefix_of_several_fields(self):
+        rows, _ = self.controller.search("acm jea")
+        self.assertEqual(self.emails(rows)[0], "jean.dupont@acme.com")
+
+        rows, _ = self.controller.search("Helene")
+        self.assertEqual(self.emails(rows), ["helene@acme.com"])
+
+    def test_search_pages_and_mine(self):
+        rows, has_next = self.controller.search("acme", page_size=1)
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(has_next)
+        rows, has_next = self.controller.search("acme", page=1, page_size=1)
+        self.assertFalse(has_next)
+
+        rows, _ = self.controller.search("acme", mine=True)
+        self.assertEqual(self.emails(rows), ["jean.dupont@acme.com"])
+
+        self.assertEqual(self.controller.search("j"), ([], False))
+
+    def test_rarest_grams(self):
+        self.assertEqual(
+            self.controller.rarest_grams({" du", "dup", "ont"}, 1), ["ont"]
+        )
+
+    def test_candidates_are_bounded_and_scoped(self):
+        with patch.object(constantes, "SEARCH_MAX_CANDIDATES", 1):
+            rows, _ = self.controller.search("acme")
+            self.assertEqual(self.emails(rows), ["jean.dupont@acme.com"])
+
+            self.controller.user = self.other
+            rows, _ = self.controller.search("acme", mine=True)
+            self.assertEqual(self.emails(rows), ["helene@acme.com"])
+
+    def test_index_follows_updates_and_imports(self):
+        view = self.customer_controller.view
+        view.input_email.return_value = "marie@globex.com"
+        view.input_customer_information.return_value = {
+            "first_name": "Marie",
+            "last_name": "Lefebvre",
+            "compagny_name": "Globex",
+        }
+        self.customer_controller.user = self.sales
+        self.customer_controller.update_customer()
+
+        self.assertEqual(
+            self.emails(self.controller.search("dupont")[0]),
+            ["jean.dupont@acme.com"],
+        )
+        self.assertEqual(
+            self.emails(self.controller.search("lefeb")[0]),
+            ["marie@globex.com"],
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "customers.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(",".join(constantes.CUSTOMER_IMPORT_COLUMNS) + "\n")
+                file.write(
+                    "Luc,Bernard,luc@umbrella.com,+33110203044,Umbrella\n"
+                )
+            self.customer_controller.import_customers_csv(path)
+
+        self.assertEqual(
+            self.emails(self.controller.search("umbrel")[0]),
+            ["luc@umbrella.com"],
+        )
+
+    def test_rebuild(self):
+        count = select(func.count()).select_from(models.CustomerSearchGram)
+        expected = self.session.scalar(count)
+        self.session.execute(models.CustomerSearchGram.__table__.delete())
+        self.session.commit()
+
+        self.assertEqual(self.controller.rebuild(), len(CUSTOMERS))
+        self.assertEqual(self.session.scalar(count), expected)
+
+    def test_search_customers_navigates_pages(self):
+        self.view.input_search.return_value = "acme"
+        self.view.input_page_navigation.side_effect = [
+            constantes.PAGE_NEXT,
+            constantes.PAGE_QUIT,
+        ]
+        with patch.dict(os.environ, {"PAGE_SIZE": "1"}):
+            self.controller.search_customers()
+
+        self.assertEqual(self.view.display_search_results.call_count, 2)
+        self.view.input_page_navigation.assert_called_with(True, False)
@@ -1,9 +1,19 @@
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 import os
+import tempfile
 import bcrypt
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+import controllers
+import database
 import models
-from tests.config_test import new_mock_user_controller
+import views
+from tests.config_test import (
+    new_mock_user_controller,
+    new_sqlite_session,
+    new_sqlite_user,
+)
 import constantes
 import validators
 
@@ -243,3 +253,220 @@ class TestUserControllerCrud(TestCase):
                 constantes.ERR_USER_NOT_FOUND
             )
             raise ValueError("USER not found")
+
+
+class TestUserControllerImport(TestCase):
+    def setUp(self):
+        environ = patch.dict(os.environ, {"BCRYPT_ROUNDS": "4"})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.session = new_sqlite_session()
+        self.session.add_all(
+            [models.Role(name=role_name) for role_name in constantes.ROLES]
+        )
+        new_sqlite_user(self.session, "taken")
+        self.session.commit()
+        database.reference_cache.attach(self.session)
+        self.controller = controllers.UserController(
+            self.session, view=MagicMock()
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "users.csv")
+
+    def tearDown(self):
+        self.session.close()
+        self.directory.cleanup()
+
+    def write_csv(self, lines):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(",".join(constantes.USER_IMPORT_COLUMNS) + "\n")
+            file.write("\n".join(lines) + "\n")
+
+    def test_import_users_csv(self):
+        self.write_csv(
+            [
+                f"sales{i},Sales {i},sales{i}@example.com,+3311020304{i},sales,pw{i}"
+                for i in range(5)
+            ]
+            + [
+                "bad,Bad Email,not-an-email,+33110203040,sales,pw",
+                "role,Bad Role,role@example.com,+33110203040,unknown,pw",
+                "taken,Taken Again,new@example.com,+33110203040,support,pw",
+                "dup,Duplicate,sales0@example.com,+33110203040,support,pw",
+            ]
+        )
+        report = self.controller.import_users_csv(
+            self.path, batch_size=2, workers=2
+        )
+
+        self.assertEqual(report["read"], 9)
+        self.assertEqual(report["created"], 5)
+        self.assertEqual(
+            [line for line, _ in report["rejected"]], [7, 8, 9, 10]
+        )
+        self.assertGreater(report["users_per_second"], 0)
+        user = self.session.query(models.User).filter_by(username="sales3").one()
+        self.assertEqual(user.role.name, constantes.ROLE_SALES)
+        self.assertTrue(
+            bcrypt.checkpw(b"pw3", user.password.encode("utf-8"))
+        )
+
+    def test_failed_batch_only_rejects_the_failing_line(self):
+        # taken@example.com is inserted after the existing users were checked
+        self.write_csv(
+            [
+                "first,First,first@example.com,+33110203040,sales,pw1",
+                "again,Again,taken@example.com,+33110203040,sales,pw2",
+                "second,Second,second@example.com,+33110203040,sales,pw3",
+            ]
+        )
+
+        with patch.object(
+            self.controller,
+            "remove_existing_users",
+            side_effect=lambda users, rejected, batch_size: users,
+        ):
+            report = self.controller.import_users_csv(self.path, workers=1)
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(
+            report["rejected"],
+            [(3, "UNIQUE constraint failed: users.email")],
+        )
+
+    def test_import_users_csv_missing_column(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("username,email\n")
+        with self.assertRaises(ValueError):
+            self.controller.import_users_csv(self.path)
+
+
+class TestUserControllerRehash(TestCase):
+    def setUp(self):
+        environ = patch.dict(
+            os.environ,
+            {"BCRYPT_ROUNDS": "4", "salt": "$2b$04$abcdefghijklmnopqrstuu"},
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.controller = controllers.UserController(
+            MagicMock(), view=MagicMock()
+        )
+        self.user = models.User(
+            username="legacy",
+            full_name="Legacy User",
+            email="legacy@example.com",
+            phone_number="+33110203040",
+            role_id=1,
+        )
+
+    def test_rehash_legacy_salt(self):
+        self.user.password = bcrypt.hashpw(
+            b"goodpw", os.environ["salt"].encode("utf-8")
+        ).decode("utf-8")
+        legacy_hash = self.user.password
+
+        self.controller.rehash_password(self.user, "goodpw")
+
+        self.assertNotEqual(self.user.password, legacy_hash)
+        self.assertTrue(self.user.is_password_correct("goodpw"))
+        self.assertFalse(self.user.password_needs_rehash())
+        self.controller.session.commit.assert_called_once()
+
+    def test_rehash_cost_change(self):
+        self.user.password = models.hash_password("goodpw", rounds=5)
+
+        self.controller.rehash_password(self.user, "goodpw")
+
+        self.assertTrue(self.user.password.startswith("$2b$04$"))
+        self.controller.session.commit.assert_called_once()
+
+    def test_no_rehash_when_current(self):
+        self.user.set_password("goodpw")
+        current_hash = self.user.password
+
+        self.controller.rehash_password(self.user, "goodpw")
+
+        self.assertEqual(self.user.password, current_hash)
+        self.controller.session.commit.assert_not_called()
+
+
+class TestUserControllerTokenLogin(TestCase):
+    def setUp(self):
+        environ = patch.dict(
+            os.environ, {"BCRYPT_ROUNDS": "4", "secret_key": "test-secret"}
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+        clear_screen = patch.object(views.MainView, "clear_screen")
+        clear_screen.start()
+        self.addCleanup(clear_screen.stop)
+
+        session = new_sqlite_session()
+        session.add_all(
+            [models.Role(name=role_name) for role_name in constantes.ROLES]
+        )
+        session.commit()
+        database.reference_cache.attach(session)
+        sales_role = database.reference_cache.get(
+            models.Role, name=constantes.ROLE_SALES
+        )
+        self.user = models.User(
+            username="sales",
+            full_name="Sales User",
+            email="sales@example.com",
+            phone_number="+33110203040",
+            role_id=sales_role.id,
+            password="goodpw",
+        )
+        session.add(self.user)
+        session.commit()
+        self.engine = session.get_bind()
+        self.token = controllers.UserController(
+            session, view=MagicMock()
+        ).generate_token(self.user)
+        self.addCleanup(session.close)
+
+    def relaunch(self):
+        session = sessionmaker(bind=self.engine)()
+        self.addCleanup(session.close)
+        main_controller = controllers.MainController(
+            session, console=MagicMock()
+        )
+        main_controller.user_controller.view = MagicMock()
+        main_controller.user_controller.load_token = lambda: self.token
+        return main_controller
+
+    def test_relaunch_with_token_costs_one_query(self):
+        main_controller = self.relaunch()
+        statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(
+                statement
+            ),
+        )
+
+        user = main_controller.user_controller.run_login_menu()
+        main_controller.set_user_to_controllers(user)
+        main_controller.view.input_welcome_user(user)
+
+        self.assertEqual(user.username, "sales")
+        self.assertEqual(main_controller.role_name, constantes.ROLE_SALES)
+        self.assertEqual(len(statements), 1)
+        main_controller.user_controller.view.input_password.assert_not_called()
+
+    def test_token_rejected_when_role_changed(self):
+        session = sessionmaker(bind=self.engine)()
+        session.get(models.User, self.user.id).role_id = (
+            database.reference_cache.get(
+                models.Role, name=constantes.ROLE_SUPPORT
+            ).id
+        )
+        session.commit()
+        session.close()
+        user_controller = self.relaunch().user_controller
+
+        self.assertIsNone(user_controller.get_user_from_token(self.token))
+        self.assertIsNone(user_controller.principal)
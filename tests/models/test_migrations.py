@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from sqlalchemy import Column, Integer, create_engine, inspect
+import models
+from models.migrations import Migration, MigrationEngine, Operations
+
+
+def new_migration(version, upgrade, downgrade):
+    return Migration(
+        SimpleNamespace(
+            version=version,
+            name=f"test {version}",
+            upgrade=upgrade,
+            downgrade=downgrade,
+        )
+    )
+
+
+class MigrationTestMixin:
+
+    def assert_schema_matches_models(self):
+        inspector = inspect(self.engine)
+        for table in models.Base.metadata.sorted_tables:
+            columns = {
+                column["name"]: column
+                for column in inspector.get_columns(table.name)
+            }
+            self.assertEqual(
+                set(columns), set(table.columns.keys()), table.name
+            )
+            for column in table.columns:
+                self.assertEqual(
+                    columns[column.name]["nullable"],
+                    column.nullable,
+                    f"{table.name}.{column.name}",
+                )
+            self.assertEqual(
+                {index["name"] for index in inspector.get_indexes(table.name)},
+                {
+                    index.name
+                    for index in table.indexes
+                    if self.engine.dialect.name == "mysql"
+                    or index.dialect_options["mysql"]["prefix"] != "FULLTEXT"
+                },
+                table.name,
+            )
+
+    def test_upgrade_to_head_matches_models(self):
+        migration_engine = MigrationEngine(self.engine)
+        migration_engine.upgrade()
+        self.assertEqual(
+            migration_engine.current_version(), migration_engine.head()
+        )
+        self.assert_schema_matches_models()
+
+    def test_upgrade_is_idempotent(self):
+        migration_engine = MigrationEngine(self.engine)
+        migration_engine.upgrade()
+        self.assertEqual(migration_engine.upgrade(), [])
+
+    def test_downgrade_to_zero_and_back(self):
+        migration_engine = MigrationEngine(self.engine)
+        migration_engine.upgrade()
+        reverted = migration_engine.downgrade(0)
+        self.assertEqual(len(reverted), len(migration_engine.migrations))
+        self.assertEqual(migration_engine.current_version(), 0)
+        self.assertEqual(
+            inspect(self.engine).get_table_names(), ["schema_migrations"]
+        )
+        migration_engine.upgrade()
+        self.assert_schema_matches_models()
+
+
+class TestMigrationsSQLite(MigrationTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(self.directory.name, 'app.db')}"
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_upgrade_adopts_database_created_by_create_all(self):
+        models.Base.metadata.create_all(self.engine)
+        migration_engine = MigrationEngine(self.engine)
+        migration_engine.upgrade()
+        self.assertEqual(
+            migration_engine.current_version(), migration_engine.head()
+        )
+        self.assert_schema_matches_models()
+
+    def test_partial_upgrade_and_downgrade(self):
+        calls = []
+        migration_engine = MigrationEngine(
+            self.engine,
+            [
+                new_migration(
+                    1,
+                    lambda op: calls.append("up 1"),
+                    lambda op: calls.append("down 1"),
+                ),
+                new_migration(
+                    2,
+                    lambda op: calls.append("up 2"),
+                    lambda op: calls.append("down 2"),
+                ),
+            ],
+        )
+        migration_engine.upgrade(1)
+        self.assertEqual(migration_engine.current_version(), 1)
+        migration_engine.upgrade()
+        migration_engine.downgrade(0)
+        self.assertEqual(calls, ["up 1", "up 2", "down 2", "down 1"])
+
+    def test_failed_migration_is_not_recorded(self):
+        def failing_upgrade(op):
+            raise RuntimeError("boom")
+
+        migration_engine = MigrationEngine(
+            self.engine, [new_migration(1, failing_upgrade, None)]
+        )
+        with self.assertRaises(RuntimeError):
+            migration_engine.upgrade()
+        self.assertEqual(migration_engine.current_version(), 0)
+
+    def test_index_and_column_operations(self):
+        with self.engine.begin() as connection:
+            op = Operations(connection)
+            op.create_table(
+                "things",
+                Column("id", Integer, primary_key=True),
+                Column("size", Integer),
+            )
+            op.create_index("ix_things_size", "things", ["size"])
+            op.create_index("ix_things_size", "things", ["size"])
+            op.add_column("things", Column("weight", Integer))
+            self.assertTrue(op.has_index("ix_things_size", "things"))
+            self.assertTrue(op.has_column("things", "weight"))
+            op.drop_index("ix_things_size", "things")
+            op.drop_column("things", "weight")
+            self.assertFalse(op.has_index("ix_things_size", "things"))
+            self.assertFalse(op.has_column("things", "weight"))
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_MYSQL_URL"),
+    "set TEST_MYSQL_URL to an empty local MySQL database to run",
+)
+class TestMigrationsMySQL(MigrationTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine(os.getenv("TEST_MYSQL_URL"))
+        MigrationEngine(self.engine).downgrade(0)
+
+    def tearDown(self):
+        MigrationEngine(self.engine).downgrade(0)
+        self.engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from decimal import Decimal
+from sqlalchemy import func, select
+import constantes
+import models
+from models.money import to_money
+from tests.config_test import new_sqlite_session
+
+
+class TestMoney(unittest.TestCase):
+
+    def test_to_money(self):
+        self.assertEqual(to_money("0.1"), Decimal("0.10"))
+        self.assertEqual(to_money(" 12.345 "), Decimal("12.35"))
+        self.assertEqual(to_money(0.1 + 0.2), Decimal("0.30"))
+        self.assertEqual(to_money(7), Decimal("7.00"))
+        for value in ("", "abc", "nan", "inf"):
+            with self.assertRaises(ValueError):
+                to_money(value)
+
+    def test_sum_is_exact(self):
+        session = new_sqlite_session()
+        self.addCleanup(session.close)
+        role = models.Role(name=constantes.ROLE_SALES)
+        session.add(role)
+        session.flush()
+        sales = models.User(
+            username="sales",
+            full_name="Sales User",
+            email="sales@example.com",
+            phone_number="+33110203040",
+            role_id=role.id,
+            password="hash",
+        )
+        customer = models.Customer(
+            first_name="First",
+            last_name="Last",
+            email="customer@example.com",
+            phone_number="+33110203042",
+            compagny_name="Company",
+            sales_id=None,
+        )
+        customer.user = sales
+        session.add_all(
+            models.Contract(
+                total_amount="0.1",
+                remaining_amount="0.1",
+                user=sales,
+                customer=customer,
+            )
+            for _ in range(3)
+        )
+        session.commit()
+
+        total = session.scalar(select(func.sum(models.Contract.total_amount)))
+        contract = session.scalars(select(models.Contract)).first()
+
+        self.assertEqual(total, Decimal("0.30"))
+        self.assertIsInstance(contract.remaining_amount, Decimal)
@@ -0,0 +1,63 @@
+import os
+import unittest
+from unittest.mock import patch
+import bcrypt
+import constantes
+from models.password import (
+    calibrate_rounds,
+    check_password,
+    get_bcrypt_rounds,
+    hash_password,
+    needs_rehash,
+)
+
+LEGACY_SALT = "$2b$04$abcdefghijklmnopqrstuu"
+
+
+class TestPassword(unittest.TestCase):
+
+    def setUp(self):
+        environ = patch.dict(
+            os.environ, {"BCRYPT_ROUNDS": "4", "salt": LEGACY_SALT}
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def test_each_hash_has_its_own_salt(self):
+        first = hash_password("secret")
+        second = hash_password("secret")
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith("$2b$04$"))
+        self.assertTrue(check_password("secret", first))
+        self.assertTrue(check_password("secret", second))
+        self.assertFalse(check_password("other", first))
+
+    def test_check_invalid_hash(self):
+        self.assertFalse(check_password("secret", "not a bcrypt hash"))
+
+    def test_needs_rehash(self):
+        legacy = bcrypt.hashpw(b"secret", LEGACY_SALT.encode()).decode()
+        self.assertTrue(check_password("secret", legacy))
+        self.assertTrue(needs_rehash(legacy))
+        self.assertTrue(needs_rehash(hash_password("secret", rounds=5)))
+        self.assertFalse(needs_rehash(hash_password("secret")))
+
+    def test_rounds_setting(self):
+        with patch.dict(os.environ, {"BCRYPT_ROUNDS": "99"}):
+            self.assertEqual(
+                get_bcrypt_rounds(), constantes.DEFAULT_BCRYPT_ROUNDS
+            )
+        with patch.dict(os.environ, {"BCRYPT_ROUNDS": "abc"}):
+            self.assertEqual(
+                get_bcrypt_rounds(), constantes.DEFAULT_BCRYPT_ROUNDS
+            )
+        self.assertEqual(get_bcrypt_rounds(), 4)
+
+    def test_calibrate_rounds(self):
+        chosen, timings = calibrate_rounds(target_ms=10_000, max_rounds=6)
+        self.assertEqual(chosen, 6)
+        self.assertEqual([rounds for rounds, _ in timings], [4, 5, 6])
+
+        chosen, timings = calibrate_rounds(target_ms=0, max_rounds=6)
+        self.assertEqual(chosen, constantes.MIN_BCRYPT_ROUNDS)
+        self.assertEqual(len(timings), 1)
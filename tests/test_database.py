@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import constantes
+import controllers
+import database
+import models
+
+
+class TestEngineOptions(unittest.TestCase):
+
+    def test_defaults(self):
+        with patch.dict(os.environ, {}, clear=True):
+            options = database.get_engine_options()
+        self.assertEqual(options["pool_size"], constantes.DEFAULT_DB_POOL_SIZE)
+        self.assertEqual(
+            options["max_overflow"], constantes.DEFAULT_DB_MAX_OVERFLOW
+        )
+        self.assertTrue(options["pool_pre_ping"])
+
+    def test_from_environment(self):
+        environment = {
+            "DB_POOL_SIZE": "20",
+            "DB_MAX_OVERFLOW": "0",
+            "DB_POOL_TIMEOUT": "5",
+            "DB_POOL_RECYCLE": "600",
+            "DB_POOL_PRE_PING": "false",
+        }
+        with patch.dict(os.environ, environment):
+            options = database.get_engine_options()
+        self.assertEqual(options["pool_size"], 20)
+        self.assertEqual(options["max_overflow"], 0)
+        self.assertEqual(options["pool_timeout"], 5)
+        self.assertEqual(options["pool_recycle"], 600)
+        self.assertFalse(options["pool_pre_ping"])
+
+    def test_slow_query_log_settings(self):
+        with patch.dict(os.environ, {}, clear=True):
+            options = database.get_slow_query_options()
+        self.assertEqual(
+            options["threshold_ms"], constantes.DEFAULT_SLOW_QUERY_MS
+        )
+        self.assertEqual(options["path"], constantes.DEFAULT_SLOW_QUERY_LOG)
+
+        with patch.dict(os.environ, {"SLOW_QUERY_MS": "0"}):
+            self.assertIsNone(database.get_slow_query_options())
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestBootstrap(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(self.directory.name, 'app.db')}"
+        self.url_patch = patch.object(database, "DATABASE_URL", url)
+        self.url_patch.start()
+        self.env_patch = patch.dict(
+            os.environ,
+            {
+                "ADMIN_FIRST_NAME": "admin",
+                "ADMIN_LAST_NAME": "Admin",
+                "ADMIN_EMAIL": "admin@example.com",
+                "ADMIN_PHONE": "+33110203040",
+                "ADMIN_PASSWORD": "password",
+            },
+        )
+        self.env_patch.start()
+        self.statements = []
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.url_patch.stop()
+        self.directory.cleanup()
+
+    def count_statement(self, *args):
+        self.statements.append(args[2])
+
+    def init_db(self):
+        session = database.init_db()
+        self.addCleanup(session.get_bind().dispose)
+        self.addCleanup(session.close)
+        return session
+
+    def bootstrap(self):
+        # The full bootstrap, as main.finish_bootstrap completes it
+        session = self.init_db()
+        controllers.MainController(session, console=MagicMock()).create_admin()
+        database.store_bootstrap_fingerprint(session)
+        return session
+
+    def test_first_start_runs_full_bootstrap(self):
+        session = self.init_db()
+        self.assertFalse(session.info["bootstrap_current"])
+        roles = [role.name for role in session.query(models.Role).all()]
+        self.assertEqual(sorted(roles), sorted(constantes.ROLES))
+
+    def test_next_start_skips_bootstrap_in_one_query(self):
+        self.bootstrap()
+
+        event.listen(Engine, "before_cursor_execute", self.count_statement)
+        try:
+            session = self.init_db()
+        finally:
+            event.remove(
+                Engine, "before_cursor_execute", self.count_statement
+            )
+        self.assertTrue(session.info["bootstrap_current"])
+        self.assertEqual(len(self.statements), 1)
+
+    def test_changed_fingerprint_runs_full_bootstrap(self):
+        self.bootstrap()
+
+        with patch.dict(os.environ, {"ADMIN_FIRST_NAME": "other admin"}):
+            session = self.init_db()
+        self.assertFalse(session.info["bootstrap_current"])
+
+    def test_deleted_admin_is_recreated_on_next_start(self):
+        session = self.bootstrap()
+        session.query(models.User).filter_by(username="admin").delete()
+        session.commit()
+
+        session = self.init_db()
+        self.assertFalse(session.info["bootstrap_current"])
+        self.bootstrap()
+        session = self.init_db()
+        self.assertTrue(session.info["bootstrap_current"])
+        self.assertEqual(
+            session.query(models.User).filter_by(username="admin").count(), 1
+        )
+
+    def test_deleted_role_is_recreated_on_next_start(self):
+        session = self.bootstrap()
+        role = session.query(models.Role).filter_by(
+            name=constantes.ROLE_SUPPORT
+        )
+        role.delete()
+        session.commit()
+
+        session = self.init_db()
+        self.assertFalse(session.info["bootstrap_current"])
+        self.assertEqual(role.with_session(session).count(), 1)
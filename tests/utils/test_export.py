@@ -0,0 +1,77 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+import utils
+
+COLUMNS = ("id", "name", "date")
+ROWS = [
+    (1, "Première", datetime(2024, 1, 1)),
+    (2, "Second, with comma", None),
+]
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_write_csv(self):
+        stream = io.StringIO()
+
+        count = utils.write_csv(stream, COLUMNS, iter(ROWS))
+
+        self.assertEqual(count, 2)
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(rows[0], list(COLUMNS))
+        self.assertEqual(rows[2], ["2", "Second, with comma", ""])
+
+    def test_write_ndjson(self):
+        stream = io.StringIO()
+
+        count = utils.write_ndjson(stream, COLUMNS, iter(ROWS))
+
+        self.assertEqual(count, 2)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(
+            json.loads(lines[0]),
+            {"id": 1, "name": "Première", "date": "2024-01-01 00:00:00"},
+        )
+        self.assertIsNone(json.loads(lines[1])["date"])
+
+    def test_gzip_from_suffix(self):
+        path = os.path.join(self.directory.name, "export.ndjson.gz")
+
+        with utils.open_export(path) as stream:
+            utils.write_ndjson(stream, COLUMNS, ROWS)
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            self.assertEqual(len(file.read().splitlines()), 2)
+
+    def test_plain_file(self):
+        path = os.path.join(self.directory.name, "export.csv")
+
+        with utils.open_export(path) as stream:
+            utils.write_csv(stream, COLUMNS, ROWS)
+
+        with open(path, encoding="utf-8", newline="") as file:
+            self.assertEqual(len(list(csv.reader(file))), 3)
+
+    def test_gzip_to_standard_output(self):
+        buffer = io.BytesIO()
+        stdout = io.TextIOWrapper(buffer)
+
+        with patch("sys.stdout", stdout):
+            with utils.open_export(compress=True) as stream:
+                utils.write_csv(stream, COLUMNS, ROWS)
+
+        self.assertFalse(buffer.closed)
+        self.assertTrue(
+            gzip.decompress(buffer.getvalue()).startswith(b"id,name,date")
+        )
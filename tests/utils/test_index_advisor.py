@@ -0,0 +1,65 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from sqlalchemy import select
+import models
+import utils
+from tests.config_test import new_sqlite_session
+
+
+class TestIndexAdvisor(unittest.TestCase):
+
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.addCleanup(self.session.close)
+        self.advisor = utils.IndexAdvisor(self.session)
+
+    def test_indexed_filter(self):
+        plan, tables = self.advisor.full_scans(
+            self.session.query(models.Contract).filter(
+                models.Contract.is_signed.is_(False),
+                models.Contract.remaining_amount > 0,
+            )
+        )
+
+        self.assertEqual(tables, [])
+        self.assertIn("ix_contracts_signed_remaining", plan[0]["detail"])
+
+    def test_parameters_are_bound(self):
+        plan, tables = self.advisor.full_scans(
+            select(models.Contract.id).where(
+                models.Contract.id.in_([1, 2]),
+                models.Contract.reference == "REF :foo 10:30",
+                models.Contract.total_amount > Decimal("10.50"),
+            )
+        )
+
+        self.assertTrue(plan)
+        self.assertEqual(tables, [])
+
+    def test_full_scan(self):
+        _, tables = self.advisor.full_scans(
+            select(models.Customer.id).where(
+                models.Customer.first_name == "Jean"
+            )
+        )
+
+        self.assertEqual(tables, ["customers"])
+
+    def test_advise(self):
+        rows = list(
+            self.advisor.advise(
+                {
+                    "by id": select(models.User).where(models.User.id == 1),
+                    "by name": select(models.User).where(
+                        models.User.full_name == "Jean"
+                    ),
+                }
+            )
+        )
+
+        self.assertEqual(
+            [(name, tables) for name, tables, _ in rows],
+            [("by id", ""), ("by name", "users")],
+        )
+        self.assertIn("users", rows[1][2])
@@ -0,0 +1,62 @@
+import unittest
+from datetime import datetime
+from utils import IntervalTree
+
+
+class TestIntervalTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = IntervalTree(
+            [
+                (datetime(2024, 1, 1), datetime(2024, 1, 3), "first"),
+                (datetime(2024, 1, 5), datetime(2024, 1, 6), "second"),
+                (datetime(2024, 1, 2), datetime(2024, 1, 10), "long"),
+            ]
+        )
+
+    def test_overlaps_are_ordered_by_start(self):
+        found = self.tree.overlaps(datetime(2024, 1, 2), datetime(2024, 1, 6))
+
+        self.assertEqual(
+            [value for _, _, value in found], ["first", "long", "second"]
+        )
+        self.assertEqual(len(self.tree), 3)
+
+    def test_touching_intervals_do_not_overlap(self):
+        found = self.tree.overlaps(datetime(2024, 1, 10), datetime(2024, 1, 11))
+
+        self.assertEqual(found, [])
+        self.assertEqual(
+            self.tree.first_overlap(datetime(2024, 1, 3), datetime(2024, 1, 4)),
+            (datetime(2024, 1, 2), datetime(2024, 1, 10), "long"),
+        )
+
+    def test_matches_a_linear_scan(self):
+        tree = IntervalTree()
+        intervals = [
+            (index * 7 % 50, index * 7 % 50 + index % 5 + 1, index)
+            for index in range(200)
+        ]
+        for interval in intervals:
+            tree.add(*interval)
+        for start in range(0, 60, 3):
+            expected = sorted(
+                interval
+                for interval in intervals
+                if interval[0] < start + 4 and interval[1] > start
+            )
+            self.assertEqual(sorted(tree.overlaps(start, start + 4)), expected)
+            self.assertIs(tree.any_overlap(start, start + 4), bool(expected))
+
+    def test_any_overlap(self):
+        self.assertTrue(
+            self.tree.any_overlap(datetime(2024, 1, 9), datetime(2024, 1, 12))
+        )
+        self.assertFalse(
+            self.tree.any_overlap(datetime(2024, 1, 10), datetime(2024, 1, 11))
+        )
+        self.assertFalse(IntervalTree().any_overlap(0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
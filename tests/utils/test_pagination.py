@@ -0,0 +1,81 @@
+import os
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import constantes
+import models
+from utils import KeysetPaginator, get_page_size
+
+
+class TestKeysetPaginator(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        models.Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.session.add_all(
+            [models.Role(name=f"ROLE {index}") for index in range(7)]
+        )
+        self.session.commit()
+        self.paginator = KeysetPaginator(
+            self.session.query(models.Role), models.Role.id, page_size=3
+        )
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def ids(self, rows):
+        return [row.id for row in rows]
+
+    def test_first_page(self):
+        rows = self.paginator.first_page()
+        self.assertEqual(self.ids(rows), [1, 2, 3])
+        self.assertFalse(self.paginator.has_previous)
+        self.assertTrue(self.paginator.has_next)
+
+    def test_next_pages(self):
+        self.paginator.first_page()
+        self.assertEqual(self.ids(self.paginator.next_page()), [4, 5, 6])
+        self.assertTrue(self.paginator.has_next)
+        self.assertEqual(self.ids(self.paginator.next_page()), [7])
+        self.assertTrue(self.paginator.has_previous)
+        self.assertFalse(self.paginator.has_next)
+
+    def test_previous_page(self):
+        self.paginator.first_page()
+        self.paginator.next_page()
+        self.paginator.next_page()
+        self.assertEqual(self.ids(self.paginator.previous_page()), [4, 5, 6])
+        self.assertTrue(self.paginator.has_previous)
+        self.assertEqual(self.ids(self.paginator.previous_page()), [1, 2, 3])
+        self.assertFalse(self.paginator.has_previous)
+        self.assertTrue(self.paginator.has_next)
+
+    def test_navigate(self):
+        self.paginator.first_page()
+        self.assertIsNone(self.paginator.navigate(constantes.PAGE_PREVIOUS))
+        self.paginator.first_page()
+        rows = self.paginator.navigate(constantes.PAGE_NEXT)
+        self.assertEqual(self.ids(rows), [4, 5, 6])
+        self.assertIsNone(self.paginator.navigate(constantes.PAGE_QUIT))
+
+    def test_filtered_query(self):
+        paginator = KeysetPaginator(
+            self.session.query(models.Role).filter(models.Role.id > 5),
+            models.Role.id,
+            page_size=3,
+        )
+        self.assertEqual(self.ids(paginator.first_page()), [6, 7])
+        self.assertFalse(paginator.has_next)
+
+    def test_page_size_from_environment(self):
+        with patch.dict(os.environ, {"PAGE_SIZE": "50"}):
+            self.assertEqual(get_page_size(), 50)
+        with patch.dict(os.environ, {"PAGE_SIZE": "abc"}):
+            self.assertEqual(get_page_size(), constantes.DEFAULT_PAGE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from utils import MeteredQueuePool, PoolMetrics
+
+
+class TestPoolMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(self.directory.name, 'pool.db')}",
+            poolclass=MeteredQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.1,
+        )
+        self.metrics = PoolMetrics()
+        self.metrics.attach(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_checkouts_and_connects(self):
+        for _ in range(3):
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        stats = self.metrics.snapshot()
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["pool_size"], 1)
+        self.assertGreaterEqual(stats["max_wait_ms"], 0)
+
+    def test_overflow_and_timeout(self):
+        first = self.engine.connect()
+        second = self.engine.connect()
+        with self.assertRaises(PoolTimeoutError):
+            self.engine.connect()
+        stats = self.metrics.snapshot()
+        self.assertEqual(stats["overflow_checkouts"], 1)
+        self.assertEqual(stats["max_overflow_used"], 1)
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["timeouts"], 1)
+        first.close()
+        second.close()
+
+    def test_pooled_checkouts_during_overflow_are_not_overflow(self):
+        first = self.engine.connect()
+        second = self.engine.connect()
+        first.close()
+        third = self.engine.connect()
+        stats = self.metrics.snapshot()
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["overflow_checkouts"], 1)
+        second.close()
+        third.close()
+
+    def test_invalidations(self):
+        with self.engine.connect() as connection:
+            connection.invalidate()
+        self.assertEqual(self.metrics.snapshot()["invalidations"], 1)
+
+    def test_metrics_survive_pool_recreation(self):
+        self.engine.dispose()
+        with self.engine.connect():
+            pass
+        self.assertIs(self.engine.pool.metrics, self.metrics)
+        self.assertEqual(self.metrics.snapshot()["checkouts"], 1)
+
+    def test_reset(self):
+        with self.engine.connect():
+            pass
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()["checkouts"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from utils import PrefixIndex
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex(
+            ["Wedding Paris", "wedding lyon", "Workshop", "Gala"]
+        )
+
+    def test_complete_ignores_case_and_keeps_order(self):
+        self.assertEqual(
+            self.index.complete("WED"), ["wedding lyon", "Wedding Paris"]
+        )
+        self.assertEqual(self.index.complete("w", limit=1), ["wedding lyon"])
+        self.assertEqual(self.index.complete("x"), [])
+        self.assertEqual(len(self.index.complete("")), 4)
+
+    def test_add_and_discard(self):
+        self.index.add("Wedding Nice")
+        self.index.add("Wedding Nice")
+        self.index.discard("Wedding Paris")
+        self.index.discard("Unknown")
+
+        self.assertEqual(
+            self.index.complete("wedding"), ["wedding lyon", "Wedding Nice"]
+        )
+        self.assertEqual(len(self.index), 4)
+        self.assertNotIn("Wedding Paris", self.index)
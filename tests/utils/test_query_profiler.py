@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+from sqlalchemy import select
+import models
+from utils import QueryProfiler
+from tests.config_test import new_sqlite_session
+
+
+class RoleController:
+    def __init__(self, session):
+        self.session = session
+
+    def list_roles(self):
+        return self.session.scalars(select(models.Role)).all()
+
+    def role_names(self):
+        # One query per role, on purpose
+        return [
+            self.session.scalars(
+                select(models.Role.name).where(models.Role.id == role.id)
+            ).one()
+            for role in self.list_roles()
+        ]
+
+    def iter_roles(self):
+        yield from self.session.scalars(select(models.Role))
+
+
+class TestQueryProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.session.add_all(
+            [models.Role(name=f"ROLE {index}") for index in range(6)]
+        )
+        self.session.commit()
+        self.profiler = QueryProfiler()
+        self.profiler.attach(self.session.get_bind())
+        self.summaries = []
+        self.profiler.on_action = self.summaries.append
+        self.controller = self.profiler.instrument(
+            RoleController(self.session)
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_nested_calls_belong_to_the_outermost_action(self):
+        self.controller.list_roles()
+        self.controller.role_names()
+
+        self.assertEqual(
+            [
+                (summary["action"], summary["statements"])
+                for summary in self.summaries
+            ],
+            [
+                ("RoleController.list_roles", 1),
+                ("RoleController.role_names", 7),
+            ],
+        )
+        self.assertIsNone(self.summaries[0]["repeated_statement"])
+        self.assertEqual(self.summaries[1]["max_repeats"], 6)
+        self.assertIn("FROM roles", self.summaries[1]["repeated_statement"])
+        self.assertEqual(self.profiler.summaries(), self.summaries)
+
+    def test_statements_outside_actions_are_ignored(self):
+        self.session.scalars(select(models.Role)).all()
+        list(self.controller.iter_roles())
+
+        self.assertEqual(self.summaries, [])
+
+    def test_actions_are_logged_as_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.profiler.log_path = os.path.join(directory, "profile.log")
+            self.controller.list_roles()
+            with self.profiler.action("manual"):
+                pass
+
+            with open(self.profiler.log_path, encoding="utf-8") as log:
+                lines = [json.loads(line) for line in log]
+
+        self.assertEqual(
+            [line["action"] for line in lines],
+            ["RoleController.list_roles", "manual"],
+        )
+        self.assertEqual(lines[1]["statements"], 0)
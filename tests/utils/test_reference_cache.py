@@ -0,0 +1,77 @@
+import unittest
+from sqlalchemy import event
+import models
+from tests.config_test import new_sqlite_session
+from utils import ReferenceCache
+
+
+class TestReferenceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.session = new_sqlite_session()
+        self.session.add_all(
+            [models.Role(name="MANAGER"), models.Role(name="SUPPORT")]
+        )
+        self.session.commit()
+        self.cache = ReferenceCache()
+        self.cache.register(models.Role, "id", "name")
+        self.cache.attach(self.session)
+        self.statements = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            self.count_statement,
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def count_statement(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_lookups_cost_a_single_query(self):
+        self.cache.load()
+        manager = self.cache.get(models.Role, name="MANAGER")
+        self.assertEqual(
+            self.cache.get(models.Role, id=manager.id).name, "MANAGER"
+        )
+        self.assertIsNone(self.cache.get(models.Role, name="SALES"))
+        self.assertEqual(len(self.cache.all(models.Role)), 2)
+        self.assertEqual(len(self.statements), 1)
+
+    def test_commit_on_cached_table_invalidates(self):
+        self.cache.load()
+        self.session.add(models.Role(name="SALES"))
+        self.session.commit()
+        self.assertIsNotNone(self.cache.get(models.Role, name="SALES"))
+
+    def test_commit_on_other_table_keeps_cache(self):
+        self.cache.load()
+        role = self.cache.get(models.Role, name="SUPPORT")
+        self.session.add(
+            models.User(
+                username="support",
+                full_name="Support User",
+                email="support@example.com",
+                phone_number="+33110203040",
+                password="hash",
+                role_id=role.id,
+            )
+        )
+        self.session.commit()
+        self.statements.clear()
+        self.cache.get(models.Role, name="SUPPORT")
+        self.assertEqual(self.statements, [])
+
+    def test_rollback_keeps_cache(self):
+        self.cache.load()
+        self.session.add(models.Role(name="SALES"))
+        self.session.flush()
+        self.session.rollback()
+        self.statements.clear()
+        self.assertIsNone(self.cache.get(models.Role, name="SALES"))
+        self.assertEqual(self.statements, [])
+
+    def test_unregistered_model(self):
+        with self.assertRaises(KeyError):
+            self.cache.get(models.Event, id=1)
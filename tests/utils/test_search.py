@@ -0,0 +1,28 @@
+import unittest
+from utils import index_grams, query_grams, search_words
+
+
+class TestSearchGrams(unittest.TestCase):
+
+    def test_words_are_lowercase_without_accents(self):
+        self.assertEqual(
+            search_words("Hélène DUPONT-Léger <h.dupont@acme.fr>"),
+            ["helene", "dupont", "leger", "h", "dupont", "acme", "fr"],
+        )
+        self.assertEqual(search_words(None), [])
+
+    def test_index_grams_mark_the_start_and_end_of_words(self):
+        self.assertEqual(
+            index_grams("Dupont"),
+            {" du", "dup", "upo", "pon", "ont", "nt "},
+        )
+
+    def test_query_grams_match_prefixes(self):
+        self.assertEqual(query_grams("Dup"), {" du", "dup"})
+        self.assertLessEqual(query_grams("Dupo"), index_grams("Dupont"))
+        # Words of a single letter are ignored
+        self.assertEqual(query_grams("d"), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
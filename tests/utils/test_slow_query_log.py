@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+import controllers
+import models
+from utils import SlowQueryLog
+
+
+class TestSlowQueryLog(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # A file database: the plans are read on another connection
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(directory.name, 'test.db')}"
+        )
+        self.addCleanup(self.engine.dispose)
+        models.Base.metadata.create_all(self.engine)
+        self.session = Session(bind=self.engine)
+        self.addCleanup(self.session.close)
+        self.path = os.path.join(directory.name, "slow.log")
+        self.log = SlowQueryLog()
+        self.addCleanup(self.log.close)
+
+    def records(self):
+        self.log.wait()
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as log:
+            return [json.loads(line) for line in log]
+
+    def test_slow_select_is_logged_with_its_controller_and_plan(self):
+        self.log.attach(self.engine, self.path, threshold_ms=0)
+        controller = controllers.EventController(self.session, MagicMock())
+
+        controller.find_support_conflict(
+            1, datetime(2024, 1, 1), datetime(2024, 1, 2)
+        )
+
+        (record,) = [
+            record
+            for record in self.records()
+            if "FROM events" in record["statement"]
+        ]
+        self.assertEqual(
+            record["controller"], "EventController.find_support_conflict"
+        )
+        self.assertIn("2024-01-01", record["parameters"])
+        self.assertTrue(record["plan"])
+        self.assertIsInstance(record["full_scans"], list)
+
+    def test_writes_are_logged_without_plan(self):
+        self.log.attach(self.engine, self.path, threshold_ms=0)
+
+        self.session.execute(insert(models.Role).values(name="ROLE"))
+        self.session.commit()
+
+        (record,) = [
+            record
+            for record in self.records()
+            if record["statement"].startswith("INSERT")
+        ]
+        self.assertIsNone(record["controller"])
+        self.assertIsNone(record["plan"])
+
+    def test_fast_statements_are_not_logged(self):
+        self.log.attach(self.engine, self.path, threshold_ms=60000)
+
+        self.session.execute(insert(models.Role).values(name="ROLE"))
+        self.session.commit()
+
+        self.assertEqual(self.records(), [])
+
+    def test_watched_engine_is_explained_on_its_own_connection(self):
+        self.log.attach(self.engine, self.path, threshold_ms=0)
+        other = create_engine(self.engine.url)
+        self.addCleanup(other.dispose)
+        self.log.watch(other)
+
+        with other.connect() as connection:
+            connection.exec_driver_sql("SELECT name FROM roles")
+
+        (record,) = [
+            record
+            for record in self.records()
+            if record["statement"] == "SELECT name FROM roles"
+        ]
+        self.assertTrue(record["plan"])
@@ -0,0 +1,113 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+import constantes
+import database
+import models
+import utils
+from controllers import ContractController
+from tests.config_test import new_sqlite_session
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.session = new_sqlite_session()
+        role = models.Role(name=constantes.ROLE_SALES)
+        self.session.add(role)
+        self.session.flush()
+        sales = models.User(
+            username="sales",
+            full_name="Sales User",
+            email="sales@test.com",
+            phone_number="+33110203040",
+            role_id=role.id,
+        )
+        sales.password = "hash"
+        for index in range(25):
+            customer = models.Customer(
+                first_name="First",
+                last_name="Last",
+                email=f"customer{index}@test.com",
+                phone_number="+33110203042",
+                compagny_name=f"Company {index}",
+                sales_id=None,
+            )
+            customer.user = sales
+            self.session.add(
+                models.Contract(
+                    total_amount=100,
+                    remaining_amount=index % 2,
+                    is_signed=True,
+                    user=sales,
+                    customer=customer,
+                )
+            )
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_stream_query_reads_every_row(self):
+        query = self.session.query(models.Contract).order_by(
+            models.Contract.id
+        )
+        ids = [contract.id for contract in utils.stream_query(query, 10)]
+        self.assertEqual(ids, list(range(1, 26)))
+
+    def test_iter_contracts_with_filters(self):
+        controller = ContractController(self.session, MagicMock())
+        contracts = list(
+            controller.iter_contracts(
+                [models.Contract.remaining_amount > 0], batch_size=4
+            )
+        )
+        self.assertEqual(len(contracts), 12)
+        self.assertEqual(contracts[0].customer.user.username, "sales")
+
+    def test_streaming_session_reuses_sqlite_session(self):
+        with utils.streaming_session(self.session) as session:
+            self.assertIs(session, self.session)
+
+    @patch("database.create_engine")
+    def test_streaming_session_switches_mysql_driver(self, mock_engine):
+        mysql_session = MagicMock()
+        bind = mysql_session.get_bind.return_value
+        bind.dialect.name = "mysql"
+        bind.dialect.supports_server_side_cursors = False
+        bind.url = make_url("mysql+mysqlconnector://user:pw@localhost/db")
+        mock_engine.return_value = create_engine("sqlite://")
+
+        with patch.dict(utils.streaming._stream_engines, clear=True):
+            with utils.streaming_session(mysql_session) as session:
+                self.assertIsInstance(session, Session)
+                self.assertIsNot(session, mysql_session)
+        stream_url = mock_engine.call_args[0][0]
+        self.assertEqual(stream_url.drivername, "mysql+mysqldb")
+        # Built like the application engine, with its pool and listeners
+        self.assertIs(
+            mock_engine.call_args[1]["poolclass"], utils.MeteredQueuePool
+        )
+        self.assertTrue(
+            event.contains(
+                mock_engine.return_value,
+                "before_cursor_execute",
+                database.query_profiler._on_before_execute,
+            )
+        )
+
+    def test_stream_batch_size_from_environment(self):
+        with patch.dict(os.environ, {"STREAM_BATCH_SIZE": "250"}):
+            self.assertEqual(utils.get_stream_batch_size(), 250)
+        with patch.dict(os.environ, {"STREAM_BATCH_SIZE": "0"}):
+            self.assertEqual(
+                utils.get_stream_batch_size(),
+                constantes.DEFAULT_STREAM_BATCH_SIZE,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
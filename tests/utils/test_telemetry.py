@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from utils import CollectorSink, FileSink, Telemetry
+
+
+class BlockedSink(CollectorSink):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, events):
+        self.release.wait()
+        super().write(events)
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def new_logger(self, telemetry):
+        logger = logging.Logger("telemetry-test", logging.DEBUG)
+        logger.addHandler(telemetry.handler())
+        self.addCleanup(telemetry.close)
+        return logger
+
+    def test_records_reach_the_sinks(self):
+        collector = CollectorSink()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.jsonl")
+            telemetry = Telemetry([collector, FileSink(path)])
+            logger = self.new_logger(telemetry)
+
+            logger.info("Create customer : %s", "customer@test.com")
+            try:
+                raise ValueError("bad input")
+            except ValueError:
+                logger.exception("Import failed")
+            telemetry.close()
+
+            with open(path, encoding="utf-8") as log:
+                lines = [json.loads(line) for line in log]
+
+        self.assertEqual(
+            [event["message"] for event in collector.events],
+            ["Create customer : customer@test.com", "Import failed"],
+        )
+        self.assertIn("ValueError: bad input", lines[1]["exception"])
+        self.assertEqual(lines[0]["level"], "INFO")
+
+    def test_message_is_formatted_when_logged(self):
+        sink = BlockedSink()
+        telemetry = Telemetry([sink])
+        logger = self.new_logger(telemetry)
+        self.addCleanup(sink.release.set)
+
+        emails = ["first@test.com"]
+        logger.info("Import : %s", emails)
+        emails.append("second@test.com")
+        sink.release.set()
+        telemetry.flush()
+
+        self.assertEqual(
+            [event["message"] for event in sink.events],
+            ["Import : ['first@test.com']"],
+        )
+
+    def test_sampling_keeps_the_warnings(self):
+        collector = CollectorSink()
+        telemetry = Telemetry([collector], sample_rate=0)
+        logger = self.new_logger(telemetry)
+
+        for _ in range(10):
+            logger.info("sampled out")
+        logger.warning("kept")
+        telemetry.flush()
+
+        self.assertEqual(
+            [event["message"] for event in collector.events], ["kept"]
+        )
+        self.assertEqual(telemetry.sampled_out, 10)
+
+    def test_logging_does_not_wait_for_a_slow_sink(self):
+        sink = BlockedSink()
+        telemetry = Telemetry([sink], queue_size=2)
+        logger = self.new_logger(telemetry)
+        self.addCleanup(sink.release.set)
+
+        start = time.perf_counter()
+        for index in range(50):
+            logger.info("record %d", index)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.5)
+        self.assertGreater(telemetry.dropped, 0)
+        sink.release.set()
+        telemetry.flush()
+        self.assertEqual(len(sink.events) + telemetry.dropped, 50)
@@ -31,6 +31,25 @@ class TestEventView(unittest.TestCase):
         self.assertEqual(result, "test event name")
         self.console.print("Event name : ", style="input")
 
+    @patch("views.event_view.readline")
+    @patch("builtins.input", side_effect=["Wedding Paris"])
+    def test_input_event_name_completes_with_tab(self, mock_input, readline):
+        readline.__doc__ = "GNU readline"
+        readline.get_completer.return_value = None
+        readline.get_completer_delims.return_value = " "
+
+        result = self.view.input_event_name(
+            lambda prefix: ["Wedding Lyon", "Wedding Paris"]
+        )
+
+        self.assertEqual(result, "Wedding Paris")
+        completer = readline.set_completer.call_args_list[0][0][0]
+        self.assertEqual(completer("Wed", 0), "Wedding Lyon")
+        self.assertEqual(completer("Wed", 1), "Wedding Paris")
+        self.assertIsNone(completer("Wed", 2))
+        readline.set_completer.assert_called_with(None)
+        readline.set_completer_delims.assert_called_with(" ")
+
     @patch("builtins.input", side_effect=["test location"])
     def test_input_event_location(self, mock_input):
         result = self.view.input_event_location()
@@ -0,0 +1,31 @@
+from .pagination import KeysetPaginator, get_page_size
+from .streaming import (
+    get_stream_batch_size,
+    get_stream_engine,
+    set_stream_engine_factory,
+    streaming_session,
+    stream_query,
+)
+from .pool_metrics import PoolMetrics, MeteredQueuePool
+from .reference_cache import ReferenceCache
+from .bulk import (
+    RejectFile,
+    batched,
+    get_import_batch_size,
+    get_import_workers,
+)
+from .export import open_export, write_csv, write_ndjson
+from .index_advisor import IndexAdvisor, explain_prefix, full_scan_tables
+from .interval_tree import IntervalTree
+from .search import index_grams, query_grams, search_words
+from .prefix_index import PrefixIndex
+from .query_profiler import QueryProfiler
+from .slow_query_log import SlowQueryLog
+from .telemetry import (
+    CollectorSink,
+    FileSink,
+    SentrySink,
+    StreamSink,
+    Telemetry,
+    TelemetryHandler,
+)
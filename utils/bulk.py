@@ -0,0 +1,131 @@
+import csv
+import os
+from itertools import islice
+import constantes
+
+
+def get_import_batch_size():
+    """
+    Returns the number of rows inserted per transaction by the bulk imports.
+
+    The batch size is read from the IMPORT_BATCH_SIZE environment variable and falls
+    back to constantes.DEFAULT_IMPORT_BATCH_SIZE when it is missing or invalid.
+
+    Returns:
+        int: The batch size.
+    """
+    try:
+        batch_size = int(
+            os.getenv("IMPORT_BATCH_SIZE", constantes.DEFAULT_IMPORT_BATCH_SIZE)
+        )
+    except ValueError:
+        return constantes.DEFAULT_IMPORT_BATCH_SIZE
+    if batch_size <= 0:
+        return constantes.DEFAULT_IMPORT_BATCH_SIZE
+    return batch_size
+
+
+def get_import_workers():
+    """
+    Returns the number of worker processes used by the bulk imports.
+
+    The number is read from the IMPORT_WORKERS environment variable and falls back
+    to the number of cores of the machine.
+
+    Returns:
+        int: The number of worker processes.
+    """
+    default = os.cpu_count() or 1
+    try:
+        workers = int(os.getenv("IMPORT_WORKERS", default))
+    except ValueError:
+        return default
+    if workers <= 0:
+        return default
+    return workers
+
+
+def batched(iterable, size):
+    """
+    Splits an iterable into lists of at most size items.
+
+    Args:
+        iterable: The items to split.
+        size (int): The maximum number of items per list.
+
+    Yields:
+        list: The next batch of items.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class RejectFile:
+    """
+    The RejectFile class writes the rejected lines of a CSV import.
+
+    Each rejected line is written with its original columns followed by its line
+    number and the reason of the rejection, so the file can be fixed and imported
+    again. The file is only created when a first line is rejected.
+
+    Attributes:
+        path (str): The path of the reject file.
+        columns (list): The columns of the imported file.
+        count (int): The number of lines rejected so far.
+
+    Methods:
+        write(self, line, row, reason):
+            Writes a rejected line.
+
+        close(self):
+            Closes the reject file.
+    """
+
+    def __init__(self, path, columns):
+        """
+        Initializes the RejectFile with the given parameters.
+
+        Args:
+            path (str): The path of the reject file.
+            columns (list): The columns of the imported file.
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, line, row, reason):
+        """
+        Writes a rejected line.
+
+        Args:
+            line (int): The line number in the imported file.
+            row (dict): The values of the line, by column.
+            reason (str): The reason of the rejection.
+        """
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns + ["line", "error"])
+        self._writer.writerow(
+            [row.get(column, "") for column in self.columns]
+            + [line, reason]
+        )
+        self.count += 1
+
+    def close(self):
+        """
+        Closes the reject file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
@@ -0,0 +1,92 @@
+import csv
+import gzip
+import io
+import json
+import sys
+from contextlib import contextmanager
+import constantes
+
+
+@contextmanager
+def open_export(path=None, compress=None):
+    """
+    Opens the text stream an export is written to.
+
+    The stream writes UTF-8 text to the given file, or to the standard output
+    without path. It is gzip-compressed when compress is True or, when compress is
+    None, when the path ends with constantes.EXPORT_GZIP_SUFFIX. Data is compressed
+    and written as it comes, so the memory used does not depend on the export size.
+
+    Args:
+        path (str): The path of the export file (default is the standard output).
+        compress (bool): Whether to compress the export (default depends on the path).
+
+    Yields:
+        TextIOWrapper: The stream to write the export to.
+    """
+    if compress is None:
+        compress = bool(path) and path.endswith(constantes.EXPORT_GZIP_SUFFIX)
+    raw = open(path, "wb") if path else sys.stdout.buffer
+    binary = raw
+    if compress:
+        binary = gzip.GzipFile(
+            fileobj=raw,
+            mode="wb",
+            compresslevel=constantes.EXPORT_GZIP_LEVEL,
+        )
+    stream = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    try:
+        yield stream
+    finally:
+        # Detach so that the standard output is flushed but never closed
+        stream.flush()
+        stream.detach()
+        if compress:
+            binary.close()
+        if path:
+            raw.close()
+        else:
+            raw.flush()
+
+
+def write_csv(stream, columns, rows):
+    """
+    Writes rows to a stream as CSV, one line per row, after a header line.
+
+    Args:
+        stream: The text stream to write to.
+        columns (tuple): The column names.
+        rows: An iterable of value tuples, in the order of the columns.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_ndjson(stream, columns, rows):
+    """
+    Writes rows to a stream as NDJSON, one JSON object per line.
+
+    Dates and other values JSON does not support are written as strings.
+
+    Args:
+        stream: The text stream to write to.
+        columns (tuple): The column names.
+        rows: An iterable of value tuples, in the order of the columns.
+
+    Returns:
+        int: The number of rows written.
+    """
+    encoder = json.JSONEncoder(default=str)
+    count = 0
+    for row in rows:
+        stream.write(encoder.encode(dict(zip(columns, row))) + "\n")
+        count += 1
+    return count
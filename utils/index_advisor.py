@@ -0,0 +1,152 @@
+import re
+
+# Plan lines reading a whole table, by dialect
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+POSTGRESQL_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def explain_prefix(dialect_name):
+    """
+    Returns the statement prefix giving the plan of a query.
+
+    Args:
+        dialect_name (str): The name of the database dialect.
+
+    Returns:
+        str: "EXPLAIN QUERY PLAN " on SQLite, "EXPLAIN " otherwise.
+    """
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return "EXPLAIN "
+
+
+def full_scan_tables(dialect_name, plan):
+    """
+    Returns the tables a plan reads in full.
+
+    Args:
+        dialect_name (str): The name of the database dialect.
+        plan (list): The steps of the plan, each as a dict of the EXPLAIN columns.
+
+    Returns:
+        list: The sorted names of the tables read in full.
+    """
+    tables = set()
+    for step in plan:
+        if dialect_name == "mysql":
+            if str(step.get("type")).upper() == "ALL":
+                tables.add(step["table"])
+        elif dialect_name == "sqlite":
+            match = SQLITE_FULL_SCAN.match(step["detail"])
+            if match:
+                tables.add(match.group(1))
+        else:
+            for line in step.values():
+                tables.update(POSTGRESQL_FULL_SCAN.findall(str(line)))
+    return sorted(tables)
+
+
+class IndexAdvisor:
+    """
+    The IndexAdvisor class explains queries and flags the tables they read in full.
+
+    The plan is read with the EXPLAIN statement of the database: a table is read in
+    full when MySQL accesses it with the ALL type, when SQLite scans it without an
+    index, or when PostgreSQL reads it with a sequential scan.
+
+    Attributes:
+        session: The database session the queries are explained on.
+
+    Methods:
+        __init__(self, session):
+            Initializes the IndexAdvisor with the given session.
+
+        explain(self, query):
+            Returns the plan of a query, one line per step.
+
+        full_scans(self, query):
+            Returns the tables a query reads in full.
+
+        advise(self, queries):
+            Explains named queries and returns their full scans and plans.
+    """
+
+    def __init__(self, session):
+        """
+        Initializes the IndexAdvisor with the given session.
+
+        Args:
+            session: The database session the queries are explained on.
+        """
+        self.session = session
+        self.dialect_name = session.get_bind().dialect.name
+
+    def explain(self, query):
+        """
+        Returns the plan of a query, one line per step.
+
+        The query is compiled with bound parameters, which are passed to the driver
+        along with the EXPLAIN statement: its values are neither rendered in the
+        SQL nor parsed again.
+
+        Args:
+            query: An ORM query or a Select statement.
+
+        Returns:
+            list: The steps of the plan, each as a dict of the EXPLAIN columns.
+        """
+        statement = getattr(query, "statement", query)
+        dialect = self.session.get_bind().dialect
+        compiled = statement.compile(
+            dialect=dialect, compile_kwargs={"render_postcompile": True}
+        )
+        parameters = {}
+        for name, value in compiled.params.items():
+            bind = compiled.binds.get(name)
+            processor = None
+            if bind is not None:
+                processor = bind.type.bind_processor(dialect)
+            parameters[name] = processor(value) if processor else value
+        if compiled.positional:
+            parameters = tuple(
+                parameters[name] for name in compiled.positiontup
+            )
+        result = self.session.connection().exec_driver_sql(
+            explain_prefix(self.dialect_name) + str(compiled), parameters
+        )
+        return [dict(row._mapping) for row in result]
+
+    def full_scans(self, query):
+        """
+        Returns the tables a query reads in full.
+
+        Args:
+            query: An ORM query or a Select statement.
+
+        Returns:
+            tuple: The plan of the query and the sorted names of the tables read in full.
+        """
+        plan = self.explain(query)
+        return plan, full_scan_tables(self.dialect_name, plan)
+
+    def advise(self, queries):
+        """
+        Explains named queries and returns their full scans and plans.
+
+        Args:
+            queries (dict): The queries to explain, by name.
+
+        Yields:
+            tuple: The name of the query, the tables it reads in full separated by
+            commas, and its plan as a single line.
+        """
+        for name, query in queries.items():
+            plan, tables = self.full_scans(query)
+            yield (
+                name,
+                ", ".join(tables),
+                " | ".join(
+                    " ".join(str(value) for value in step.values())
+                    for step in plan
+                ),
+            )
@@ -0,0 +1,191 @@
+import random
+
+
+class _Node:
+    __slots__ = (
+        "start",
+        "end",
+        "value",
+        "priority",
+        "max_end",
+        "left",
+        "right",
+    )
+
+    def __init__(self, start, end, value):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.priority = random.random()
+        self.max_end = end
+        self.left = None
+        self.right = None
+
+    def update(self):
+        self.max_end = self.end
+        for child in (self.left, self.right):
+            if child is not None and child.max_end > self.max_end:
+                self.max_end = child.max_end
+
+
+class IntervalTree:
+    """
+    The IntervalTree class stores half-open intervals [start, end) and finds the
+    ones overlapping a period.
+
+    The intervals are kept in a treap ordered by start, each node knowing the
+    greatest end of its subtree, so adding an interval takes O(log n) and finding
+    the k intervals overlapping a period O(log n + k), on average. Bounds can be any
+    comparable values (datetimes, numbers).
+
+    Methods:
+        __init__(self, intervals=()):
+            Initializes the tree with the given (start, end, value) intervals.
+
+        add(self, start, end, value=None):
+            Adds an interval.
+
+        overlaps(self, start, end):
+            Returns the intervals overlapping a period.
+
+        first_overlap(self, start, end):
+            Returns the first interval overlapping a period.
+
+        any_overlap(self, start, end):
+            Tells whether an interval overlaps a period.
+    """
+
+    def __init__(self, intervals=()):
+        """
+        Initializes the tree with the given intervals.
+
+        Args:
+            intervals: An iterable of (start, end, value) tuples (default is empty).
+        """
+        self._root = None
+        self._size = 0
+        for start, end, value in intervals:
+            self.add(start, end, value)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, start, end, value=None):
+        """
+        Adds an interval.
+
+        Args:
+            start: The start of the interval, included.
+            end: The end of the interval, excluded.
+            value: The value attached to the interval (default is None).
+        """
+        self._root = self._insert(self._root, _Node(start, end, value))
+        self._size += 1
+
+    def overlaps(self, start, end):
+        """
+        Returns the intervals overlapping a period.
+
+        Intervals only touching the period (ending at its start or starting at its
+        end) do not overlap it.
+
+        Args:
+            start: The start of the period, included.
+            end: The end of the period, excluded.
+
+        Returns:
+            list: The (start, end, value) intervals, by start.
+        """
+        found = []
+        self._search(self._root, start, end, found, limit=None)
+        return found
+
+    def first_overlap(self, start, end):
+        """
+        Returns the first interval overlapping a period.
+
+        Args:
+            start: The start of the period, included.
+            end: The end of the period, excluded.
+
+        Returns:
+            tuple: The (start, end, value) interval starting first, or None.
+        """
+        found = []
+        self._search(self._root, start, end, found, limit=1)
+        return found[0] if found else None
+
+    def any_overlap(self, start, end):
+        """
+        Tells whether an interval overlaps a period.
+
+        Follows a single path from the root, in O(log n) on average: the left
+        subtree is only entered when an interval of it ends after the start of the
+        period, and then holds an overlap if any interval does.
+
+        Args:
+            start: The start of the period, included.
+            end: The end of the period, excluded.
+
+        Returns:
+            bool: True if an interval overlaps the period.
+        """
+        node = self._root
+        while node is not None:
+            if node.start < end and node.end > start:
+                return True
+            if node.left is not None and node.left.max_end > start:
+                node = node.left
+            elif node.start >= end:
+                return False
+            else:
+                node = node.right
+        return False
+
+    def _insert(self, node, new):
+        if node is None:
+            return new
+        if new.start < node.start:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    @staticmethod
+    def _rotate_right(node):
+        left = node.left
+        node.left = left.right
+        left.right = node
+        node.update()
+        left.update()
+        return left
+
+    @staticmethod
+    def _rotate_left(node):
+        right = node.right
+        node.right = right.left
+        right.left = node
+        node.update()
+        right.update()
+        return right
+
+    def _search(self, node, start, end, found, limit):
+        # No interval of the subtree ends after the start of the period
+        if node is None or node.max_end <= start:
+            return
+        self._search(node.left, start, end, found, limit)
+        if limit is not None and len(found) >= limit:
+            return
+        # The node and its right subtree start at or after the end of the period
+        if node.start >= end:
+            return
+        if node.end > start:
+            found.append((node.start, node.end, node.value))
+            if limit is not None and len(found) >= limit:
+                return
+        self._search(node.right, start, end, found, limit)
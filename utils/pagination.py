@@ -0,0 +1,146 @@
+import os
+import constantes
+
+
+def get_page_size():
+    """
+    Returns the number of rows displayed per page.
+
+    The page size is read from the PAGE_SIZE environment variable and falls back
+    to constantes.DEFAULT_PAGE_SIZE when it is missing or invalid.
+
+    Returns:
+        int: The page size.
+    """
+    try:
+        page_size = int(os.getenv("PAGE_SIZE", constantes.DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return constantes.DEFAULT_PAGE_SIZE
+    if page_size <= 0:
+        return constantes.DEFAULT_PAGE_SIZE
+    return page_size
+
+
+class KeysetPaginator:
+    """
+    The KeysetPaginator class pages through a query using keyset (seek) pagination.
+
+    Instead of an OFFSET, each page is fetched with a "key > last key seen" (or
+    "key < first key seen" when going back) condition on a unique indexed column,
+    so fetching any page costs the same whatever the size of the table.
+
+    Attributes:
+        query: The query to page through.
+        key_column: The unique indexed column used to order the pages.
+        page_size: The number of rows per page.
+        key: A callable returning the key value of a row.
+        has_previous: True if a page exists before the current one.
+        has_next: True if a page exists after the current one.
+
+    Methods:
+        first_page(self):
+            Fetches the first page.
+
+        next_page(self):
+            Fetches the page after the current one.
+
+        previous_page(self):
+            Fetches the page before the current one.
+
+        navigate(self, choice):
+            Fetches the page matching a navigation choice.
+    """
+
+    def __init__(self, query, key_column, page_size=None, key=None):
+        """
+        Initializes the KeysetPaginator with the given parameters.
+
+        Args:
+            query: The query to page through.
+            key_column: The unique indexed column used to order the pages.
+            page_size: The number of rows per page (default is the configured page size).
+            key: A callable returning the key value of a row (default reads the
+                attribute named after key_column).
+        """
+        self.query = query
+        self.key_column = key_column
+        self.page_size = page_size or get_page_size()
+        self.key = key or (lambda row: getattr(row, key_column.key))
+        self.first_key = None
+        self.last_key = None
+        self.has_previous = False
+        self.has_next = False
+
+    def first_page(self):
+        """
+        Fetches the first page.
+
+        Returns:
+            list: The rows of the first page.
+        """
+        rows = self._fetch(self.query.order_by(self.key_column.asc()))
+        self.has_previous = False
+        self.has_next = len(rows) > self.page_size
+        return self._set_page(rows[: self.page_size])
+
+    def next_page(self):
+        """
+        Fetches the page after the current one.
+
+        Returns:
+            list: The rows of the next page.
+        """
+        if self.last_key is None:
+            return self.first_page()
+        rows = self._fetch(
+            self.query.filter(self.key_column > self.last_key).order_by(
+                self.key_column.asc()
+            )
+        )
+        self.has_previous = True
+        self.has_next = len(rows) > self.page_size
+        return self._set_page(rows[: self.page_size])
+
+    def previous_page(self):
+        """
+        Fetches the page before the current one.
+
+        Returns:
+            list: The rows of the previous page.
+        """
+        if self.first_key is None:
+            return self.first_page()
+        rows = self._fetch(
+            self.query.filter(self.key_column < self.first_key).order_by(
+                self.key_column.desc()
+            )
+        )
+        self.has_previous = len(rows) > self.page_size
+        self.has_next = True
+        return self._set_page(list(reversed(rows[: self.page_size])))
+
+    def navigate(self, choice):
+        """
+        Fetches the page matching a navigation choice.
+
+        Args:
+            choice (str): constantes.PAGE_NEXT, constantes.PAGE_PREVIOUS or any other value to stop.
+
+        Returns:
+            list: The rows of the selected page, or None when the user stops browsing.
+        """
+        if choice == constantes.PAGE_NEXT and self.has_next:
+            return self.next_page()
+        if choice == constantes.PAGE_PREVIOUS and self.has_previous:
+            return self.previous_page()
+        return None
+
+    def _fetch(self, query):
+        # One extra row tells whether another page exists in that direction.
+        return query.limit(self.page_size + 1).all()
+
+    def _set_page(self, rows):
+        if rows:
+            self.first_key = self.key(rows[0])
+            self.last_key = self.key(rows[-1])
+        return rows
@@ -0,0 +1,175 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    The PoolMetrics class collects statistics about a connection pool.
+
+    Attributes:
+        checkouts: The number of connections handed out by the pool.
+        overflow_checkouts: The number of checkouts that opened an overflow connection.
+        max_overflow_used: The highest number of overflow connections open at once.
+        connects: The number of new database connections opened.
+        invalidations: The number of connections invalidated (disconnects, pre-ping failures...).
+        timeouts: The number of checkouts that gave up waiting for a connection.
+        total_wait: The total time spent waiting for a connection, in seconds.
+        max_wait: The longest time spent waiting for a connection, in seconds.
+
+    Methods:
+        attach(self, engine):
+            Starts collecting the statistics of the engine's pool.
+
+        record_wait(self, seconds, overflow, opened_overflow=False):
+            Records the time a checkout waited for a connection.
+
+        snapshot(self):
+            Returns the collected statistics.
+
+        reset(self):
+            Resets the collected statistics.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty PoolMetrics.
+        """
+        self._lock = threading.Lock()
+        self.pool = None
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the collected statistics.
+        """
+        with self._lock:
+            self.checkouts = 0
+            self.overflow_checkouts = 0
+            self.max_overflow_used = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def attach(self, engine):
+        """
+        Starts collecting the statistics of the engine's pool.
+
+        Checkout wait times are only measured when the engine uses MeteredQueuePool.
+
+        Args:
+            engine: The engine whose pool is observed.
+        """
+        self.pool = engine.pool
+        if isinstance(engine.pool, MeteredQueuePool):
+            engine.pool.metrics = self
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_invalidate)
+
+    def record_wait(self, seconds, overflow, opened_overflow=False):
+        """
+        Records the time a checkout waited for a connection.
+
+        Args:
+            seconds (float): The time spent waiting.
+            overflow (int): The number of overflow connections open after the checkout.
+            opened_overflow (bool): Whether the checkout opened an overflow connection
+                (default is False); checkouts reusing a pooled connection while other
+                overflow connections are open are not counted.
+        """
+        with self._lock:
+            self.waits += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if opened_overflow:
+                self.overflow_checkouts += 1
+            self.max_overflow_used = max(self.max_overflow_used, overflow)
+
+    def record_timeout(self):
+        """
+        Records a checkout that gave up waiting for a connection.
+        """
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        """
+        Returns the collected statistics.
+
+        Returns:
+            dict: The statistics, with the current state of the pool when available.
+        """
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "max_overflow_used": self.max_overflow_used,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(
+                    self.total_wait * 1000 / self.waits if self.waits else 0, 3
+                ),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+        if isinstance(self.pool, QueuePool):
+            stats["pool_size"] = self.pool.size()
+            stats["checked_out"] = self.pool.checkedout()
+            stats["overflow"] = max(self.pool.overflow(), 0)
+        return stats
+
+    def _on_checkout(self, dbapi_connection, connection_record, proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    A QueuePool reporting how long each checkout waited for a connection.
+
+    Attributes:
+        metrics: The PoolMetrics receiving the wait times (default is None).
+    """
+
+    metrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        before = self.overflow()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            overflow = self.overflow()
+            self.metrics.record_wait(
+                time.perf_counter() - start,
+                max(overflow, 0),
+                overflow > max(before, 0),
+            )
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
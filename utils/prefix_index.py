@@ -0,0 +1,89 @@
+from bisect import bisect_left, insort
+
+
+class PrefixIndex:
+    """
+    The PrefixIndex class finds the names starting with a prefix.
+
+    The names are kept in a list sorted by their case folded form, so the names
+    starting with a prefix are contiguous: they are found with a binary search in
+    O(log n + k) for k names returned, and a name is added or removed in O(n)
+    memory moves, which stays cheap for the few thousand names of a session.
+    Matching ignores the case.
+
+    Methods:
+        __init__(self, names=()):
+            Initializes the index with the given names.
+
+        add(self, name):
+            Adds a name.
+
+        discard(self, name):
+            Removes a name if it is present.
+
+        complete(self, prefix, limit=None):
+            Returns the names starting with a prefix, in alphabetical order.
+    """
+
+    def __init__(self, names=()):
+        """
+        Initializes the index with the given names.
+
+        Args:
+            names: An iterable of str (default is empty).
+        """
+        self._entries = sorted({(name.casefold(), name) for name in names})
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        entry = (name.casefold(), name)
+        position = bisect_left(self._entries, entry)
+        return (
+            position < len(self._entries) and self._entries[position] == entry
+        )
+
+    def add(self, name):
+        """
+        Adds a name.
+
+        Args:
+            name (str): The name to add.
+        """
+        if name not in self:
+            insort(self._entries, (name.casefold(), name))
+
+    def discard(self, name):
+        """
+        Removes a name if it is present.
+
+        Args:
+            name (str): The name to remove.
+        """
+        if name in self:
+            del self._entries[
+                bisect_left(self._entries, (name.casefold(), name))
+            ]
+
+    def complete(self, prefix, limit=None):
+        """
+        Returns the names starting with a prefix, in alphabetical order.
+
+        Args:
+            prefix (str): The beginning of the names, in any case.
+            limit (int): The maximum number of names returned (default is None, no limit).
+
+        Returns:
+            list[str]: The matching names.
+        """
+        key = prefix.casefold()
+        names = []
+        for position in range(
+            bisect_left(self._entries, (key,)), len(self._entries)
+        ):
+            folded, name = self._entries[position]
+            if not folded.startswith(key) or len(names) == limit:
+                break
+            names.append(name)
+        return names
@@ -0,0 +1,203 @@
+import contextvars
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event
+import constantes
+
+# The action running in the current thread, None outside of any action.
+current_action = contextvars.ContextVar("query_profiler_action", default=None)
+
+
+class _Action:
+    __slots__ = ("name", "started_at", "statements", "db_time", "counts")
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now()
+        self.statements = 0
+        self.db_time = 0.0
+        self.counts = Counter()
+
+
+class QueryProfiler:
+    """
+    The QueryProfiler class counts the SQL statements of each action and measures
+    their execution time.
+
+    An action is a controller method called from the menu or a headless command,
+    named after its class and method (e.g. ContractController.list_contracts).
+    Once the engine is attached, every statement executed while an action runs is
+    counted for it, with the time spent in the database. A statement run many times
+    by the same action, the mark of an N+1 query, is reported with its count. Nested
+    controller calls belong to the outermost action. Statements run outside of any
+    action, or by worker threads, are not recorded.
+
+    Attributes:
+        log_path: The file the actions are appended to as JSON lines, or None.
+        on_action: The function called with the summary of each finished action, or None.
+
+    Methods:
+        __init__(self, log_path=None):
+            Initializes the QueryProfiler with the given parameters.
+
+        attach(self, engine):
+            Starts counting the statements of the engine.
+
+        action(self, name):
+            Records the statements run in the block as one action.
+
+        instrument(self, controller, exclude=()):
+            Makes every public method of a controller an action.
+
+        summaries(self):
+            Returns the summaries of the finished actions.
+    """
+
+    def __init__(self, log_path=None):
+        """
+        Initializes the QueryProfiler with the given parameters.
+
+        Args:
+            log_path (str): The JSON lines file the actions are appended to (default is None).
+        """
+        self._lock = threading.Lock()
+        self._summaries = []
+        self.log_path = log_path
+        self.on_action = None
+
+    def attach(self, engine):
+        """
+        Starts counting the statements of the engine.
+
+        Args:
+            engine: The engine whose statements are counted.
+        """
+        if not event.contains(
+            engine, "before_cursor_execute", self._on_before_execute
+        ):
+            event.listen(
+                engine, "before_cursor_execute", self._on_before_execute
+            )
+            event.listen(
+                engine, "after_cursor_execute", self._on_after_execute
+            )
+
+    @contextmanager
+    def action(self, name):
+        """
+        Records the statements run in the block as one action.
+
+        When the block ends, the summary of the action is kept, appended to the log
+        file and passed to on_action.
+
+        Args:
+            name (str): The name of the action.
+
+        Yields:
+            None
+        """
+        action = _Action(name)
+        token = current_action.set(action)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current_action.reset(token)
+            self._finish(action, time.perf_counter() - start)
+
+    def instrument(self, controller, exclude=()):
+        """
+        Makes every public method of a controller an action.
+
+        The methods are wrapped on the instance, the class is left untouched. A
+        method called while another action runs belongs to that action. Generator
+        methods are not wrapped, since they run after they return.
+
+        Args:
+            controller: The controller to instrument.
+            exclude: The names of the methods left as they are (default is empty).
+
+        Returns:
+            The controller.
+        """
+        cls = type(controller)
+        for name, function in inspect.getmembers(cls, inspect.isfunction):
+            if (
+                name.startswith("_")
+                or name in exclude
+                or inspect.isgeneratorfunction(function)
+            ):
+                continue
+            method = getattr(controller, name)
+            setattr(
+                controller, name, self._wrap(f"{cls.__name__}.{name}", method)
+            )
+        return controller
+
+    def summaries(self):
+        """
+        Returns the summaries of the finished actions.
+
+        Returns:
+            list[dict]: The summaries, oldest first.
+        """
+        with self._lock:
+            return list(self._summaries)
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if current_action.get() is not None:
+                return method(*args, **kwargs)
+            with self.action(name):
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    def _finish(self, action, elapsed):
+        statement, repeats = (
+            action.counts.most_common(1)[0] if action.counts else (None, 0)
+        )
+        summary = {
+            "action": action.name,
+            "started_at": action.started_at.isoformat(timespec="seconds"),
+            "statements": action.statements,
+            "db_ms": round(action.db_time * 1000, 3),
+            "total_ms": round(elapsed * 1000, 3),
+            "max_repeats": repeats,
+            "repeated_statement": (
+                " ".join(statement.split())
+                if repeats >= constantes.PROFILE_REPEATED_STATEMENT
+                else None
+            ),
+        }
+        with self._lock:
+            self._summaries.append(summary)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as log:
+                    log.write(json.dumps(summary) + "\n")
+        if self.on_action is not None:
+            self.on_action(summary)
+
+    def _on_before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if current_action.get() is not None:
+            context.query_profiler_start = time.perf_counter()
+
+    def _on_after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        action = current_action.get()
+        start = getattr(context, "query_profiler_start", None)
+        if action is None or start is None:
+            return
+        action.statements += 1
+        action.db_time += time.perf_counter() - start
+        action.counts[statement] += 1
@@ -0,0 +1,165 @@
+import threading
+from types import SimpleNamespace
+from sqlalchemy import event, inspect
+
+
+class ReferenceCache:
+    """
+    The ReferenceCache class keeps small, rarely changing tables in memory.
+
+    Each registered model is read with a single query the first time it is looked
+    up, then served from memory. The cached rows are detached snapshots holding the
+    column values only, so reading them never triggers a lazy load or a refresh.
+    The rows of a model are dropped, and reloaded on next use, when a session the
+    cache is attached to commits a change to that model.
+
+    Attributes:
+        session: The session used to load the cached tables.
+
+    Methods:
+        register(self, model, *keys):
+            Registers a model and the columns it is looked up by.
+
+        attach(self, session):
+            Uses the session to load the cached tables and watches its commits.
+
+        load(self):
+            Loads every registered table that is not cached yet.
+
+        get(self, model, **criteria):
+            Returns the cached row matching a lookup column value.
+
+        all(self, model):
+            Returns all the cached rows of a model.
+
+        invalidate(self, model=None):
+            Drops the cached rows of a model, or of every model.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ReferenceCache.
+        """
+        self._lock = threading.RLock()
+        self._keys = {}
+        self._rows = {}
+        self._indexes = {}
+        self.session = None
+
+    def register(self, model, *keys):
+        """
+        Registers a model and the columns it is looked up by.
+
+        Args:
+            model: The mapped class to cache.
+            *keys (str): The names of the columns used by get (default is the primary key).
+        """
+        if not keys:
+            keys = tuple(column.key for column in inspect(model).primary_key)
+        with self._lock:
+            self._keys[model] = keys
+            self._rows.pop(model, None)
+
+    def attach(self, session):
+        """
+        Uses the session to load the cached tables and watches its commits.
+
+        Nothing is read here: the tables are loaded by load, or on first lookup.
+
+        Args:
+            session: The application session.
+        """
+        with self._lock:
+            self.session = session
+            self._rows.clear()
+            self._indexes.clear()
+        if not event.contains(session, "after_flush", self._on_after_flush):
+            event.listen(session, "after_flush", self._on_after_flush)
+            event.listen(session, "after_commit", self._on_after_commit)
+            event.listen(session, "after_rollback", self._on_after_rollback)
+
+    def load(self):
+        """
+        Loads every registered table that is not cached yet.
+        """
+        with self._lock:
+            for model in self._keys:
+                self._ensure_loaded(model)
+
+    def get(self, model, **criteria):
+        """
+        Returns the cached row matching a lookup column value.
+
+        Args:
+            model: The registered mapped class.
+            **criteria: Exactly one registered column and its value, e.g. name="MANAGER".
+
+        Returns:
+            SimpleNamespace: The matching row, or None.
+        """
+        ((key, value),) = criteria.items()
+        with self._lock:
+            self._ensure_loaded(model)
+            return self._indexes[model][key].get(value)
+
+    def all(self, model):
+        """
+        Returns all the cached rows of a model.
+
+        Args:
+            model: The registered mapped class.
+
+        Returns:
+            list[SimpleNamespace]: The cached rows.
+        """
+        with self._lock:
+            self._ensure_loaded(model)
+            return list(self._rows[model])
+
+    def invalidate(self, model=None):
+        """
+        Drops the cached rows of a model, or of every model.
+
+        Args:
+            model: The mapped class to drop (default is None for every model).
+        """
+        with self._lock:
+            if model is None:
+                self._rows.clear()
+                self._indexes.clear()
+            else:
+                self._rows.pop(model, None)
+                self._indexes.pop(model, None)
+
+    def _ensure_loaded(self, model):
+        if model in self._rows:
+            return
+        if model not in self._keys:
+            raise KeyError(f"{model.__name__} is not a cached model")
+        if self.session is None:
+            raise RuntimeError("ReferenceCache is not attached to a session")
+        columns = [attribute.key for attribute in inspect(model).column_attrs]
+        rows = [
+            SimpleNamespace(
+                **{column: getattr(instance, column) for column in columns}
+            )
+            for instance in self.session.query(model).all()
+        ]
+        self._rows[model] = rows
+        self._indexes[model] = {
+            key: {getattr(row, key): row for row in rows}
+            for key in self._keys[model]
+        }
+
+    def _on_after_flush(self, session, flush_context):
+        changed = session.info.setdefault("reference_cache_changed", set())
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if type(instance) in self._keys:
+                changed.add(type(instance))
+
+    def _on_after_commit(self, session):
+        for model in session.info.pop("reference_cache_changed", set()):
+            self.invalidate(model)
+
+    def _on_after_rollback(self, session):
+        session.info.pop("reference_cache_changed", None)
@@ -0,0 +1,70 @@
+import re
+import unicodedata
+import constantes
+
+WORD = re.compile(r"\w+")
+
+
+def search_words(text):
+    """
+    Splits a text into lowercase words without accents.
+
+    Args:
+        text (str): The text to split; None gives no word.
+
+    Returns:
+        list: The words of the text, in order.
+    """
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return WORD.findall(stripped.casefold())
+
+
+def _grams(padded):
+    size = constantes.SEARCH_GRAM_SIZE
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+def index_grams(*values):
+    """
+    Returns the n-grams a record is indexed under.
+
+    Each word is padded with a space on both sides, so the first n-gram of a word
+    marks its start: "Dupont" gives " du", "dup", "upo", "pon", "ont" and "nt ".
+
+    Args:
+        *values (str): The indexed values of the record.
+
+    Returns:
+        set: The n-grams of every word of the values.
+    """
+    grams = set()
+    for value in values:
+        for word in search_words(value):
+            grams |= _grams(f" {word} ")
+    return grams
+
+
+def query_grams(text):
+    """
+    Returns the n-grams of a search.
+
+    The words are only padded at their start, so every word of the search also
+    matches the longer words it is a prefix of: "dup" finds "Dupont". Words shorter
+    than constantes.SEARCH_MIN_WORD_LENGTH are ignored.
+
+    Args:
+        text (str): The search typed by the user.
+
+    Returns:
+        set: The n-grams of the words of the search.
+    """
+    grams = set()
+    for word in search_words(text):
+        if len(word) >= constantes.SEARCH_MIN_WORD_LENGTH:
+            grams |= _grams(f" {word}")
+    return grams
@@ -0,0 +1,223 @@
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from sqlalchemy import event
+import constantes
+from .index_advisor import explain_prefix, full_scan_tables
+
+
+class SlowQueryLog:
+    """
+    The SlowQueryLog class records the statements slower than a threshold to a
+    rotating file, with their plan.
+
+    Each slow statement is written as a JSON line holding its duration, its
+    parameters, the controller method that ran it and the plan of the statement.
+    The plan is read by a background thread, on its own connection, so the action
+    that ran the statement is not slowed down: the statement is only timed and
+    queued. When the queue is full the statement is written without its plan.
+    Only SELECT statements are explained.
+
+    Attributes:
+        engine: The engine whose statements are timed, once attached.
+        threshold_ms: The duration from which a statement is recorded, in milliseconds.
+
+    Methods:
+        attach(self, engine, path, threshold_ms, max_bytes=..., backup_count=...):
+            Starts recording the slow statements of the engine.
+
+        watch(self, engine):
+            Also records the slow statements of another engine.
+
+        wait(self):
+            Waits until every queued statement has been written.
+
+        close(self):
+            Writes the queued statements and stops the background thread.
+    """
+
+    def __init__(self):
+        """
+        Initializes a SlowQueryLog attached to no engine.
+        """
+        self.engine = None
+        self.threshold_ms = None
+        self._engines = []
+        self._queue = queue.Queue(maxsize=constantes.SLOW_QUERY_QUEUE_SIZE)
+        self._logger = None
+        self._worker = None
+
+    def attach(
+        self,
+        engine,
+        path,
+        threshold_ms,
+        max_bytes=constantes.DEFAULT_SLOW_QUERY_LOG_MAX_BYTES,
+        backup_count=constantes.DEFAULT_SLOW_QUERY_LOG_BACKUPS,
+    ):
+        """
+        Starts recording the slow statements of the engine.
+
+        The engines attached or watched before are no longer watched.
+
+        Args:
+            engine: The engine whose statements are timed.
+            path (str): The log file.
+            threshold_ms (float): The duration from which a statement is recorded.
+            max_bytes (int): The size from which the file is rotated.
+            backup_count (int): The number of rotated files kept.
+        """
+        for watched in self._engines:
+            event.remove(
+                watched, "before_cursor_execute", self._on_before_execute
+            )
+            event.remove(
+                watched, "after_cursor_execute", self._on_after_execute
+            )
+        self._engines = []
+        if self._logger is not None:
+            for handler in self._logger.handlers:
+                handler.close()
+        self.engine = engine
+        self.threshold_ms = threshold_ms
+        handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, delay=True
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        # Not registered in the logging tree: the root handlers (Sentry) do
+        # not receive the slow statements
+        self._logger = logging.Logger(__name__)
+        self._logger.addHandler(handler)
+        self.watch(engine)
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="slow-query-log", daemon=True
+            )
+            self._worker.start()
+
+    def watch(self, engine):
+        """
+        Also records the slow statements of another engine, with the settings given
+        to attach.
+
+        Does nothing when the log is not attached, or already watches the engine.
+
+        Args:
+            engine: The engine whose statements are timed.
+        """
+        if self._logger is None or engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._on_before_execute)
+        event.listen(engine, "after_cursor_execute", self._on_after_execute)
+        self._engines.append(engine)
+
+    def wait(self):
+        """
+        Waits until every queued statement has been written.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Writes the queued statements and stops the background thread.
+        """
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(constantes.SLOW_QUERY_CLOSE_TIMEOUT)
+        self._worker = None
+        for handler in self._logger.handlers:
+            handler.close()
+
+    def _on_before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        context.slow_query_log_start = time.perf_counter()
+
+    def _on_after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        start = getattr(context, "slow_query_log_start", None)
+        if start is None or threading.current_thread() is self._worker:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        record = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 3),
+            "controller": self._calling_controller(),
+            "statement": " ".join(statement.split()),
+            "parameters": repr(parameters)[
+                : constantes.SLOW_QUERY_PARAMETERS_LENGTH
+            ],
+            "plan": None,
+            "full_scans": None,
+        }
+        explain = not executemany and statement.lstrip().upper().startswith(
+            ("SELECT", "WITH")
+        )
+        try:
+            self._queue.put_nowait(
+                (
+                    record,
+                    conn.engine,
+                    statement if explain else None,
+                    parameters,
+                )
+            )
+        except queue.Full:
+            record["explain_error"] = "queue full"
+            self._write(record)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                record, engine, statement, parameters = item
+                if statement is not None:
+                    self._explain(record, engine, statement, parameters)
+                self._write(record)
+            except Exception as err:
+                print(f"slow query log : {err}", file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def _explain(self, record, engine, statement, parameters):
+        dialect_name = engine.dialect.name
+        try:
+            with engine.connect() as connection:
+                plan = [
+                    {key: str(value) for key, value in row._mapping.items()}
+                    for row in connection.exec_driver_sql(
+                        explain_prefix(dialect_name) + statement, parameters
+                    )
+                ]
+        except Exception as err:
+            record["explain_error"] = str(err)
+            return
+        record["plan"] = plan
+        record["full_scans"] = full_scan_tables(dialect_name, plan)
+
+    def _write(self, record):
+        self._logger.warning(json.dumps(record, default=str))
+
+    @staticmethod
+    def _calling_controller():
+        # The innermost controller method on the stack, only looked up for the
+        # slow statements
+        frame = sys._getframe(2)
+        while frame is not None:
+            owner = frame.f_locals.get("self")
+            if frame.f_globals.get("__name__", "").startswith("controllers."):
+                if owner is not None:
+                    return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        return None
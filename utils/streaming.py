@@ -0,0 +1,116 @@
+import functools
+import os
+from contextlib import contextmanager
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+import constantes
+
+# MySQL driver able to keep a server-side (unbuffered) cursor open while rows are read.
+STREAM_MYSQL_DRIVER = "mysql+mysqldb"
+
+_stream_engines = {}
+
+# Creates the streaming engines; database replaces it with the factory of the
+# application engine.
+_engine_factory = functools.partial(create_engine, pool_pre_ping=True)
+
+
+def get_stream_batch_size():
+    """
+    Returns the number of rows fetched from the server at a time when streaming.
+
+    The batch size is read from the STREAM_BATCH_SIZE environment variable and falls
+    back to constantes.DEFAULT_STREAM_BATCH_SIZE.
+
+    Returns:
+        int: The batch size.
+    """
+    try:
+        batch_size = int(
+            os.getenv("STREAM_BATCH_SIZE", constantes.DEFAULT_STREAM_BATCH_SIZE)
+        )
+    except ValueError:
+        return constantes.DEFAULT_STREAM_BATCH_SIZE
+    if batch_size <= 0:
+        return constantes.DEFAULT_STREAM_BATCH_SIZE
+    return batch_size
+
+
+def set_stream_engine_factory(factory):
+    """
+    Sets the function creating the streaming engines.
+
+    The application passes the factory of its own engine, so the streaming engines
+    share its pool settings and its statement listeners (profiler, slow query log).
+
+    Args:
+        factory: A function taking a database URL and returning an engine.
+    """
+    global _engine_factory
+    _engine_factory = factory
+
+
+def get_stream_engine(url):
+    """
+    Returns an engine able to stream results for the given database URL.
+
+    The application connects with mysql-connector, whose SQLAlchemy dialect always
+    buffers the whole result set. Streaming reads go through mysqlclient instead,
+    which supports server-side cursors. Engines are created once per URL, by the
+    factory given to set_stream_engine_factory.
+
+    Args:
+        url: The URL of the application database.
+
+    Returns:
+        Engine: The engine used for streaming reads.
+    """
+    stream_url = url.set(drivername=STREAM_MYSQL_DRIVER)
+    key = stream_url.render_as_string(hide_password=False)
+    if key not in _stream_engines:
+        _stream_engines[key] = _engine_factory(stream_url)
+    return _stream_engines[key]
+
+
+@contextmanager
+def streaming_session(session):
+    """
+    Provides a session whose queries can be read through a server-side cursor.
+
+    When the dialect of the given session already supports server-side cursors (or
+    is not MySQL), the session itself is used. Otherwise a short-lived session bound
+    to the mysqlclient engine is opened and closed afterwards.
+
+    Args:
+        session: The application session.
+
+    Yields:
+        Session: The session to build the streamed queries on.
+    """
+    bind = session.get_bind()
+    dialect = bind.dialect
+    if dialect.name != "mysql" or dialect.supports_server_side_cursors:
+        yield session
+        return
+    stream_session = Session(bind=get_stream_engine(bind.url))
+    try:
+        yield stream_session
+    finally:
+        stream_session.close()
+
+
+def stream_query(query, batch_size=None):
+    """
+    Iterates over the rows of a query without loading the whole result set.
+
+    The rows are fetched batch_size at a time from a server-side cursor
+    (stream_results) and turned into ORM objects one batch at a time (yield_per).
+
+    Args:
+        query: The query to read.
+        batch_size: The number of rows fetched at a time (default is the configured batch size).
+
+    Yields:
+        The rows of the query.
+    """
+    yield from query.yield_per(batch_size or get_stream_batch_size())
@@ -0,0 +1,371 @@
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import traceback
+from datetime import datetime
+import sentry_sdk
+import constantes
+
+
+class FileSink:
+    """
+    The FileSink class appends the telemetry events to a file, one JSON line each.
+
+    Methods:
+        __init__(self, path):
+            Initializes the FileSink with the given path.
+
+        write(self, events):
+            Appends a batch of events to the file.
+
+        close(self):
+            Closes the file.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the FileSink with the given path.
+
+        Args:
+            path (str): The file the events are appended to.
+        """
+        self.path = path
+        self._file = None
+
+    def write(self, events):
+        """
+        Appends a batch of events to the file.
+
+        Args:
+            events (list[dict]): The events.
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.writelines(
+            json.dumps(event, default=str) + "\n" for event in events
+        )
+        self._file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class StreamSink(FileSink):
+    """
+    The StreamSink class writes the telemetry events to a stream (stdout by
+    default), one JSON line each.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Initializes the StreamSink with the given stream.
+
+        Args:
+            stream: The stream the events are written to (default is sys.stdout).
+        """
+        super().__init__(None)
+        self._file = stream or sys.stdout
+
+    def close(self):
+        """
+        Flushes the stream, which stays open.
+        """
+        self._file.flush()
+
+
+class SentrySink:
+    """
+    The SentrySink class sends the telemetry events of a minimum level to Sentry.
+
+    Methods:
+        __init__(self, level=logging.ERROR):
+            Initializes the SentrySink with the given level.
+
+        write(self, events):
+            Sends the events of the minimum level to Sentry.
+
+        close(self):
+            Waits for Sentry to send the pending events.
+    """
+
+    def __init__(self, level=logging.ERROR):
+        """
+        Initializes the SentrySink with the given level.
+
+        Args:
+            level (int): The lowest level sent (default is logging.ERROR).
+        """
+        self.level = level
+
+    def write(self, events):
+        """
+        Sends the events of the minimum level to Sentry.
+
+        Args:
+            events (list[dict]): The events.
+        """
+        for event in events:
+            if event["levelno"] >= self.level:
+                sentry_sdk.capture_message(
+                    event["message"], level=event["level"].lower()
+                )
+
+    def close(self):
+        """
+        Waits for Sentry to send the pending events.
+        """
+        sentry_sdk.flush()
+
+
+class CollectorSink:
+    """
+    The CollectorSink class keeps the telemetry events in memory.
+
+    It stands in for a remote collector when working offline and in the tests.
+
+    Attributes:
+        events: The events received, oldest first.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty CollectorSink.
+        """
+        self._lock = threading.Lock()
+        self.events = []
+
+    def write(self, events):
+        """
+        Keeps a batch of events.
+
+        Args:
+            events (list[dict]): The events.
+        """
+        with self._lock:
+            self.events.extend(events)
+
+    def close(self):
+        """
+        Does nothing: the events stay available.
+        """
+
+
+class Telemetry:
+    """
+    The Telemetry class sends the log records to its sinks from a background
+    thread.
+
+    Logging a record only decides whether it is kept and queues it: the decision
+    is taken when the record is created (head-based sampling), records of
+    constantes.TELEMETRY_ALWAYS_KEPT_LEVEL and above always being kept, and a
+    record that does not fit in the bounded queue is dropped and counted instead
+    of waiting. A kept record is queued as a small event dict, with its message
+    and exception already formatted, as logging.handlers.QueueHandler.prepare
+    does: the arguments of the record may change once the call returns. The
+    background thread writes the events to the sinks in batches, so logging adds
+    no I/O to the caller.
+
+    Attributes:
+        sinks: The sinks the events are written to.
+        sample_rate: The share of the records below the always kept level that are kept.
+        dropped: The number of records dropped because the queue was full.
+        sampled_out: The number of records left out by the sampling.
+
+    Methods:
+        __init__(self, sinks, sample_rate=1.0, queue_size=..., batch_size=...):
+            Initializes the Telemetry and starts its background thread.
+
+        handler(self, level=logging.NOTSET):
+            Returns a logging handler queuing its records to this Telemetry.
+
+        submit(self, record):
+            Queues a log record, unless it is sampled out or the queue is full.
+
+        flush(self):
+            Waits until every queued record has been written.
+
+        close(self):
+            Writes the queued records, stops the background thread and closes the sinks.
+    """
+
+    def __init__(
+        self,
+        sinks,
+        sample_rate=1.0,
+        queue_size=constantes.DEFAULT_TELEMETRY_QUEUE_SIZE,
+        batch_size=constantes.TELEMETRY_BATCH_SIZE,
+    ):
+        """
+        Initializes the Telemetry and starts its background thread.
+
+        Args:
+            sinks (list): The sinks, objects with write(events) and close() methods.
+            sample_rate (float): The share of the records kept, from 0 to 1 (default is 1).
+            queue_size (int): The number of records the queue holds.
+            batch_size (int): The largest number of events written at once.
+        """
+        self.sinks = list(sinks)
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self.sampled_out = 0
+        self._counters_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._random = random.Random()
+        self._worker = threading.Thread(
+            target=self._run, name="telemetry", daemon=True
+        )
+        self._worker.start()
+
+    def handler(self, level=logging.NOTSET):
+        """
+        Returns a logging handler queuing its records to this Telemetry.
+
+        Args:
+            level (int): The level of the handler (default is logging.NOTSET).
+
+        Returns:
+            logging.Handler: The handler.
+        """
+        return TelemetryHandler(self, level)
+
+    def submit(self, record):
+        """
+        Queues a log record, unless it is sampled out or the queue is full.
+
+        Never blocks.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            bool: True if the record was queued.
+        """
+        if (
+            record.levelno < constantes.TELEMETRY_ALWAYS_KEPT_LEVEL
+            and self._random.random() >= self.sample_rate
+        ):
+            with self._counters_lock:
+                self.sampled_out += 1
+            return False
+        try:
+            self._queue.put_nowait(self._event(record))
+        except queue.Full:
+            with self._counters_lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self):
+        """
+        Waits until every queued record has been written.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Writes the queued records, stops the background thread and closes the
+        sinks.
+        """
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(constantes.TELEMETRY_CLOSE_TIMEOUT)
+        self._worker = None
+        for sink in self.sinks:
+            sink.close()
+
+    def _run(self):
+        while True:
+            # The records queued meanwhile are written in the same batch
+            batch = []
+            stop = False
+            event = self._queue.get()
+            while True:
+                if event is None:
+                    stop = True
+                else:
+                    batch.append(event)
+                if stop or len(batch) >= self._batch_size:
+                    break
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception as err:
+                print(f"telemetry : {err}", file=sys.stderr)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, events):
+        for sink in self.sinks:
+            try:
+                sink.write(events)
+            except Exception as err:
+                print(f"telemetry sink : {err}", file=sys.stderr)
+
+    @staticmethod
+    def _event(record):
+        event = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "levelno": record.levelno,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            event["exception"] = "".join(
+                traceback.format_exception(*record.exc_info)
+            )
+        return event
+
+
+class TelemetryHandler(logging.Handler):
+    """
+    The TelemetryHandler class is the logging handler queuing the records to a
+    Telemetry.
+    """
+
+    def __init__(self, telemetry, level=logging.NOTSET):
+        """
+        Initializes the TelemetryHandler with the given parameters.
+
+        Args:
+            telemetry (Telemetry): The telemetry the records are queued to.
+            level (int): The level of the handler (default is logging.NOTSET).
+        """
+        super().__init__(level)
+        self.telemetry = telemetry
+
+    def emit(self, record):
+        """
+        Queues a record to the telemetry.
+
+        Args:
+            record (logging.LogRecord): The record.
+        """
+        self.telemetry.submit(record)
+
+    def handle(self, record):
+        # No handler lock: submit only touches the thread-safe queue
+        kept = self.filter(record)
+        if kept:
+            self.emit(record)
+        return kept
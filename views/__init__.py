@@ -4,3 +4,5 @@ from .user_view import UserView
 from .customer_view import CustomerView
 from .contract_view import ContractView
 from .event_view import EventView
+from .report_view import ReportView
+from .cli_view import CliView
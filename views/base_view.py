@@ -1,6 +1,8 @@
 import os
 import sys
 import views
+import constantes
+from rich.markup import escape
 
 if os.name == "nt":
     import msvcrt
@@ -22,6 +24,15 @@ class BaseView:
 
         wait_for_key_press(self):
             Waits for the user to press a key before continuing.
+
+        input_page_navigation(self, has_previous, has_next):
+            Prompts the user to move to the previous or next page of a listing.
+
+        input_csv_path(self):
+            Prompts the user to input the path of a CSV file.
+
+        display_action_profile(self, summary):
+            Displays the statements and time of an action.
     """
 
     def __init__(self, console):
@@ -49,3 +60,66 @@ class BaseView:
                 sys.stdin.read(1)
             finally:
                 termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+    def input_page_navigation(self, has_previous, has_next):
+        """
+        Prompts the user to move to the previous or next page of a listing.
+
+        Only the directions in which a page exists are offered.
+
+        Args:
+            has_previous (bool): True if a page exists before the current one.
+            has_next (bool): True if a page exists after the current one.
+
+        Returns:
+            str: constantes.PAGE_NEXT, constantes.PAGE_PREVIOUS or constantes.PAGE_QUIT.
+        """
+        choices = [constantes.PAGE_QUIT]
+        if has_previous:
+            choices.append(constantes.PAGE_PREVIOUS)
+            self.console.print(
+                "[menu_choice]"
+                + constantes.PAGE_PREVIOUS
+                + " - Previous page [/]"
+            )
+        if has_next:
+            choices.append(constantes.PAGE_NEXT)
+            self.console.print(
+                "[menu_choice]" + constantes.PAGE_NEXT + " - Next page [/]"
+            )
+        self.console.print(
+            "[menu_choice]" + constantes.PAGE_QUIT + " - Back [/]"
+        )
+        selection = None
+        while selection not in choices:
+            self.console.print("Choisissez une option : ", style="input")
+            selection = input().strip().lower()
+        return selection
+
+    def input_csv_path(self):
+        """
+        Prompts the user to input the path of a CSV file.
+
+        Returns:
+            str: The path of the CSV file.
+        """
+        self.console.print("CSV file : ", style="input")
+        return input().strip()
+
+    def display_action_profile(self, summary):
+        """
+        Displays the statements and time of an action.
+
+        Args:
+            summary (dict): The summary built by QueryProfiler.
+        """
+        self.console.print(
+            f"[menu_choice]{summary['action']} : {summary['statements']} "
+            f"statements, {summary['db_ms']} ms in database, "
+            f"{summary['total_ms']} ms in total[/]"
+        )
+        if summary["repeated_statement"]:
+            self.console.print(
+                f"[error]Statement run {summary['max_repeats']} times : "
+                f"{escape(summary['repeated_statement'][:200])}[/]"
+            )
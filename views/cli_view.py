@@ -0,0 +1,280 @@
+import json
+import sys
+from rich.console import Console
+from rich.table import Table
+import constantes
+import utils
+import views
+
+
+class CliView(views.BaseView):
+    """
+    The CliView class writes the results of the headless commands.
+
+    Results are written to a stream (stdout by default) as a table, CSV, NDJSON or JSON,
+    while messages go to the console, which writes to stderr, so that the output of
+    a command can be piped or redirected.
+
+    Attributes:
+        console: The console used for messages.
+        stream: The stream the results are written to.
+
+    Methods:
+        write_rows(self, columns, rows, output_format):
+            Writes rows to the stream in the given format.
+
+        display_error(self, message):
+            Displays an error message.
+
+        display_not_logged_in(self):
+            Displays a message asking the user to log in interactively.
+
+        display_permission_denied(self):
+            Displays a message indicating that the command is not allowed for the user.
+
+        display_report_summary(self, summary):
+            Displays the statistics of a revenue report.
+
+        display_rebuild_balances_report(self, report):
+            Displays the result of a rebuild of the contract totals.
+
+        display_rebuild_search_index_report(self, indexed, fulltext):
+            Displays the result of a rebuild of the customer search index.
+
+        display_next_page(self, page):
+            Displays the option giving the next page of the results.
+
+        display_assignment_report(self, planned, unassigned, applied):
+            Displays the result of an automatic support assignment.
+
+        display_index_advisor_summary(self, count, flagged):
+            Displays the queries the index advisor flagged.
+
+        display_import_users_report(self, report):
+            Displays the report of a users import.
+
+        display_import_customers_report(self, report):
+            Displays the report of a customers import.
+
+        display_import_contracts_report(self, report):
+            Displays the report of a contracts import.
+    """
+
+    def __init__(self, console, stream=None):
+        """
+        Initializes the CliView with the given console and stream.
+
+        Args:
+            console: The console used for messages.
+            stream: The stream the results are written to (default is sys.stdout).
+        """
+        super().__init__(console)
+        self.stream = stream or sys.stdout
+
+    def write_rows(self, columns, rows, output_format):
+        """
+        Writes rows to the stream in the given format.
+
+        CSV, NDJSON and JSON rows are written as they are read, so large results are
+        never held in memory; the table format needs every row before printing.
+
+        Args:
+            columns (tuple): The column names.
+            rows: An iterable of value tuples, in the order of the columns.
+            output_format (str): "table", "csv", "ndjson" or "json".
+
+        Returns:
+            int: The number of rows written.
+        """
+        if output_format == "csv":
+            return utils.write_csv(self.stream, columns, rows)
+        if output_format == "ndjson":
+            return utils.write_ndjson(self.stream, columns, rows)
+        count = 0
+        if output_format == "json":
+            self.stream.write("[")
+            for row in rows:
+                if count:
+                    self.stream.write(",")
+                item = dict(zip(columns, row))
+                self.stream.write("\n" + json.dumps(item, default=str))
+                count += 1
+            self.stream.write("\n]\n")
+        else:
+            table = Table()
+            for column in columns:
+                table.add_column(column)
+            for row in rows:
+                table.add_row(
+                    *("" if value is None else str(value) for value in row)
+                )
+                count += 1
+            # Redirected output is not wrapped at the default 80 columns
+            width = None if self.stream.isatty() else constantes.CLI_TABLE_WIDTH
+            Console(file=self.stream, width=width).print(table)
+        return count
+
+    def display_error(self, message):
+        """
+        Displays an error message.
+        """
+        self.console.print(f"[error]{message}[/]")
+
+    def display_not_logged_in(self):
+        """
+        Displays a message asking the user to log in interactively.
+        """
+        self.console.print(
+            "[error]No valid token : log in with python main.py first[/]"
+        )
+
+    def display_permission_denied(self):
+        """
+        Displays a message indicating that the command is not allowed for the user.
+        """
+        self.console.print("[error]Command not allowed for your role[/]")
+
+    def display_report_summary(self, summary):
+        """
+        Displays the statistics of a revenue report.
+
+        Args:
+            summary (dict): The statistics of each metric, by metric name.
+        """
+        for metric, statistics in summary.items():
+            self.console.print(
+                metric
+                + " : "
+                + ", ".join(
+                    (
+                        f"{name} {value}"
+                        if name == "count"
+                        else f"{name} {value:.2f}"
+                    )
+                    for name, value in statistics.items()
+                )
+            )
+
+    def display_rebuild_balances_report(self, report):
+        """
+        Displays the result of a rebuild of the contract totals.
+
+        Args:
+            report (dict): The report returned by BalanceController.rebuild.
+        """
+        self.console.print(
+            f"{report['managers']} balances rebuilt, "
+            f"{report['drifted']} were out of date"
+        )
+
+    def display_assignment_report(self, planned, unassigned, applied):
+        """
+        Displays the result of an automatic support assignment.
+
+        Args:
+            planned (int): The number of events the plan assigns.
+            unassigned (int): The number of events no support is free for.
+            applied (int): The number of events assigned, or None for a dry run.
+        """
+        if applied is None:
+            self.console.print(
+                f"{planned} events to assign, {unassigned} without a free "
+                "support (dry run, nothing assigned)"
+            )
+            return
+        self.console.print(
+            f"{applied} events assigned, {unassigned} without a free support"
+        )
+
+    def display_rebuild_search_index_report(self, indexed, fulltext):
+        """
+        Displays the result of a rebuild of the customer search index.
+
+        Args:
+            indexed (int): The number of customers indexed.
+            fulltext (bool): True if the database searches with a FULLTEXT index.
+        """
+        if fulltext:
+            self.console.print(
+                "Nothing to rebuild, the FULLTEXT index is maintained by the "
+                "database"
+            )
+            return
+        self.console.print(f"{indexed} customers indexed")
+
+    def display_next_page(self, page):
+        """
+        Displays the option giving the next page of the results.
+
+        Args:
+            page (int): The number of the next page.
+        """
+        self.console.print(f"More results with --page {page}")
+
+    def display_index_advisor_summary(self, count, flagged):
+        """
+        Displays the queries the index advisor flagged.
+
+        Args:
+            count (int): The number of queries explained.
+            flagged (list): The names of the queries reading a table in full.
+        """
+        if not flagged:
+            self.console.print(f"{count} queries explained, no full table scan")
+            return
+        self.console.print(
+            f"[error]{len(flagged)} of {count} queries read a table in full : "
+            + ", ".join(flagged)
+            + "[/]"
+        )
+
+    def display_import_users_report(self, report):
+        """
+        Displays the report of a users import.
+
+        Args:
+            report (dict): The report returned by UserController.import_users_csv.
+        """
+        self.console.print(
+            f"{report['created']} users created, "
+            f"{len(report['rejected'])} lines rejected, "
+            f"{report['users_per_second']:.1f} users per second"
+        )
+        for line, reason in report["rejected"]:
+            self.console.print(f"[error]Line {line} : {reason}[/]")
+
+    def display_import_customers_report(self, report):
+        """
+        Displays the report of a customers import.
+
+        Args:
+            report (dict): The report returned by CustomerController.import_customers_csv.
+        """
+        self.console.print(
+            f"{report['created']} customers created, "
+            f"{report['rejected']} lines rejected, "
+            f"{report['customers_per_second']:.1f} customers per second"
+        )
+        if report["reject_path"]:
+            self.console.print(
+                f"[error]Rejected lines written to {report['reject_path']}[/]"
+            )
+
+    def display_import_contracts_report(self, report):
+        """
+        Displays the report of a contracts import.
+
+        Args:
+            report (dict): The report returned by ContractController.import_contracts_csv.
+        """
+        self.console.print(
+            f"{report['created']} contracts created, "
+            f"{report['updated']} updated, "
+            f"{report['unchanged']} unchanged, "
+            f"{report['rejected']} lines rejected, "
+            f"{report['contracts_per_second']:.1f} contracts per second"
+        )
+        if report["reject_path"]:
+            self.console.print(
+                f"[error]Rejected lines written to {report['reject_path']}[/]"
+            )
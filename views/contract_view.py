@@ -150,7 +150,50 @@ class ContractView(views.BaseView):
             "is_signed": is_signed_input,
         }
 
-    def display_contract_informations(self, contracts: models.Contract):
+    def display_import_contracts(self):
+        """
+        Displays the import contracts menu.
+        """
+        self.console.print(
+            Panel("---   IMPORT CONTRACTS MENU   ---", expand=True),
+            style="menu_text",
+        )
+        self.console.print(
+            "Columns : "
+            + ", ".join(constantes.CONTRACT_IMPORT_COLUMNS)
+            + " (optional : "
+            + constantes.CONTRACT_IMPORT_SALES_COLUMN
+            + ")",
+            style="menu_text",
+        )
+
+    def display_import_contracts_report(self, report):
+        """
+        Displays the report of a contracts import.
+
+        Args:
+            report (dict): The report returned by ContractController.import_contracts_csv.
+        """
+        table = Table(title="Import contracts")
+        table.add_column("Metric", style="menu_choice")
+        table.add_column("Value", style="menu_choice")
+        table.add_row("Lines read", str(report["read"]))
+        table.add_row("Contracts created", str(report["created"]))
+        table.add_row("Contracts updated", str(report["updated"]))
+        table.add_row("Contracts unchanged", str(report["unchanged"]))
+        table.add_row("Lines rejected", str(report["rejected"]))
+        table.add_row("Reject file", report["reject_path"] or "")
+        table.add_row("Seconds", f"{report['seconds']:.2f}")
+        table.add_row(
+            "Contracts per second", f"{report['contracts_per_second']:.1f}"
+        )
+        table.column_widths = "auto"
+        self.console.print(table)
+        self.wait_for_key_press()
+
+    def display_contract_informations(
+        self, contracts: models.Contract, wait=True
+    ):
         """
         Displays contract information in a formatted table.
 
@@ -158,6 +201,8 @@ class ContractView(views.BaseView):
         -----------
         contracts : models.Contract or list[models.Contract]
             A single contract or a list of contracts to be displayed.
+        wait : bool, optional
+            Wait for a key press after a list of contracts (default is True).
         """
         table = Table(title="Liste Contrat")
 
@@ -197,7 +242,8 @@ class ContractView(views.BaseView):
                 )
             table.column_widths = "auto"
             self.console.print(table)
-            self.wait_for_key_press()
+            if wait:
+                self.wait_for_key_press()
 
     def input_list_contracts_filters(self):
         """
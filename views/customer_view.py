@@ -1,3 +1,4 @@
+import constantes
 import models
 
 import views
@@ -39,6 +40,12 @@ class CustomerView(views.BaseView):
 
         display_update_customer_validation(self):
             Displays a success message indicating that a customer has been updated.
+
+        input_search(self):
+            Prompts the user to input the words to search the customers with.
+
+        display_search_results(self, rows):
+            Displays a page of the customers matching a search, best first.
     """
 
     def input_first_name(self):
@@ -124,12 +131,54 @@ class CustomerView(views.BaseView):
         self.console.print("[success]New customer correctly created[/]")
         self.wait_for_key_press()
 
-    def display_customer_information(self, customers: models.Customer):
+    def display_import_customers(self):
+        """
+        Displays the import customers menu.
+        """
+        self.console.print(
+            Panel("---   IMPORT CUSTOMERS MENU   ---", expand=True),
+            style="menu_text",
+        )
+        self.console.print(
+            "Columns : "
+            + ", ".join(constantes.CUSTOMER_IMPORT_COLUMNS)
+            + " (optional : "
+            + constantes.CUSTOMER_IMPORT_SALES_COLUMN
+            + ")",
+            style="menu_text",
+        )
+
+    def display_import_customers_report(self, report):
+        """
+        Displays the report of a customers import.
+
+        Args:
+            report (dict): The report returned by CustomerController.import_customers_csv.
+        """
+        table = Table(title="Import customers")
+        table.add_column("Metric", style="menu_choice")
+        table.add_column("Value", style="menu_choice")
+        table.add_row("Lines read", str(report["read"]))
+        table.add_row("Customers created", str(report["created"]))
+        table.add_row("Lines rejected", str(report["rejected"]))
+        table.add_row("Reject file", report["reject_path"] or "")
+        table.add_row("Seconds", f"{report['seconds']:.2f}")
+        table.add_row(
+            "Customers per second", f"{report['customers_per_second']:.1f}"
+        )
+        table.column_widths = "auto"
+        self.console.print(table)
+        self.wait_for_key_press()
+
+    def display_customer_information(
+        self, customers: models.Customer, wait=True
+    ):
         """
         Displays the information of a customer.
 
         Args:
             customer (models.Customer): The customer object to display.
+            wait (bool): Wait for a key press after a list of customers (default is True).
         """
 
         table = Table(title="Listing clients")
@@ -174,7 +223,8 @@ class CustomerView(views.BaseView):
                 )
             table.column_widths = "auto"
             self.console.print(table)
-            self.wait_for_key_press()
+            if wait:
+                self.wait_for_key_press()
 
     def input_update_customer(self):
         """
@@ -207,6 +257,46 @@ class CustomerView(views.BaseView):
         self.console.print("Customer successfully updated", style="success")
         self.wait_for_key_press()
 
+    def input_search(self):
+        """
+        Prompts the user to input the words to search the customers with.
+
+        Returns:
+            str: The words searched in the names, emails and company names.
+        """
+        self.console.print(
+            Panel("---   SEARCH CUSTOMERS   ---", expand=True),
+            style="menu_text",
+        )
+        self.console.print("Name, email or company : ", style="input")
+        return input()
+
+    def display_search_results(self, rows):
+        """
+        Displays a page of the customers matching a search, best first.
+
+        Args:
+            rows (list): The (customer, score) rows of the page.
+        """
+        table = Table(title="Search results")
+        table.add_column("Score", style="menu_choice")
+        table.add_column("First name", style="menu_choice")
+        table.add_column("Last name", style="menu_choice")
+        table.add_column("Email", style="menu_choice")
+        table.add_column("Company name", style="menu_choice")
+        table.add_column("Commercial contact", style="menu_choice")
+        for customer, score in rows:
+            table.add_row(
+                f"{score:.2f}",
+                customer.first_name,
+                customer.last_name,
+                customer.email,
+                customer.compagny_name,
+                customer.user.full_name,
+            )
+        table.column_widths = "auto"
+        self.console.print(table)
+
     def display_customer_not_found(self):
         """
         Displays a message indicating that a customer was not found.
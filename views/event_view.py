@@ -4,6 +4,11 @@ import views
 from rich.panel import Panel
 from rich.table import Table
 
+try:
+    import readline
+except ImportError:  # Windows
+    readline = None
+
 
 class EventView(views.BaseView):
     """
@@ -25,8 +30,8 @@ class EventView(views.BaseView):
         input_event_end_date(self):
             Prompts the user to input the end date of the event.
 
-        input_event_name(self):
-            Prompts the user to input the name of the event.
+        input_event_name(self, complete=None):
+            Prompts the user to input the name of the event, with tab completion.
 
         input_event_location(self):
             Prompts the user to input the location of the event.
@@ -54,6 +59,24 @@ class EventView(views.BaseView):
 
         display_support_manage_events(self):
             Displays a panel with the title "Support Events management".
+
+        display_support_already_booked(self, event):
+            Displays an error message indicating that the support is booked on an overlapping event.
+
+        display_event_name_suggestions(self, names):
+            Displays the event names starting with the name typed.
+
+        display_double_bookings(self, rows):
+            Displays the supports booked on overlapping events.
+
+        display_assignment_plan(self, assignments, unassigned):
+            Displays the supports planned for the events without support.
+
+        input_apply_assignment_plan(self):
+            Asks the user whether to apply the assignment plan.
+
+        display_assignment_applied(self, count):
+            Displays the number of events assigned.
     """
 
     def input_event_notes(self):
@@ -113,16 +136,44 @@ class EventView(views.BaseView):
         self.console.print("Event end date: (DD-MM-YY)", style="input")
         return input()
 
-    def input_event_name(self):
+    def input_event_name(self, complete=None):
         """
         Prompts the user to input the name of the event.
 
+        When a completion function is given and readline is available, the tab key
+        completes the name typed so far.
+
+        Args:
+            complete: A function returning the names starting with a prefix (default is None).
+
         Returns:
             str: The name of the event.
         """
         self.console.print("Event name : ", style="input")
-
-        return input()
+        if complete is None or readline is None:
+            return input()
+
+        matches = []
+
+        def completer(text, state):
+            if state == 0:
+                matches[:] = complete(text)
+            return matches[state] if state < len(matches) else None
+
+        previous_completer = readline.get_completer()
+        previous_delims = readline.get_completer_delims()
+        # Event names contain spaces: complete the whole line
+        readline.set_completer_delims("")
+        readline.set_completer(completer)
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+        try:
+            return input()
+        finally:
+            readline.set_completer(previous_completer)
+            readline.set_completer_delims(previous_delims)
 
     def input_event_location(self):
         """
@@ -325,3 +376,101 @@ class EventView(views.BaseView):
             Panel("---   DELETE EVENT MENU   ---", expand=True),
             style="menu_text",
         )
+
+    def display_support_already_booked(self, event):
+        """
+        Displays an error message indicating that the support is booked on an overlapping event.
+
+        Args:
+            event (models.Event): The event of the support overlapping the period.
+        """
+        self.console.print(
+            "[error]The support is already booked on the event "
+            f"{event.event_name} from {event.start_date} to {event.end_date}[/]"
+        )
+        self.wait_for_key_press()
+
+    def display_event_name_suggestions(self, names):
+        """
+        Displays the event names starting with the name typed.
+
+        Args:
+            names (list[str]): The event names.
+        """
+        self.console.print("Did you mean : " + ", ".join(names), style="input")
+
+    def display_double_bookings(self, rows):
+        """
+        Displays the supports booked on overlapping events.
+
+        Args:
+            rows (list): The (support email, event, other event, overlap start, overlap end) rows.
+        """
+        if not rows:
+            self.console.print("[success]No support is double booked[/]")
+            self.wait_for_key_press()
+            return
+        table = Table(title="Double bookings")
+        table.add_column("Support")
+        table.add_column("Event")
+        table.add_column("Overlapping event")
+        table.add_column("From")
+        table.add_column("To")
+        for row in rows:
+            table.add_row(*(str(value) for value in row))
+        table.column_widths = "auto"
+        self.console.print(table)
+        self.wait_for_key_press()
+
+    def display_assignment_plan(self, assignments, unassigned):
+        """
+        Displays the supports planned for the events without support.
+
+        Args:
+            assignments (list): The (event id, event, start, end, support email) rows.
+            unassigned (list): The (event id, event, start, end) rows no support is free for, or without dates.
+        """
+        if not assignments and not unassigned:
+            self.console.print("[success]Every event has a support[/]")
+            self.wait_for_key_press()
+            return
+        table = Table(title="Support assignment plan")
+        for column in ("Id", "Event", "From", "To", "Support"):
+            table.add_column(column)
+        for row in assignments:
+            table.add_row(*(str(value) for value in row))
+        for row in unassigned:
+            reason = "none free" if None not in row[2:4] else "no dates"
+            table.add_row(*(str(value) for value in row), f"[error]{reason}[/]")
+        table.column_widths = "auto"
+        self.console.print(table)
+        self.console.print(
+            f"{len(assignments)} events to assign, "
+            f"{len(unassigned)} without a free support or dates"
+        )
+
+    def input_apply_assignment_plan(self):
+        """
+        Asks the user whether to apply the assignment plan.
+
+        Returns:
+            bool: True if the plan must be applied, False otherwise.
+        """
+        while True:
+            self.console.print(
+                "Apply this plan ? (0  for NO / 1 for YES) : ", style="input"
+            )
+            user_input = input()
+            if user_input in ("0", "1"):
+                return user_input == "1"
+            self.console.print("[error]bad input[/]")
+
+    def display_assignment_applied(self, count):
+        """
+        Displays the number of events assigned.
+
+        Args:
+            count (int): The number of events assigned.
+        """
+        self.console.print(f"[success]{count} events assigned[/]")
+        self.wait_for_key_press()
@@ -3,6 +3,7 @@ import constantes
 import views
 from rich.panel import Panel
 from rich.rule import Rule
+from rich.table import Table
 
 
 class MainView(views.BaseView):
@@ -40,6 +41,9 @@ class MainView(views.BaseView):
         display_logout(self):
             Displays a panel with the title "Logout".
 
+        display_pool_metrics(self, stats):
+            Displays the statistics of the database connection pool.
+
     """
 
     def display_main_menu(self):
@@ -164,3 +168,19 @@ class MainView(views.BaseView):
         Displays an error message.
         """
         self.console.print(f"[error] {message} [/]")
+
+    def display_pool_metrics(self, stats):
+        """
+        Displays the statistics of the database connection pool.
+
+        Args:
+            stats (dict): The statistics returned by PoolMetrics.snapshot.
+        """
+        table = Table(title="Database pool statistics")
+        table.add_column("Metric", style="menu_choice")
+        table.add_column("Value", style="menu_choice")
+        for name, value in stats.items():
+            table.add_row(name.replace("_", " "), str(value))
+        table.column_widths = "auto"
+        self.console.print(table)
+        self.wait_for_key_press()
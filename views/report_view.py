@@ -0,0 +1,104 @@
+import views
+import constantes
+from rich.panel import Panel
+from rich.table import Table
+
+
+class ReportView(views.BaseView):
+    """
+    The ReportView class is responsible for displaying the revenue reports.
+
+    Methods:
+        input_report_choice(self):
+            Displays the reports menu and returns the report chosen by the user.
+
+        display_report(self, title, columns, rows, summary, distribution):
+            Displays the rows of a report with its statistics and distribution.
+
+        display_no_contracts_to_report(self):
+            Displays a message indicating that there is no contract to report on.
+    """
+
+    def input_report_choice(self):
+        """
+        Displays the reports menu and returns the report chosen by the user.
+
+        Returns:
+            str: One of constantes.REPORT_NAMES, or None to go back to the main menu.
+        """
+        self.console.print(
+            Panel("---   REVENUE REPORTS   ---", expand=True),
+            style="menu_text",
+        )
+        self.console.print("[menu_choice]" + constantes.LOG_OUT + " - Exit[/]")
+        for number, name in enumerate(constantes.REPORT_NAMES, start=1):
+            self.console.print(f"[menu_choice]{number} - Per {name}[/]")
+        selection = -1
+        while selection < 0 or selection > len(constantes.REPORT_NAMES):
+            try:
+                self.console.print("Select a report : ", style="input")
+                selection = int(input())
+                if selection < 0 or selection > len(constantes.REPORT_NAMES):
+                    raise ValueError
+            except ValueError:
+                self.console.print("[error]bad input[/]")
+        if selection == 0:
+            return None
+        return constantes.REPORT_NAMES[selection - 1]
+
+    def display_report(self, title, columns, rows, summary, distribution):
+        """
+        Displays the rows of a report with its statistics and distribution.
+
+        Args:
+            title (str): The title of the report.
+            columns (tuple): The column names.
+            rows (list): The value tuples of the report, one per group.
+            summary (dict): The statistics of each metric, by metric name.
+            distribution (list): The (lower bound, upper bound, count) ranges of the signed revenue.
+        """
+        table = Table(title=title)
+        for column in columns:
+            table.add_column(column.replace("_", " "), style="menu_choice")
+        for row in rows:
+            table.add_row(
+                *(
+                    f"{value:.2f}" if isinstance(value, float) else str(value)
+                    for value in row
+                )
+            )
+        self.console.print(table)
+
+        statistics = Table(title="Statistics per group")
+        statistics.add_column("Statistic", style="menu_choice")
+        for metric in summary:
+            statistics.add_column(metric.replace("_", " "))
+        first = next(iter(summary.values()))
+        for statistic in first:
+            statistics.add_row(
+                statistic,
+                *(
+                    (
+                        str(values[statistic])
+                        if statistic == "count"
+                        else f"{values[statistic]:.2f}"
+                    )
+                    for values in summary.values()
+                ),
+            )
+        self.console.print(statistics)
+
+        histogram = Table(title="Distribution of the signed revenue")
+        histogram.add_column("Range", style="menu_choice")
+        histogram.add_column("Groups")
+        for low, high, count in distribution:
+            histogram.add_row(f"{low:.2f} - {high:.2f}", str(count))
+        self.console.print(histogram)
+        self.wait_for_key_press()
+
+    def display_no_contracts_to_report(self):
+        """
+        Displays a message indicating that there is no contract to report on.
+        """
+        self.console.print("[error]No contract to report on[/]")
+        self.wait_for_key_press()
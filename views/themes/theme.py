@@ -2,13 +2,16 @@ from rich.console import Console
 from rich.theme import Theme
 
 
-def theme_console():
+def theme_console(stderr=False):
     """
     Creates a custom theme for the console.
 
     This function creates a custom theme for the console with specific colors for error messages, success messages,
     menu choices, menu text, and panels.
 
+    Args:
+        stderr (bool): Write to stderr instead of stdout (default is False).
+
     Returns:
         console: A Console object with the custom theme.
     """
@@ -22,4 +25,4 @@ def theme_console():
             "input": "bright_magenta bold",
         }
     )
-    return Console(theme=custom_theme)
+    return Console(theme=custom_theme, stderr=stderr)
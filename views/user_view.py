@@ -170,6 +170,31 @@ class UserView(views.BaseView):
             + constantes.LIST_MANAGER_MANAGE_CONTRACT
             + "- Manage Contract [/]"
         )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_MANAGER_POOL_STATS
+            + "- Database pool statistics [/]"
+        )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_MANAGER_IMPORT_CONTRACTS
+            + "- Import contracts from a CSV file [/]"
+        )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_MANAGER_REPORTS
+            + "- Revenue reports [/]"
+        )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_MANAGER_DOUBLE_BOOKINGS
+            + "- Double booked supports [/]"
+        )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_MANAGER_AUTO_ASSIGN
+            + "- Assign supports automatically [/]"
+        )
 
     def input_user_management(self):
         """
@@ -202,6 +227,11 @@ class UserView(views.BaseView):
             + constantes.MANAGER_LIST_USER
             + " - List of user [/]"
         )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.MANAGER_IMPORT_USERS
+            + " - Import users from a CSV file [/]"
+        )
         selection = -1
         while selection not in [
             constantes.MAIN_MENU_BACK,
@@ -209,6 +239,7 @@ class UserView(views.BaseView):
             constantes.MANAGER_UPDATE_USER,
             constantes.MANAGER_DELETE_USER,
             constantes.MANAGER_LIST_USER,
+            constantes.MANAGER_IMPORT_USERS,
         ]:
             self.console.print("Choisissez une option : ", style="input")
             selection = input()
@@ -385,6 +416,16 @@ class UserView(views.BaseView):
             + constantes.LIST_SALES_DELETE_EVENT
             + " - Delete an Event for a Customer [/]"
         )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_SALES_IMPORT_CUSTOMERS
+            + " - Import Customers from a CSV file [/]"
+        )
+        self.console.print(
+            "[menu_choice]"
+            + constantes.LIST_SALES_SEARCH_CUSTOMERS
+            + " - Search Customers [/]"
+        )
 
     def display_support_menu(self):
         """
@@ -439,6 +480,41 @@ class UserView(views.BaseView):
             style="menu_text",
         )
 
+    def display_import_users(self):
+        """
+        Displays the import users menu.
+        """
+        self.console.print(
+            Panel("---   IMPORT USERS MENU   ---", expand=True),
+            style="menu_text",
+        )
+        self.console.print(
+            "Columns : " + ", ".join(constantes.USER_IMPORT_COLUMNS),
+            style="menu_text",
+        )
+
+    def display_import_users_report(self, report):
+        """
+        Displays the report of a users import.
+
+        Args:
+            report (dict): The report returned by UserController.import_users_csv.
+        """
+        table = Table(title="Import users")
+        table.add_column("Metric", style="menu_choice")
+        table.add_column("Value", style="menu_choice")
+        table.add_row("Lines read", str(report["read"]))
+        table.add_row("Users created", str(report["created"]))
+        table.add_row("Lines rejected", str(len(report["rejected"])))
+        table.add_row("Hashing processes", str(report["workers"]))
+        table.add_row("Seconds", f"{report['seconds']:.2f}")
+        table.add_row("Users per second", f"{report['users_per_second']:.1f}")
+        table.column_widths = "auto"
+        self.console.print(table)
+        for line, reason in report["rejected"]:
+            self.console.print(f"[error]Line {line} : {reason}[/]")
+        self.wait_for_key_press()
+
     def display_token_expire(self):
         """
         Displays an error message indicating that the token is expired.
@@ -463,12 +539,13 @@ class UserView(views.BaseView):
         """
         self.console.print("User not found", style="error")
 
-    def display_list_user(self, users: models.User):
+    def display_list_user(self, users: models.User, wait=True):
         """
         Displays the information of a user.
 
         Args:
             users (models.User): The user object to display.
+            wait (bool): Wait for a key press after a list of users (default is True).
         """
 
         table = Table(title="Listing users")
@@ -508,4 +585,5 @@ class UserView(views.BaseView):
 
             table.column_widths = "auto"
             self.console.print(table)
-            self.wait_for_key_press()
+            if wait:
+                self.wait_for_key_press()